@@ -0,0 +1,94 @@
+"""Timing and output check for attendance extracts with template status codes.
+
+Extracts a month of attendance (EMPLOYEES x DAYS) with the site codes a template
+would add: WFH marked '|present' and SKD (training) not marked. Each setup is run
+once with Time Off Only unticked and once with it ticked. With Time Off Only, no
+presence code may be extracted: neither H / HM (whatever their case or spacing in
+the sheet) nor the custom WFH. Time-off codes, SKD included, must still be listed.
+
+Run from the repository root:
+    python -m benchmarks.bench_attendance_extract
+"""
+import contextlib
+import io
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+from model.attendance.attendance_extractor import AttendanceExtractor
+
+EMPLOYEES = 2000
+DAYS = 31
+
+SETTINGS = {
+    "company_codes": {"PM": True, "PTM": True, "TMP": True},
+    "employee_id_column": "2",
+    "employee_name_column": "3",
+    "company_code_column": "5",
+    "data_start_row": "5",
+    "date_header_row": "4",
+    "row_counter_column": "1",
+    "sheet_names": "Attendance",
+    "ignore_list": "",
+    "custom_status_codes": "WFH=Work From Home (WFH)|08:00|17:00|present, SKD=Training (SKD)",
+    "template_name": "bench",
+}
+CODES = ["H", "H", " h ", "HM", "WFH", "A", "S", "SKD", "OFF"]
+PRESENT_STATUSES = {"Hadir (H)", "Hadir shift malam (HM)", "Work From Home (WFH)"}
+
+
+def _write_workbook(directory: Path) -> tuple[str, str, str]:
+    start = date(2025, 11, 26)
+    dates = [start + timedelta(days=offset) for offset in range(DAYS)]
+    source = Workbook()
+    ws = source.active
+    ws.title = "Attendance"
+    for offset, day in enumerate(dates):
+        ws.cell(row=4, column=6 + offset, value=day)
+    for n in range(EMPLOYEES):
+        row = [n + 1, f"OBI-{1000000 + n}", f"Employee {n}", None, ("PM", "PTM", "TMP")[n % 3]]
+        ws.append(row + [CODES[(n + offset) % len(CODES)] for offset in range(DAYS)])
+    source_path = directory / "attendance.xlsx"
+    source.save(source_path)
+    return str(source_path), dates[0].isoformat(), dates[-1].isoformat()
+
+
+def _statuses(outputs: list[Path]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for path in outputs:
+        wb = load_workbook(path, read_only=True)
+        for values in wb.active.iter_rows(min_row=2, values_only=True):
+            counts[values[3]] = counts.get(values[3], 0) + 1
+        wb.close()
+    return counts
+
+
+def main():
+    extractor = AttendanceExtractor()
+    extractor.sheet_cache = None  # parse the workbook on every run, as on a first drop
+    with tempfile.TemporaryDirectory() as directory:
+        source_path, date_start, date_end = _write_workbook(Path(directory))
+        print(f"attendance extract of {EMPLOYEES} employees x {DAYS} days")
+        for time_off_only in (False, True):
+            settings = dict(SETTINGS, time_off_only=time_off_only)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                outputs = extractor.extract(settings, date_start, date_end, source_path)
+            elapsed = time.perf_counter() - started
+            counts = _statuses(outputs)
+            print(f"time off only={time_off_only!s:<5} {elapsed:6.2f}s  "
+                  + ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
+
+            assert "Training (SKD)" in counts, "custom time-off code missing from the extract"
+            if time_off_only:
+                extracted_present = PRESENT_STATUSES & counts.keys()
+                assert not extracted_present, f"presence codes in a time-off-only extract: {extracted_present}"
+            else:
+                assert PRESENT_STATUSES <= counts.keys(), "presence codes missing from the full extract"
+
+
+if __name__ == "__main__":
+    main()
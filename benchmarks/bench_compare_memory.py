@@ -0,0 +1,104 @@
+"""Memory check for repeated comparisons in one long-lived process.
+
+The GUI keeps one comparator per page for the whole session. This runs an
+attendance comparison RUNS times on the same AttendanceComparator (as clicking
+Compare again would) and measures the memory still allocated after each run
+with tracemalloc. Nothing of a run may outlive it, so after the first runs have
+warmed the caches the retained memory must stay flat; a leaked index would add
+roughly half a MiB per run, while openpyxl's XML parsing retains about 1 KiB.
+Takes a few minutes, most of it tracemalloc overhead.
+
+Run from the repository root:
+    python -m benchmarks.bench_compare_memory
+"""
+import contextlib
+import gc
+import io
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from model.attendance.attendance_comparator import AttendanceComparator
+
+RUNS = 50
+WARMUP_RUNS = 5
+EMPLOYEES = 60
+DAYS = 31
+# Allowed growth of retained memory between the end of warm-up and the last run
+MAX_GROWTH_BYTES = 256 * 1024
+
+SETTINGS = {
+    "company_codes": {"PM": True, "PTM": True, "TMP": True},
+    "employee_id_column": "2",
+    "employee_name_column": "3",
+    "company_code_column": "5",
+    "data_start_row": "5",
+    "date_header_row": "4",
+    "row_counter_column": "1",
+    "sheet_names": "Attendance",
+    "ignore_list": "",
+    "time_off_only": False,
+    "template_name": "bench",
+}
+
+
+def _write_workbooks(directory: Path) -> tuple[str, str, str, str]:
+    start = date(2025, 11, 26)
+    dates = [start + timedelta(days=offset) for offset in range(DAYS)]
+    codes = ["H", "H", "H", "HM", "A", "S", "OFF"]
+
+    source = Workbook()
+    ws = source.active
+    ws.title = "Attendance"
+    for offset, day in enumerate(dates):
+        ws.cell(row=4, column=6 + offset, value=day)
+    hris = Workbook()
+    hris_ws = hris.active
+    for offset, day in enumerate(dates):
+        hris_ws.cell(row=1, column=6 + offset, value=day.strftime("%Y-%m-%d"))
+
+    for n in range(EMPLOYEES):
+        employee_id = f"OBI-{1000000 + n}"
+        row = [n + 1, employee_id, f"Employee {n}", None, ("PM", "PTM", "TMP")[n % 3]]
+        ws.append(row + [codes[(n + offset) % len(codes)] for offset in range(DAYS)])
+        hris_ws.append([employee_id, None, None, None, None]
+                       + [codes[(n + offset + n % 2) % len(codes)] for offset in range(DAYS)])
+
+    source_path = directory / "attendance.xlsx"
+    hris_path = directory / "hris.xlsx"
+    source.save(source_path)
+    hris.save(hris_path)
+    return str(source_path), str(hris_path), dates[0].isoformat(), dates[-1].isoformat()
+
+
+def main():
+    comparator = AttendanceComparator()
+    # keep every allocation in this process so tracemalloc sees all of it
+    comparator.load_workers = 1
+    comparator.save_workers = 1
+
+    retained = []
+    with tempfile.TemporaryDirectory() as directory:
+        source_path, hris_path, date_start, date_end = _write_workbooks(Path(directory))
+        tracemalloc.start()
+        for _ in range(RUNS):
+            with contextlib.redirect_stdout(io.StringIO()):
+                comparator.compare(SETTINGS, date_start, date_end, source_path, hris_path)
+            gc.collect()
+            retained.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+
+    print(f"{RUNS} comparisons of {EMPLOYEES} employees x {DAYS} days")
+    print(f"{'run':>5}{'retained KiB':>16}")
+    for run in (1, WARMUP_RUNS, RUNS // 2, RUNS):
+        print(f"{run:>5}{retained[run - 1] / 1024:>16.1f}")
+    growth = retained[-1] - retained[WARMUP_RUNS - 1]
+    print(f"growth after warm-up: {growth / 1024:.1f} KiB")
+    assert growth < MAX_GROWTH_BYTES, f"retained memory grew by {growth} bytes over {RUNS - WARMUP_RUNS} runs"
+
+
+if __name__ == "__main__":
+    main()
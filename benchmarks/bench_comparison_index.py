@@ -0,0 +1,95 @@
+"""Memory benchmark for the comparator indexes.
+
+Builds the index of a month-long attendance comparison (5,000 employees x 30
+days) the previous way, with one dict per record keyed by a 'date_employee'
+string, and the current way, with ComparisonRecord instances keyed by
+(date_key, employee_id). Both are measured with tracemalloc.
+
+Run from the repository root:
+    python -m benchmarks.bench_comparison_index
+"""
+import gc
+import tracemalloc
+from datetime import date, timedelta
+
+from model.data_class.comparison_record import ComparisonRecord
+from model.helper.date_utils import date_key
+
+EMPLOYEES = 5000
+DAYS = 30
+
+
+def _cells():
+    start = date(2025, 11, 26)
+    dates = [(start + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(DAYS)]
+    # employee ids come from the sheet once per row and are shared by that row's records
+    employees = [(f"OBI-{1000000 + n}", f"Employee {n}") for n in range(EMPLOYEES)]
+    return dates, employees
+
+
+def build_dict_index(dates, employees) -> dict:
+    index = {}
+    for employee_id, employee_name in employees:
+        for formatted_date in dates:
+            index[f"{formatted_date}_{employee_id}"] = {
+                "hris_status": "",
+                "date": formatted_date,
+                "employee_id": employee_id,
+                "employee_name": employee_name,
+                "company_code": "PTM",
+                "status_code": "H",
+                "status": "Hadir (H)",
+                "overtime": 0,
+                "timein": "07:00",
+                "timeout": "16:00",
+                "notes": "",
+            }
+    return index
+
+
+def build_record_index(dates, employees) -> dict:
+    window = [(formatted_date, date_key(formatted_date)) for formatted_date in dates]
+    index = {}
+    for employee_id, employee_name in employees:
+        for formatted_date, day in window:
+            index[(day, employee_id)] = ComparisonRecord(
+                date=formatted_date,
+                employee_id=employee_id,
+                employee_name=employee_name,
+                company_code="PTM",
+                status_code="H",
+                status="Hadir (H)",
+                time_in="07:00",
+                time_out="16:00",
+            )
+    return index
+
+
+def _measure(build, *args) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    index = build(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(index) == EMPLOYEES * DAYS
+    return current, peak
+
+
+def main():
+    dates, employees = _cells()
+    rows = [
+        ("dict + 'date_employee' key", build_dict_index),
+        ("ComparisonRecord + tuple key", build_record_index),
+    ]
+    print(f"{EMPLOYEES} employees x {DAYS} days = {EMPLOYEES * DAYS} records")
+    print(f"{'index':<32}{'retained MiB':>14}{'peak MiB':>12}{'bytes/record':>14}")
+    baseline = None
+    for name, build in rows:
+        current, peak = _measure(build, dates, employees)
+        baseline = baseline or current
+        print(f"{name:<32}{current / 2**20:>14.1f}{peak / 2**20:>12.1f}{current / (EMPLOYEES * DAYS):>14.0f}")
+    print(f"reduction: {baseline / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
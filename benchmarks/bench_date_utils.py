@@ -0,0 +1,117 @@
+"""Micro-benchmark for model.helper.date_utils.
+
+Compares per-call cost of format_date / try_parse_date against the previous
+strptime-cascade implementation (kept below as `legacy_*`), on cold (unique)
+and hot (repeated, as in per-cell loops) inputs, and checks both agree.
+
+Run from the repository root:
+    python -m benchmarks.bench_date_utils
+"""
+import re
+import timeit
+from datetime import datetime, date, timedelta
+
+from openpyxl.utils.datetime import from_excel
+
+from model.helper.date_utils import clear_date_cache, format_date, try_parse_date
+
+
+def legacy_format_date(value) -> str:
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    s = str(value).strip()
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(s, fmt).strftime("%Y-%m-%d")
+        except Exception:
+            pass
+    for fmt in ("%d-%b-%Y", "%d-%B-%Y", "%d %b %Y", "%d %B %Y"):
+        try:
+            return datetime.strptime(s, fmt).strftime("%Y-%m-%d")
+        except Exception:
+            pass
+    try:
+        if re.match(r"^\d{1,2}/\d{1,2}$", s):
+            day_str, month_str = s.split("/")
+            dt = datetime(year=datetime.now().year, month=int(month_str), day=int(day_str))
+            return dt.strftime("%Y-%m-%d")
+    except Exception:
+        pass
+    return s
+
+
+def legacy_try_parse_date(value) -> date | None:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    s = str(value).strip()
+    if not s:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return from_excel(float(value)).date()
+        if s.replace('.', '', 1).isdigit():
+            return from_excel(float(s)).date()
+    except Exception:
+        pass
+    try:
+        return datetime.strptime(s, "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+
+def _sample_inputs() -> list:
+    start = datetime(2025, 11, 26)
+    values = []
+    for offset in range(31):
+        day = start + timedelta(days=offset)
+        values += [
+            day.strftime("%Y-%m-%d"),
+            day.strftime("%Y-%m-%d %H:%M:%S"),
+            day.strftime("%d/%m/%Y"),
+            day.strftime("%d-%b-%Y"),
+            day.strftime("%d %B %Y"),
+            day.strftime("%d/%m"),
+            45987 + offset,
+            "Total",
+            None,
+        ]
+    return values
+
+
+def _per_call_ns(func, values, repeat: int, clear=None) -> float:
+    def run():
+        if clear:
+            clear()
+        for value in values:
+            func(value)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(values) * 1e9
+
+
+def main():
+    values = _sample_inputs()
+    hot_values = values * 50
+
+    for value in values:
+        assert format_date(value) == legacy_format_date(value), value
+        assert try_parse_date(value) == legacy_try_parse_date(value), value
+
+    rows = [
+        ("format_date (cold)", legacy_format_date, format_date, values, clear_date_cache),
+        ("format_date (hot)", legacy_format_date, format_date, hot_values, None),
+        ("try_parse_date (cold)", legacy_try_parse_date, try_parse_date, values, clear_date_cache),
+        ("try_parse_date (hot)", legacy_try_parse_date, try_parse_date, hot_values, None),
+    ]
+    print(f"{'case':<24}{'before ns/call':>16}{'after ns/call':>16}{'speedup':>10}")
+    for name, before_func, after_func, inputs, clear in rows:
+        before = _per_call_ns(before_func, inputs, repeat=5)
+        after = _per_call_ns(after_func, inputs, repeat=5, clear=clear)
+        print(f"{name:<24}{before:>16.0f}{after:>16.0f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 # main.py
 import sys
+from multiprocessing import freeze_support
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
 from ui.main_window import MainWindow
 
 from model.helper.app_data import ensure_templates_json, resource_path
+from model.helper.cache_control import prune_cached_data
 
 if __name__ == "__main__":
+    # Output workbooks are saved in worker processes; required for frozen builds
+    freeze_support()
     ensure_templates_json()
+    # Drop sheet snapshots past their age limit, even if nothing is processed this session
+    prune_cached_data()
     app = QApplication(sys.argv)
     # Set application window icon (taskbar/titlebar)
     try:
@@ -1,11 +1,17 @@
-from typing import Optional
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
-from model.base_processor import BaseProcessor
+from model.attendance import attendance_frame_engine
+from model.base_processor import BaseProcessor, ProgressCallback, RunContext
+from model.data_class.comparison_record import ComparisonRecord, IndexKey
 from model.data_class.settings import AttendanceSettings
-from model.helper.date_utils import format_date
 from model.helper.export_file_formatter import ExportFileFormatter, WorkbookType
-from model.helper.save_utils import save_target_workbooks
+from model.helper.grid_window import GridWindow
+from model.helper.hris_index import ATTENDANCE_HRIS_LAYOUT, HrisIndex
+from model.helper.save_utils import close_target_workbooks, save_target_workbooks
+from model.helper.date_utils import date_key
 
 class AttendanceComparator(BaseProcessor):
     """
@@ -16,8 +22,6 @@ class AttendanceComparator(BaseProcessor):
     def __init__(self, formatter: Optional[ExportFileFormatter] = None):
         super().__init__()
         self.formatter = formatter or ExportFileFormatter()
-        self.attendance_index: dict[str, dict] = {} # key -> record
-        self.duplicates = [] # optional list to collect duplicates
     
     def compare(
         self, 
@@ -25,211 +29,199 @@ class AttendanceComparator(BaseProcessor):
         date_start_str: str, 
         date_end_str: str, 
         attendance_file: str,
-        hris_file: str
-    ) -> None:
+        hris_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> list[Path]:
         """Run the comparison process with given settings and files."""
         print("Starting comparison process...")
-        attendance_settings = self.apply_attendance_settings(settings)
-        source_wb = self.load_source_wb(attendance_file)
-        hris_wb = self.load_hris_wb(hris_file)
-        output_dir = self.get_output_dir(attendance_file)
-        source_ws = self.get_source_sheets(source_wb, attendance_settings.sheet_names)
-        hris_ws = self.get_hris_source_sheets(hris_wb)
+        run = self.start_run(progress_callback, cancel_event)
+        attendance_settings = self.apply_attendance_settings(run, settings)
+        try:
+            output_dir = self.get_output_dir(attendance_file)
+            target_codes = {code for code, checked in attendance_settings.company_codes.items() if checked}
         
-        print("Preparing target workbooks...")
+            # Load and parse the attendance and HRIS workbooks side by side
+            run.report_progress("Loading attendance and HRIS workbooks...", 0, 3)
+            (run.index, run.duplicates), hris_index = self.run_in_processes(
+                run,
+                (self._index_attendance_file, run, attendance_file, attendance_settings, target_codes, date_start_str, date_end_str),
+                (self.load_hris_index, run, hris_file, ATTENDANCE_HRIS_LAYOUT),
+                max_workers=self.workers_for(
+                    self.load_workers, (attendance_file, attendance_settings.sheet_names), (hris_file, None)
+                ),
+            )
+            self.keep_hris_index(hris_file, ATTENDANCE_HRIS_LAYOUT, hris_index)
         
-        # Prepare target workbooks for each selected company code
-        targets = {
-            code: self.formatter.prepare_workbook(code, WorkbookType.COMPARE)
-            for code, checked in attendance_settings.company_codes.items()
-            if checked
-        }
-
-        print(f"Target workbooks prepared. Company codes: {list(targets.keys())}")
-        # Process attendance and HRIS sheets
-        for ws in source_ws:
-            self._process_attendance_sheet(ws, attendance_settings, targets, date_start_str, date_end_str)
-        for ws in hris_ws:
-            self._process_hris_sheet(ws, attendance_settings, targets, date_start_str, date_end_str)
-            
-        self._build_attendance_comparison_row(self.attendance_index, targets)
+            run.report_progress("Matching HRIS data...", 1, 3)
+            default_start = attendance_settings.company_code_col + 1
+            if self._use_frame_engine(attendance_settings):
+                windows = self.hris_windows(run, hris_index, run.index, date_start_str, date_end_str, default_start)
+                self._apply_hris_statuses_frame(run, hris_index, windows)
+            else:
+                hris_cells = self.match_hris_cells(
+                    run, hris_index, run.index, date_start_str, date_end_str, default_start
+                )
+                self._apply_hris_statuses(run, hris_cells)
+        
+            print("Preparing target workbooks...")
+        
+            # Prepare target workbooks for each selected company code
+            targets = {
+                code: self.formatter.prepare_workbook(code, WorkbookType.COMPARE)
+                for code, checked in attendance_settings.company_codes.items()
+                if checked
+            }
+            try:
+                print(f"Target workbooks prepared. Company codes: {list(targets.keys())}")
+                self._build_attendance_comparison_row(run.index, targets)
             
-        save_target_workbooks(
-            targets=targets,
-            output_dir=output_dir,
-            date_start_str=date_start_str,
-            date_end_str=date_end_str,
-            type_str="Attendance Comparison",
-            template_name=settings.get("template_name"),
-            formatter=self.formatter,
-        )
+                run.report_progress("Saving output files...", 2, 3)
+                saved = save_target_workbooks(
+                    targets=targets,
+                    output_dir=output_dir,
+                    date_start_str=date_start_str,
+                    date_end_str=date_end_str,
+                    type_str="Attendance Comparison",
+                    template_name=settings.get("template_name"),
+                    formatter=self.formatter,
+                    max_workers=self.save_workers,
+                )
+                return list(saved)
+            finally:
+                # spool files of targets a cancelled or failed run never saved
+                close_target_workbooks(targets)
+        finally:
+            # the index is no longer needed once the outputs are saved
+            run.release()
+    
+    def _index_attendance_file(
+        self,
+        run: RunContext,
+        attendance_file: str,
+        settings: AttendanceSettings,
+        target_codes: set[str],
+        date_start_str: str,
+        date_end_str: str
+    ) -> tuple[dict[IndexKey, ComparisonRecord], list[ComparisonRecord]]:
+        """Load the attendance workbook and index its records (runs in a worker process)."""
+        run.index = {}
+        run.duplicates = []
+        source_wb = self.load_source_wb(attendance_file)
+        try:
+            for ws in self.get_source_sheets(source_wb, settings.sheet_names):
+                self._process_attendance_sheet(run, ws, settings, target_codes, date_start_str, date_end_str)
+        finally:
+            source_wb.close()
+        return run.index, run.duplicates
     
     def _process_attendance_sheet(
         self, 
+        run: RunContext,
         ws: Worksheet, 
         settings: AttendanceSettings,
-        targets: dict[str, Workbook],
+        target_codes: set[str],
         date_start_str: str, 
         date_end_str: str
     ) -> None:
         print(f"Processing attendance sheet: {ws.title}")
         
-        # Find last non-empty cell in row_counter_col, from bottom up
-        last_data_row = settings.data_start_row
-        for row in range(ws.max_row, settings.data_start_row - 1, -1):
-            value = ws.cell(row=row, column=settings.row_counter_col).value
-            if value is not None and str(value).strip() != "":
-                last_data_row = row
-                break
-        
-        # Extract dates from header row
-        header_dates = []
-        for col in range(settings.company_code_col + 1, ws.max_column + 1):
-            cell_value = ws.cell(row=settings.date_header_row, column=col).value
-            try:
-                date = format_date(cell_value)
-                header_dates.append((col, date))
-            except Exception:
-                continue
+        # Index dates from header row once and resolve the date range window
+        header_index = self.build_header_index(ws, settings.date_header_row, settings.company_code_col + 1)
+        start_col, end_col = header_index.column_window(date_start_str, date_end_str)
             
-        # Determine start and end columns based on date range
-        start_col = None
-        end_col = None
+        print(f"Data rows: from {settings.data_start_row}, Columns: {start_col} to {end_col}")
         
-        for col, date in header_dates:
-            if date == date_start_str and start_col is None:
-                start_col = col
-            if date == date_end_str:
-                end_col = col
-
-        if start_col is None:
-            start_col = settings.company_code_col + 1
-        if end_col is None:
-            end_col = ws.max_column
-            
-        print(f"Data rows: {settings.data_start_row} to {last_data_row}, Columns: {start_col} to {end_col}")
+        window_dates = [(col, formatted_date, date_key(formatted_date))
+                        for col, formatted_date in header_index.dates_in_window(start_col, end_col)]
+        max_col = max(end_col, settings.employee_id_col, settings.employee_name_col,
+                      settings.company_code_col, settings.row_counter_col)
         
-        # Process each row of data
-        for row in range(settings.data_start_row, last_data_row + 1):
-            employee_id = ws.cell(row=row, column=settings.employee_id_col).value
-            employee_name = ws.cell(row=row, column=settings.employee_name_col).value
-            company_code = ws.cell(row=row, column=settings.company_code_col).value
+        # Keep the rows of selected employees and companies in a single pass over the sheet
+        employees = []
+        rows = []
+        for row, values in self.scan_rows(run, ws, settings.data_start_row, max_col, settings.row_counter_col):
+            employee_id = values[settings.employee_id_col - 1]
+            employee_name = values[settings.employee_name_col - 1]
+            company_code = values[settings.company_code_col - 1]
 
             if not employee_id or str(employee_id).strip() in settings.ignore_list:
                 continue
 
-            if company_code not in targets:
+            if company_code not in target_codes:
                 continue
 
-            for col in range(start_col, end_col + 1):
-                code = ws.cell(row=row, column=col).value
-                date = ws.cell(row=settings.date_header_row, column=col).value
-                if not code or str(code).strip() == "" or not date:
-                    continue
+            employees.append((str(employee_id).strip(), employee_name, company_code))
+            rows.append(values)
 
-                formatted_date = format_date(date)
-                employee_id_str = str(employee_id).strip()
+        # Records are built only for the non-empty cells of the window
+        grid = GridWindow(rows, [col for col, _, _ in window_dates])
+        for row_index, window_index, code in grid.hits(lambda code: bool(code) and str(code).strip() != ""):
+            employee_id_str, employee_name, company_code = employees[row_index]
+            _, formatted_date, day = window_dates[window_index]
 
-                key = f"{formatted_date}_{employee_id_str}"
-                status, timein, timeout = self.map_status_by_code(code)
-                
-                record = {
-                    "hris_status":"",
-                    "date": formatted_date,
-                    "employee_id": employee_id_str,
-                    "employee_name": employee_name or "",
-                    "company_code": company_code,
-                    "status_code": code,
-                    "status": status,
-                    "overtime": 0,
-                    "timein": timein,
-                    "timeout": timeout,
-                    "notes": ""
-                }
-                
-                if key in self.attendance_index:
-                    self.duplicates.append(record)
-                else:
-                    self.attendance_index[key] = record
+            key = (day, employee_id_str)
+            status, timein, timeout = self.map_status_by_code(run, code)
+            
+            record = ComparisonRecord(
+                date=formatted_date,
+                employee_id=employee_id_str,
+                employee_name=employee_name or "",
+                company_code=company_code,
+                status_code=code,
+                status=status,
+                time_in=timein,
+                time_out=timeout,
+            )
+            
+            if key in run.index:
+                run.duplicates.append(record)
+            else:
+                run.index[key] = record
 
-                
-    def _process_hris_sheet(
-        self, 
-        ws: Worksheet,
-        settings: AttendanceSettings,
-        targets: dict[str, Workbook],
-        date_start_str: str, 
-        date_end_str: str
-    ) -> None:
-        print(f"Processing HRIS sheet: {ws.title}")
-        
-        start_row = 2
-        id_col = 1
-        name_col = 2
-        
-        # Extract dates from header row
-        header_dates = []
-        for col in range(5, ws.max_column + 1):
-            cell_value = ws.cell(row=1, column=col).value
-            try:
-                date = format_date(cell_value)
-                header_dates.append((col, date))
-            except Exception:
+    def _apply_hris_statuses(self, run: RunContext, hris_cells: Iterable[tuple[IndexKey, object]]) -> None:
+        for key, status in hris_cells:
+            if not status or str(status).strip() == "":
                 continue
             
-        # Determine start and end columns based on date range
-        start_col = None
-        end_col = None
-        
-        for col, date in header_dates:
-            if date == date_start_str and start_col is None:
-                start_col = col
-            if date == date_end_str:
-                end_col = col
+            matched_record = run.index.get(key)
+            if matched_record:
+                matched_record.hris_status = status
 
-        if start_col is None:
-            start_col = settings.company_code_col + 1
-        if end_col is None:
-            end_col = ws.max_column
-        
-        # Process each row of data
-        for row in range(start_row, ws.max_row + 1):
-            employee_id = ws.cell(row=row, column=id_col).value
+    def _use_frame_engine(self, settings: AttendanceSettings) -> bool:
+        if settings.compare_engine != attendance_frame_engine.ENGINE_NAME:
+            return False
+        if not attendance_frame_engine.is_available():
+            print("pandas is not installed; using the default compare engine")
+            return False
+        return True
 
-            for col in range(start_col, end_col + 1):
-                date = ws.cell(row=1, column=col).value
-                status = ws.cell(row=row, column=col).value
-                if not status or str(status).strip() == "" or not date:
-                    continue
-                
-                formatted_date = format_date(date)
-                employee_id_str = str(employee_id).strip()
-                key = f"{formatted_date}_{employee_id_str}"
-                matched_record = self.attendance_index.get(key)
-                
-                if matched_record:
-                    matched_record["hris_status"] = status
+    def _apply_hris_statuses_frame(self, run: RunContext, hris_index: HrisIndex, windows: list[tuple[int, int]]) -> None:
+        """Vectorised counterpart of _apply_hris_statuses (pandas compare engine)."""
+        statuses = attendance_frame_engine.match_hris_statuses(run.index, hris_index, windows)
+        for record, status in zip(run.index.values(), statuses):
+            record.hris_status = status
 
     def _build_attendance_comparison_row(
         self, 
-        attendance_index: dict[str, dict], 
+        attendance_index: dict[IndexKey, ComparisonRecord], 
         targets: dict[str, Workbook]
     ) -> None:
         for key, record in attendance_index.items():
-            company_code = record.get("company_code")
+            company_code = record.company_code
             ws_target = targets.get(company_code).active
             ws_target.append([
-                record.get("status"),  # Manual
-                record.get("hris_status"),  # HRIS
-                record.get("status") == record.get("hris_status"),  # Difference
-                record.get("date"),
-                record.get("employee_id"),
-                record.get("employee_name"),
-                record.get("status"),
-                record.get("overtime"),
-                record.get("timein"),
-                record.get("timeout"),
-                record.get("notes"),
+                record.status,  # Manual
+                record.hris_status,  # HRIS
+                record.status == record.hris_status,  # Difference
+                record.date,
+                record.employee_id,
+                record.employee_name,
+                record.status,
+                record.overtime,
+                record.time_in,
+                record.time_out,
+                record.notes,
             ])
 
         
\ No newline at end of file
@@ -1,11 +1,13 @@
+import threading
+from pathlib import Path
 from typing import Optional
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
-from model.base_processor import BaseProcessor
+from model.base_processor import BaseProcessor, ProgressCallback, RunContext
 from model.data_class.settings import AttendanceSettings
-from model.helper.date_utils import format_date
 from model.helper.export_file_formatter import ExportFileFormatter, WorkbookType
-from model.helper.save_utils import save_target_workbooks
+from model.helper.grid_window import GridWindow
+from model.helper.save_utils import close_target_workbooks, save_target_workbooks
 
 class AttendanceExtractor(BaseProcessor):
     """Class to handle attendance extraction from Excel files."""
@@ -18,11 +20,15 @@ class AttendanceExtractor(BaseProcessor):
         settings: dict, 
         date_start_str: str, 
         date_end_str: str, 
-        file: str
-    ) -> None:
+        file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> list[Path]:
         """Run the extraction process with given settings and file."""
         print("Starting extraction process...")
-        attendance_settings = self.apply_attendance_settings(settings)
+        run = self.start_run(progress_callback, cancel_event)
+        run.report_progress("Loading workbook...", 0, 0)
+        attendance_settings = self.apply_attendance_settings(run, settings)
         source_wb = self.load_source_wb(file)
         output_dir = self.get_output_dir(file)
         source_ws = self.get_source_sheets(source_wb, attendance_settings.sheet_names)
@@ -34,21 +40,34 @@ class AttendanceExtractor(BaseProcessor):
             if checked
         }
         
-        for ws in source_ws:
-            self._process_source_sheet(ws, attendance_settings, targets, date_start_str, date_end_str)
+        total_steps = len(source_ws) + 1
+        try:
+            try:
+                for step, ws in enumerate(source_ws):
+                    run.report_progress(f"Processing sheet: {ws.title}", step, total_steps)
+                    self._process_source_sheet(run, ws, attendance_settings, targets, date_start_str, date_end_str)
+            finally:
+                source_wb.close()
             
-        save_target_workbooks(
-            targets=targets,
-            output_dir=output_dir,
-            date_start_str=date_start_str,
-            date_end_str=date_end_str,
-            type_str="Attendance",
-            template_name=settings.get("template_name"),
-            formatter=self.formatter,
-        )
+            run.report_progress("Saving output files...", total_steps - 1, total_steps)
+            saved = save_target_workbooks(
+                targets=targets,
+                output_dir=output_dir,
+                date_start_str=date_start_str,
+                date_end_str=date_end_str,
+                type_str="Attendance",
+                template_name=settings.get("template_name"),
+                formatter=self.formatter,
+                max_workers=self.save_workers,
+            )
+            return list(saved)
+        finally:
+            # spool files of targets a cancelled or failed run never saved
+            close_target_workbooks(targets)
     
     def _process_source_sheet(
         self, 
+        run: RunContext,
         ws: Worksheet,
         settings: AttendanceSettings,
         targets: dict[str, Workbook], 
@@ -57,44 +76,21 @@ class AttendanceExtractor(BaseProcessor):
     ) -> None:
         print(f"Processing sheet: {ws.title}")
 
-        # Find last non-empty cell in row_counter_col, from bottom up
-        last_data_row = settings.data_start_row
-        for row in range(ws.max_row, settings.data_start_row - 1, -1):
-            value = ws.cell(row=row, column=settings.row_counter_col).value
-            if value is not None and str(value).strip() != "":
-                last_data_row = row
-                break
-        
-        # Extract dates from header row
-        header_dates = []
-        for col in range(settings.company_code_col + 1, ws.max_column + 1):
-            cell_value = ws.cell(row=settings.date_header_row, column=col).value
-            try:
-                date = format_date(cell_value)
-                header_dates.append((col, date))
-            except Exception:
-                continue
+        # Index dates from header row once and resolve the date range window
+        header_index = self.build_header_index(ws, settings.date_header_row, settings.company_code_col + 1)
+        start_col, end_col = header_index.column_window(date_start_str, date_end_str)
             
-        # Determine start and end columns based on date range
-        start_col = None
-        end_col = None
+        print(f"Data rows: from {settings.data_start_row}, Columns: {start_col} to {end_col}")
         
-        for col, date in header_dates:
-            if date == date_start_str and start_col is None:
-                start_col = col
-            if date == date_end_str:
-                end_col = col
-
-        if start_col is None:
-            start_col = settings.company_code_col + 1
-        if end_col is None:
-            end_col = ws.max_column
-            
-        print(f"Data rows: {settings.data_start_row} to {last_data_row}, Columns: {start_col} to {end_col}")
+        window_dates = header_index.dates_in_window(start_col, end_col)
+        max_col = max(end_col, settings.employee_id_col, settings.employee_name_col,
+                      settings.company_code_col, settings.row_counter_col)
         
-        # Process each row of data
-        for row in range(settings.data_start_row, last_data_row + 1):
-            employee_id_raw = ws.cell(row=row, column=settings.employee_id_col).value
+        # Keep the rows of selected employees and companies in a single pass over the sheet
+        employees = []
+        rows = []
+        for row, values in self.scan_rows(run, ws, settings.data_start_row, max_col, settings.row_counter_col):
+            employee_id_raw = values[settings.employee_id_col - 1]
             if not employee_id_raw:
                 continue
             
@@ -102,35 +98,36 @@ class AttendanceExtractor(BaseProcessor):
             if employee_id in settings.ignore_list:
                 continue
             
-            employee_name = ws.cell(row=row, column=settings.employee_name_col).value.strip()
+            employee_name = values[settings.employee_name_col - 1].strip()
             
-            company_code_raw = ws.cell(row=row, column=settings.company_code_col).value
+            company_code_raw = values[settings.company_code_col - 1]
             company_code = str(company_code_raw).strip()
             if not company_code or company_code not in targets:
                 continue
 
-            for col in range(start_col, end_col + 1):
-                code = ws.cell(row=row, column=col).value
-                date_raw = ws.cell(row=settings.date_header_row, column=col).value
-                date = ws.cell(row=settings.date_header_row, column=col).value
-                if not code or date_raw is None :
-                    continue
-                
-                if settings.time_off_only and code in {"H", "HM"}:
-                    continue
+            employees.append((employee_id, employee_name, company_code))
+            rows.append(values)
+
+        # Only cells with a known status (and not a presence code when time_off_only) become rows
+        grid = GridWindow(rows, [col for col, _ in window_dates])
+        for row_index, window_index, code in grid.hits(lambda code: self._is_extracted_code(run, code, settings)):
+            employee_id, employee_name, company_code = employees[row_index]
+            status, timein, timeout = self.map_status_by_code(run, code)
+            ws_target = targets[company_code].active
+            ws_target.append([
+                window_dates[window_index][1],
+                employee_id,
+                employee_name or "",
+                status,
+                0,  # Overtime
+                timein,
+                timeout
+            ])
 
-                status, timein, timeout = self.map_status_by_code(code)
-                if status == "":
-                    continue
-                
-                formatted_date = format_date(date_raw)
-                ws_target = targets[company_code].active
-                ws_target.append([
-                    formatted_date,
-                    employee_id,
-                    employee_name or "",
-                    status,
-                    0,  # Overtime
-                    timein,
-                    timeout
-                ])
\ No newline at end of file
+    def _is_extracted_code(self, run: RunContext, code, settings: AttendanceSettings) -> bool:
+        if not code:
+            return False
+        if settings.time_off_only and run.status_table.is_present(code):
+            return False
+        status, _, _ = self.map_status_by_code(run, code)
+        return status != ""
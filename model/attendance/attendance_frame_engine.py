@@ -0,0 +1,82 @@
+import weakref
+from model.data_class.comparison_record import ComparisonRecord, IndexKey
+from model.helper.hris_index import HrisIndex
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pandas is optional; the comparator keeps its own matching loop
+    np = None
+    pd = None
+
+# Value of the "compare_engine" template setting that selects this engine
+ENGINE_NAME = "pandas"
+
+_KEY_COLUMNS = ["day", "employee_id"]
+
+# Long-form cell frame of every HRIS index in use, built once per index
+_CELL_FRAMES: "weakref.WeakKeyDictionary[HrisIndex, pd.DataFrame]" = weakref.WeakKeyDictionary()
+
+
+def is_available() -> bool:
+    """True when pandas can be imported."""
+    return pd is not None
+
+
+def match_hris_statuses(
+    attendance_index: dict[IndexKey, ComparisonRecord],
+    hris_index: HrisIndex,
+    windows: list[tuple[int, int]]
+) -> list:
+    """Return the HRIS status of every indexed record, in index order ("" when unmatched).
+
+    The HRIS index is held as one long-form (day, employee_id, sheet, col, status) frame;
+    its cells are limited to each sheet's (start_col, end_col) window with array
+    comparisons and joined once with the attendance index on (day, employee_id). As in
+    AttendanceComparator._apply_hris_statuses, empty HRIS cells are ignored and the
+    last non-empty cell of a key wins.
+    """
+    manual = pd.DataFrame(list(attendance_index.keys()), columns=_KEY_COLUMNS, dtype=object)
+    cells = _cell_frame(hris_index)
+
+    bounds = np.asarray(windows, dtype=np.int64).reshape(-1, 2)
+    sheets = cells["sheet"].to_numpy()
+    cols = cells["col"].to_numpy()
+    in_window = (cols >= bounds[sheets, 0]) & (cols <= bounds[sheets, 1])
+    hris = cells.loc[in_window & cells["filled"].to_numpy(), _KEY_COLUMNS + ["hris_status"]]
+    hris = hris.drop_duplicates(_KEY_COLUMNS, keep="last")
+
+    # A left join keeps the order of the manual records
+    merged = manual.merge(hris, on=_KEY_COLUMNS, how="left", sort=False)
+    return merged["hris_status"].fillna("").tolist()
+
+
+def _cell_frame(hris_index: HrisIndex) -> "pd.DataFrame":
+    """Return the index's cells as rows in HrisIndex.match order, with a non-empty flag."""
+    frame = _CELL_FRAMES.get(hris_index)
+    if frame is not None:
+        return frame
+
+    days = []
+    employee_ids = []
+    sheets = []
+    cols = []
+    statuses = []
+    for (day, employee_id), key_cells in hris_index.cells.items():
+        for sheet, col, status in key_cells:
+            days.append(day)
+            employee_ids.append(employee_id)
+            sheets.append(sheet)
+            cols.append(col)
+            statuses.append(status)
+    frame = pd.DataFrame({
+        "day": pd.Series(days, dtype=object),
+        "employee_id": pd.Series(employee_ids, dtype=object),
+        "sheet": np.asarray(sheets, dtype=np.int64),
+        "col": np.asarray(cols, dtype=np.int64),
+        "hris_status": pd.Series(statuses, dtype=object),
+    })
+    status = frame["hris_status"]
+    frame["filled"] = status.astype(bool) & (status.astype(str).str.strip() != "")
+    _CELL_FRAMES[hris_index] = frame
+    return frame
@@ -1,18 +1,189 @@
+import os
+import threading
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
 from openpyxl import Workbook, load_workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from model.data_class.settings import AttendanceSettings, OvertimeOptDrvSettings, OvertimeSettings
+from model.data_class.comparison_record import IndexKey
+from model.helper.date_utils import clear_date_cache, date_key
+from model.helper.header_date_index import HeaderDateIndex
+from model.helper.hris_index import HRIS_INDEXES, HrisIndex, HrisIndexCache, HrisLayout
+from model.helper.process_pool import spawn_pool
+from model.helper.sheet_cache import SHEET_CACHE, SheetCache, is_blank_row
+from model.helper.sheet_catalog import SheetEntry, read_sheet_catalog
+from model.helper.status_table import (
+    ATTENDANCE_PRESENT_CODES, ATTENDANCE_STATUS_CODES, SHIFT_STATUS_CODES, StatusTable,
+    parse_present_codes, parse_status_codes
+)
+# ProcessingCancelled and ProgressCallback are re-exported for the processors and view models
+from model.run_context import ProcessingCancelled, ProgressCallback, RunContext
+
+def _call_and_take_cached(function: Callable, *args):
+    # Runs in a worker process: hand the sheets it parsed back for the parent's cache
+    SHEET_CACHE.record_added = True
+    SHEET_CACHE.take_added()
+    return function(*args), SHEET_CACHE.take_added()
+
 
 class BaseProcessor:
-    
-    def apply_attendance_settings(self, settings: dict[str, any]) -> AttendanceSettings:
+    # Consecutive empty rows after which a sheet scan assumes the data has ended
+    max_blank_rows: int = 1000
+    # Rows between progress reports (and cancellation checks) while scanning a sheet
+    progress_interval: int = 500
+    # Processes used to save the per-company outputs; None means one per workbook (up to the
+    # CPU count) for large outputs, see save_utils.PARALLEL_SAVE_MIN_ROWS; 1 saves them one
+    # after another
+    save_workers: Optional[int] = None
+    # Processes used to load the source and HRIS workbooks of a comparison side by side;
+    # None means one per workbook for inputs of parallel_min_bytes or more, 1 loads them
+    # one after another in this process
+    load_workers: Optional[int] = None
+    # Processes used to parse multi-sheet sources one sheet per process; None means one per
+    # sheet (up to the CPU count) for sources of parallel_min_bytes or more, 1 parses the
+    # sheets one after another in this process
+    sheet_workers: Optional[int] = None
+    # With automatic worker counts (None), inputs smaller than this together are loaded in
+    # this process: spawning workers re-imports the app in each of them, which costs more
+    # than it saves on small files
+    parallel_min_bytes: int = 4 * 1024 * 1024
+    # Seconds between cancellation checks while waiting on worker processes
+    worker_poll_interval: float = 0.2
+    # Parsed sheets shared by all processors of the process; None loads every workbook from disk
+    sheet_cache: Optional[SheetCache] = SHEET_CACHE
+    # HRIS indexes shared by the comparators; None indexes the HRIS workbook on every compare
+    hris_indexes: Optional[HrisIndexCache] = HRIS_INDEXES
+
+    def start_run(
+        self,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> RunContext:
+        """Create the context of a run that is starting."""
+        return RunContext(progress_callback, cancel_event)
+
+    def run_in_processes(self, run: RunContext, *calls: tuple, max_workers: Optional[int] = None) -> list:
+        """Run (function, *args) calls in worker processes; return the results in call order.
+
+        Results travel back pickled, so calls should return plain parsed data rather than
+        openpyxl objects. Sheets the workers parse come back with the results and are added
+        to this process's sheet cache. Cancellation is checked while waiting. max_workers None
+        means one process per call; with max_workers == 1, or when no process pool can be
+        started, the calls run one after another in this process. Workers are spawned, see
+        `spawn_pool`.
+        """
+        if max_workers == 1 or len(calls) < 2:
+            return [function(*args) for function, *args in calls]
+
+        try:
+            pool = spawn_pool(min(max_workers or len(calls), len(calls)))
+        except (OSError, NotImplementedError):
+            return [function(*args) for function, *args in calls]
+
+        cancelled = False
+        try:
+            futures = [pool.submit(_call_and_take_cached, function, *args) for function, *args in calls]
+            pending = set(futures)
+            while pending:
+                if run.is_cancelled():
+                    cancelled = True
+                    run.check_cancelled()
+                _, pending = wait(pending, timeout=self.worker_poll_interval)
+            results = []
+            for future in futures:
+                result, cached_sheets = future.result()
+                if self.sheet_cache is not None:
+                    self.sheet_cache.add_all(cached_sheets)
+                results.append(result)
+            return results
+        except BrokenProcessPool:
+            print("Worker processes unavailable; processing in this process instead")
+            return [function(*args) for function, *args in calls]
+        finally:
+            pool.shutdown(wait=not cancelled, cancel_futures=True)
+
+    def map_source_sheets(
+        self,
+        run: RunContext,
+        file_path: str,
+        sheet_names: list[str],
+        function: Callable,
+        *args
+    ) -> list:
+        """Call function(run, ws, *args) for every source sheet; return the results in sheet order.
+
+        With more than one sheet and sheet_workers other than 1, every sheet is handled in its
+        own worker process, which opens the workbook itself; function must then be picklable
+        (e.g. a bound method of this processor) and return plain data.
+        """
+        source_wb = self.load_source_wb(file_path)
+        try:
+            titles = self.get_source_sheet_titles(source_wb, sheet_names)
+            workers = self.workers_for(self.sheet_workers, (file_path, sheet_names))
+            if workers is None:
+                workers = min(len(titles), os.cpu_count() or 1)
+            if workers <= 1 or len(titles) < 2:
+                results = []
+                for step, title in enumerate(titles):
+                    run.report_progress(f"Processing sheet: {title}", step, len(titles) + 1)
+                    results.append(function(run, self._use_populated_extent(source_wb[title]), *args))
+                return results
+        finally:
+            source_wb.close()
+
+        run.report_progress(f"Processing {len(titles)} sheets in parallel...", 0, len(titles) + 1)
+        return self.run_in_processes(
+            run,
+            *[(self._map_source_sheet, run, file_path, title, function, *args) for title in titles],
+            max_workers=workers,
+        )
+
+    def _map_source_sheet(self, run: RunContext, file_path: str, title: str, function: Callable, *args):
+        source_wb = self.load_source_wb(file_path)
+        try:
+            return function(run, self._use_populated_extent(source_wb[title]), *args)
+        finally:
+            source_wb.close()
+
+    def workers_for(self, workers: Optional[int], *files: tuple[str, Optional[list[str]]]) -> Optional[int]:
+        """Return workers, or 1 when the files are better loaded in this process.
+
+        That is when the sheets of every (file path, sheet names) are cached, since cached
+        sheets are read from this process's memory, which beats re-parsing them in worker
+        processes; while any of the files is being prefetched, as this process then waits
+        for the sheets the prefetch is parsing instead of parsing them again; and, when
+        workers is None (automatic), when the files together are smaller than
+        parallel_min_bytes. Sheet names None stands for every sheet of the workbook.
+        """
+        if self.sheet_cache is not None and (
+            any(self.sheet_cache.is_prefetching(file_path) for file_path, _ in files)
+            or all(self.sheet_cache.holds(file_path, sheet_names) for file_path, sheet_names in files)
+        ):
+            return 1
+        if workers is None and self._total_size(file_path for file_path, _ in files) < self.parallel_min_bytes:
+            return 1
+        return workers
+
+    def _total_size(self, file_paths: Iterable[str]) -> int:
+        total = 0
+        for file_path in file_paths:
+            try:
+                total += os.path.getsize(file_path)
+            except OSError:
+                pass
+        return total
+
+    def apply_attendance_settings(self, run: RunContext, settings: dict[str, any]) -> AttendanceSettings:
         """
         Apply or update settings before running processing.
         Should be called every time before extract/compare.
         Returns an AttendanceSettings object with parsed configuration.
         """
 
-        self.attendance_settings = AttendanceSettings(
+        clear_date_cache()  # date parse memo is per run
+        attendance_settings = AttendanceSettings(
             employee_id_col=int(settings.get("employee_id_column") or 2),
             employee_name_col=int(settings.get("employee_name_column") or 3),
             company_code_col=int(settings.get("company_code_column") or 5),
@@ -22,12 +193,19 @@ class BaseProcessor:
             sheet_names=self._parse_comma_list(settings.get("sheet_names", "")),
             ignore_list=self._parse_comma_list(settings.get("ignore_list", "")),
             company_codes=settings.get("company_codes", {}),
-            time_off_only=settings.get("time_off_only", False)
+            time_off_only=settings.get("time_off_only", False),
+            compare_engine=settings.get("compare_engine") or "python",
+            status_codes=parse_status_codes(settings.get("custom_status_codes")),
+            present_codes=parse_present_codes(settings.get("custom_status_codes"))
+        )
+        run.status_table = StatusTable.with_custom_codes(
+            ATTENDANCE_STATUS_CODES, attendance_settings.status_codes,
+            default_present=ATTENDANCE_PRESENT_CODES, custom_present=attendance_settings.present_codes
         )
 
-        return self.attendance_settings
+        return attendance_settings
     
-    def apply_overtime_settings(self, settings: dict[str, any]) -> OvertimeSettings:
+    def apply_overtime_settings(self, run: RunContext, settings: dict[str, any]) -> OvertimeSettings:
         """
         Apply or update settings before running processing.
         Should be called every time before extract/compare.
@@ -48,7 +226,8 @@ class BaseProcessor:
         ovt_col = ovt_hour_col + 1
         notes_col = ovt_col + 2
 
-        self.overtime_settings = OvertimeSettings(
+        clear_date_cache()  # date parse memo is per run
+        overtime_settings = OvertimeSettings(
             employee_id_col=emp_col,
             data_start_row=data_start,
             row_counter_col=row_counter,
@@ -61,10 +240,14 @@ class BaseProcessor:
             ovt_end_col=ovt_end_col,
             ovt_hour_col=ovt_hour_col,
             ovt_col=ovt_col,
-            notes_col=notes_col
+            notes_col=notes_col,
+            shift_codes=parse_status_codes(settings.get("custom_shift_codes"))
+        )
+        run.shift_table = StatusTable.with_custom_codes(
+            SHIFT_STATUS_CODES, overtime_settings.shift_codes, keep_unknown=True
         )
 
-        return self.overtime_settings
+        return overtime_settings
     
     def apply_overtime_optdrv_settings(self, settings: dict[str, any]) -> OvertimeOptDrvSettings:
         """
@@ -73,7 +256,8 @@ class BaseProcessor:
         Returns an OvertimeOptDrvSettings object with parsed configuration.
         """
 
-        self.overtime_optdrv_settings = OvertimeOptDrvSettings(
+        clear_date_cache()  # date parse memo is per run
+        return OvertimeOptDrvSettings(
             employee_id_col=int(settings.get("employee_id_column") or 2),
             data_start_row=int(settings.get("data_start_row") or 5),
             employee_name_col=int(settings.get("employee_name_column") or 3),
@@ -83,67 +267,262 @@ class BaseProcessor:
             sheet_names=self._parse_comma_list(settings.get("sheet_names", "")),
             company_codes=settings.get("company_codes", {})
         )
-
-        return self.overtime_optdrv_settings
     
-    def load_source_wb(self, file_path: str) -> Workbook:
-        """Load Source Excel file. This will handle both attendance and overtime files."""
+    def load_source_wb(self, file_path: str, read_only: bool = True) -> Workbook:
+        """Load Source Excel file. This will handle both attendance and overtime files.
+
+        By default the workbook is opened in streaming (read-only) mode: rows are parsed
+        lazily from the sheet XML, so memory scales with one row instead of the workbook.
+        With a sheet cache, read-only sheets are parsed once into the cache and served from
+        memory by every later load of the unchanged file, on any page.
+        Callers must close the workbook when done.
+        """
         path = Path(file_path)
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
-        source_wb = load_workbook(path, data_only=True)
+        if read_only and self.sheet_cache is not None and self.sheet_cache.budget_bytes > 0:
+            return self.sheet_cache.open(str(path), self.max_blank_rows)
+        source_wb = load_workbook(path, read_only=read_only, data_only=True)
         return source_wb
     
-    def load_hris_wb(self, hris_file: str) -> Workbook:
-        """Load HRIS Excel file. This will handle both attendance and overtime HRIS files."""
+    def load_hris_wb(self, hris_file: str, read_only: bool = True) -> Workbook:
+        """Load HRIS Excel file. This will handle both attendance and overtime HRIS files.
+
+        Opened in streaming (read-only) mode by default, see `load_source_wb`.
+        """
         path = Path(hris_file)
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
-        hris_wb = load_workbook(path, data_only=True)
+        if read_only and self.sheet_cache is not None and self.sheet_cache.budget_bytes > 0:
+            return self.sheet_cache.open(str(path), self.max_blank_rows)
+        hris_wb = load_workbook(path, read_only=read_only, data_only=True)
         return hris_wb
 
+    def prefetch_workbook(self, file_path: str, cancel_event: Optional[threading.Event] = None) -> int:
+        """Parse a workbook into the sheet cache before it is used; return its sheet count.
+
+        Meant to run in the background as soon as a file is chosen, so the run that follows
+        reads the parsed sheets from memory. Does nothing (and returns 0) without a cache.
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        if self.sheet_cache is None or self.sheet_cache.budget_bytes <= 0:
+            return 0
+        return self.sheet_cache.prefetch(str(path), self.max_blank_rows, cancel_event)
+
+    def read_sheet_catalog(self, file_path: str) -> list[SheetEntry]:
+        """List a workbook's sheets with their declared extent and the company code of their title."""
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        entries = read_sheet_catalog(str(path))
+        for entry in entries:
+            entry.company_code = self._company_code_from_sheet_title(entry.title)
+        return entries
+
     def get_output_dir(self, file_path: str) -> Path:
         """Return directory where output files should be saved."""
         return Path(file_path).parent
 
     def get_source_sheets(self, source_wb: Workbook, sheet_names: list[str]) -> list[Worksheet]:
         """Return sheet objects based on settings.sheet_names."""
+        return [self._use_populated_extent(source_wb[title])
+                for title in self.get_source_sheet_titles(source_wb, sheet_names)]
+
+    def get_source_sheet_titles(self, source_wb: Workbook, sheet_names: list[str]) -> list[str]:
+        """Return the titles of the sheets selected by settings.sheet_names, without reading them."""
         if not source_wb:
             raise ValueError("Workbook not loaded yet.")
         if not sheet_names:
-            return [source_wb.active]
-        return [source_wb[sheet] for sheet in sheet_names if sheet in source_wb.sheetnames]
+            return [source_wb.active.title]
+        return [sheet for sheet in sheet_names if sheet in source_wb.sheetnames]
     
     def get_hris_source_sheets(self, hris_wb: Workbook) -> list[Worksheet]:
         """Return sheet objects based on settings.sheet_names."""
         if not hris_wb: 
             raise ValueError("Workbook not loaded yet.")
-        return [hris_wb[sheet] for sheet in hris_wb.sheetnames]
+        return [self._use_populated_extent(hris_wb[sheet]) for sheet in hris_wb.sheetnames]
+
+    def _use_populated_extent(self, ws: Worksheet) -> Worksheet:
+        """Make a read-only sheet ignore its stored <dimension>.
+
+        Sheets formatted down to row 1,048,576 (or out to column XFD) declare that as
+        their extent, and read-only iteration would pad every row and append empty
+        rows up to it. Without the stored dimension, rows end where the sheet XML
+        ends and each row is as wide as its last cell.
+        """
+        reset_dimensions = getattr(ws, "reset_dimensions", None)
+        if reset_dimensions is not None:
+            reset_dimensions()
+        return ws
     
-    def map_status_by_code(self, code: str) -> tuple[str, str, str]:
+    def read_row(self, ws: Worksheet, row: int) -> tuple:
+        """Return the values of a single 1-based worksheet row (e.g. a header row)."""
+        return next(ws.iter_rows(min_row=row, max_row=row, values_only=True), ())
+
+    def build_header_index(self, ws: Worksheet, header_row: int, first_col: int) -> HeaderDateIndex:
+        """Read a sheet's date header row once and index its dates from first_col onwards."""
+        header = self.read_row(ws, header_row)
+        return HeaderDateIndex(header, first_col, ws.max_column or len(header))
+
+    def scan_rows(
+        self,
+        run: RunContext,
+        ws: Worksheet,
+        data_start_row: int,
+        max_col: int,
+        row_counter_col: int | None = None
+    ) -> Iterator[tuple[int, tuple]]:
+        """Read a sheet once, yielding (row_number, values) for its data block.
+
+        Rows come from a single sequential iter_rows pass bounded to columns
+        1..max_col, so `values[col - 1]` is the value of column `col` for any
+        col <= max_col. When row_counter_col is given, the block ends at the last
+        row whose counter is filled (data_start_row itself is always included):
+        rows after a filled counter are held back until the next filled counter
+        shows up, so trailing rows are dropped without knowing max_row upfront.
+        Without a row_counter_col every row from data_start_row is yielded.
+
+        Scanning stops after `max_blank_rows` consecutive empty rows, so formatted
+        but empty rows below the data (often down to row 1,048,576) are never walked.
+        """
+        pending: list[tuple[int, tuple]] = []
+        blank_run = 0
+        rows = ws.iter_rows(min_row=data_start_row, max_col=max_col, values_only=True)
+        for row, values in enumerate(rows, start=data_start_row):
+            if (row - data_start_row) % self.progress_interval == 0:
+                run.report_progress(f"{ws.title}: reading row {row}")
+            if self._is_blank_row(values):
+                blank_run += 1
+                if blank_run >= self.max_blank_rows:
+                    break
+            else:
+                blank_run = 0
+            if len(values) < max_col:
+                values = values + (None,) * (max_col - len(values))
+            if row_counter_col is None or row == data_start_row:
+                yield row, values
+                continue
+            pending.append((row, values))
+            counter = values[row_counter_col - 1]
+            if counter is not None and str(counter).strip() != "":
+                yield from pending
+                pending.clear()
+
+    def _is_blank_row(self, values: tuple) -> bool:
+        """True when every value of a row is empty or whitespace."""
+        return is_blank_row(values)
+
+    def load_hris_index(self, run: RunContext, hris_file: str, layout: HrisLayout) -> HrisIndex:
+        """Return the (date, employee) index of an HRIS workbook (runs in a worker process).
+
+        The index is built once per file and layout and then comes from the shared
+        HRIS index cache, so one HRIS export serves every comparator.
+        """
+        if self.hris_indexes is not None:
+            index = self.hris_indexes.get(hris_file, layout)
+            if index is not None:
+                print(f"Using the saved HRIS index of {Path(hris_file).name}")
+                return index
+
+        index = HrisIndex()
+        hris_wb = self.load_hris_wb(hris_file)
+        try:
+            for ws in self.get_hris_source_sheets(hris_wb):
+                self._index_hris_sheet(run, ws, layout, index)
+        finally:
+            hris_wb.close()
+        if self.hris_indexes is not None:
+            self.hris_indexes.put(hris_file, layout, index)
+        return index
+
+    def keep_hris_index(self, hris_file: str, layout: HrisLayout, index: HrisIndex) -> None:
+        """Keep an HRIS index returned by load_hris_index in this process's HRIS index cache.
+
+        An index built in a worker process is cached (and saved) there only; keeping it
+        here lets the next compare, on any page, skip indexing the same export.
+        """
+        if self.hris_indexes is not None:
+            self.hris_indexes.remember(hris_file, layout, index)
+
+    def _index_hris_sheet(self, run: RunContext, ws: Worksheet, layout: HrisLayout, index: HrisIndex) -> None:
+        print(f"Processing HRIS sheet: {ws.title}")
+        header_index = self.build_header_index(ws, layout.header_row, layout.first_date_col)
+        sheet = index.add_sheet(header_index)
+        max_col = max(header_index.last_col, layout.id_col)
+        for row, values in self.scan_rows(run, ws, layout.data_start_row, max_col):
+            employee_id = values[layout.id_col - 1]
+            if layout.skip_blank_ids and not employee_id:
+                continue
+            index.add_row(sheet, str(employee_id).strip(), values)
+
+    def match_hris_cells(
+        self,
+        run: RunContext,
+        hris_index: HrisIndex,
+        index_keys: Iterable[IndexKey],
+        date_start_str: str,
+        date_end_str: str,
+        default_start: Optional[int] = None
+    ) -> Iterator[tuple[IndexKey, object]]:
+        """Yield (index key, value) for the HRIS cells of index_keys within the date range.
+
+        Each HRIS sheet is limited to the column window of the date range, see
+        `hris_windows`. Cells come grouped by key, each key's cells in sheet, row and
+        column order.
+        """
+        index_keys = list(index_keys)
+        windows = self.hris_windows(run, hris_index, index_keys, date_start_str, date_end_str, default_start)
+        yield from hris_index.match(index_keys, windows)
+
+    def hris_windows(
+        self,
+        run: RunContext,
+        hris_index: HrisIndex,
+        index_keys: Iterable[IndexKey],
+        date_start_str: str,
+        date_end_str: str,
+        default_start: Optional[int] = None
+    ) -> list[tuple[int, int]]:
+        """Return every HRIS sheet's (start_col, end_col) for the date range.
+
+        default_start is as in HeaderDateIndex.column_window. How many HRIS rows and
+        window cells match none of index_keys is printed and kept in the run's
+        hris_pruned_rows / hris_pruned_cells.
+        """
+        employee_ids = set()
+        dates = set()
+        for day, employee_id in index_keys:
+            employee_ids.add(employee_id)
+            dates.add(day)
+
+        windows = hris_index.windows(date_start_str, date_end_str, default_start)
+        total_rows = 0
+        total_cells = 0
+        kept_rows = 0
+        kept_cells = 0
+        for header, row_ids, (start_col, end_col) in zip(hris_index.headers, hris_index.row_ids, windows):
+            window_keys = [date_key(date) for _, date in header.dates_in_window(start_col, end_col)]
+            live_dates = sum(1 for day in window_keys if day in dates)
+            matched_rows = sum(1 for employee_id in row_ids if employee_id in employee_ids)
+            total_rows += len(row_ids)
+            total_cells += len(row_ids) * len(window_keys)
+            kept_rows += matched_rows
+            kept_cells += matched_rows * live_dates
+        run.hris_pruned_rows = total_rows - kept_rows
+        run.hris_pruned_cells = total_cells - kept_cells
+        print(f"HRIS prefilter: pruned {run.hris_pruned_rows} of {total_rows} rows, "
+              f"{run.hris_pruned_cells} of {total_cells} cells")
+        return windows
+
+    def map_status_by_code(self, run: RunContext, code: str) -> tuple[str, str, str]:
         """Map attendance codes to descriptions and time ranges."""
-        code = str(code).strip().upper()
-        mapping = {
-            "H":  ("Hadir (H)", "07:00", "18:00"),
-            "HM": ("Hadir shift malam (HM)", "19:00", "06:00"),
-            "A":  ("Alpa (A)", "", ""),
-            "S":  ("Sakit (S)", "", ""),
-            "I":  ("Izin (I)", "", ""),
-            "HC": ("Cuti (C)", "", ""),
-            "DLK":("Dinas Luar Kota (DLK)", "", ""),
-            "OFF":("OFF", "", ""),
-        }
-        return mapping.get(code, ("", "", ""))
+        return run.status_table.lookup(code)
     
-    def map_status_by_shift(self, shift: str) -> tuple[str, str, str]:
+    def map_status_by_shift(self, run: RunContext, shift: str) -> tuple[str, str, str]:
         """Map shift to descriptions and time ranges."""
-        code = str(shift).strip().upper()
-        mapping = {
-            "PAGI": ("Hadir (H)", "07:00", "18:00"),
-            "SIANG": ("Hadir (H)", "07:00", "18:00"),
-            "MALAM": ("Hadir shift malam (HM)", "19:00", "06:00"),
-        }
-        return mapping.get(code, (code, "", ""))
+        return run.shift_table.lookup(shift)
     
     def _parse_comma_list(self, value: str) -> list[str]:
         """Convert comma-separated text into a list of trimmed strings."""
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class ComparisonRecord:
+    """One (date, employee) entry of a comparator's index.
+
+    Slotted, so the tens of thousands of records in a monthly comparison carry no
+    per-instance dict. Comparator indexes key these by (date_key(date), employee_id).
+    """
+    date: str
+    employee_id: object
+    employee_name: object
+    company_code: str
+    status: str
+    time_in: str
+    time_out: str
+    overtime: float = 0
+    notes: str = ""
+    status_code: object = ""
+    hris_status: object = ""
+    hris_overtime: float = 0
+
+
+# Comparator index key: (date_key(formatted date), employee id as text)
+IndexKey = tuple[int | str, str]
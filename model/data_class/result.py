@@ -1,8 +1,15 @@
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List
 
 @dataclass
 class Result:
     success: bool
     data: List[dict]
-    message: str = ""
\ No newline at end of file
+    message: str = ""
+
+    @classmethod
+    def for_outputs(cls, outputs: List[Path], reused: bool = False) -> "Result":
+        """Successful result listing the output files as {"path": ...} entries."""
+        message = "Inputs are unchanged since the last run; the existing output files were kept." if reused else ""
+        return cls(success=True, data=[{"path": str(path)} for path in outputs], message=message)
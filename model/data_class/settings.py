@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class AttendanceSettings:
@@ -13,6 +13,9 @@ class AttendanceSettings:
     ignore_list: list[str]
     company_codes: dict
     time_off_only: bool
+    compare_engine: str = "python"
+    status_codes: dict = field(default_factory=dict)  # template codes added to the defaults
+    present_codes: set = field(default_factory=set)  # template codes marked as presence
     
 @dataclass
 class OvertimeSettings:
@@ -30,6 +33,7 @@ class OvertimeSettings:
     ovt_hour_col: int
     ovt_col: int
     notes_col: int
+    shift_codes: dict = field(default_factory=dict)  # template shifts added to the defaults
     
 @dataclass
 class OvertimeOptDrvSettings:
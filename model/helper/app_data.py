@@ -9,6 +9,7 @@ from pathlib import Path
 
 APP_NAME = "Cellmate"
 TEMPLATES_FILENAME = "templates.json"
+SETTINGS_FILENAME = "settings.json"
 DEFAULT_TEMPLATES_RELATIVE_PATH = Path("data") / TEMPLATES_FILENAME
 
 
@@ -66,3 +67,27 @@ def ensure_templates_json(app_name: str = APP_NAME) -> Path:
 
     target_path.write_text(json.dumps([], indent=2), encoding="utf-8")
     return target_path
+
+
+def app_settings_path(app_name: str = APP_NAME) -> Path:
+    return app_data_dir(app_name) / SETTINGS_FILENAME
+
+
+def load_app_settings(app_name: str = APP_NAME) -> dict:
+    """Return the app-wide settings (those not kept per template); {} when none are saved."""
+
+    try:
+        settings = json.loads(app_settings_path(app_name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return settings if isinstance(settings, dict) else {}
+
+
+def save_app_setting(key: str, value, app_name: str = APP_NAME) -> None:
+    """Store one app-wide setting, keeping the others."""
+
+    settings = load_app_settings(app_name)
+    settings[key] = value
+    path = app_settings_path(app_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(settings, indent=2), encoding="utf-8")
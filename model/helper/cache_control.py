@@ -0,0 +1,52 @@
+from pathlib import Path
+from model.helper.app_data import save_app_setting
+from model.helper.hris_index import HRIS_INDEXES
+from model.helper.job_cache import JOB_RESULTS
+from model.helper.sheet_cache import KEEP_SNAPSHOTS_SETTING, SHEET_CACHE, SNAPSHOT_DIR
+from model.helper.sheet_snapshot import SnapshotStore
+
+
+def cached_data_dir() -> Path:
+    """Return the directory the sheet snapshots and HRIS indexes are saved in."""
+    return SNAPSHOT_DIR
+
+
+def snapshots_enabled() -> bool:
+    return SHEET_CACHE.snapshots is not None
+
+
+def set_snapshots_enabled(enabled: bool) -> None:
+    """Turn saving parsed sheets to disk on or off, for this and later sessions.
+
+    Turning it off also deletes the snapshots saved so far. The change applies to this
+    session even when the setting cannot be saved (the OSError is raised afterwards).
+    """
+    if enabled:
+        if SHEET_CACHE.snapshots is None:
+            SHEET_CACHE.snapshots = SnapshotStore(SNAPSHOT_DIR)
+    else:
+        SHEET_CACHE.snapshots = None
+        SnapshotStore(SNAPSHOT_DIR).clear()
+    save_app_setting(KEEP_SNAPSHOTS_SETTING, enabled)
+
+
+def cached_data_size() -> int:
+    """Return the disk space the saved snapshots take, in bytes."""
+    return SnapshotStore(SNAPSHOT_DIR).size_bytes()
+
+
+def prune_cached_data() -> None:
+    """Delete the snapshots past their age limit or beyond the disk budget (run at startup)."""
+    if SHEET_CACHE.snapshots is not None:
+        SHEET_CACHE.snapshots.prune()
+
+
+def clear_cached_data() -> None:
+    """Forget every parsed sheet, HRIS index and finished job, in memory and on disk.
+
+    Output workbooks are left in place; the next run of a job parses its inputs again.
+    """
+    SHEET_CACHE.clear()
+    HRIS_INDEXES.clear()
+    JOB_RESULTS.clear()
+    SnapshotStore(SNAPSHOT_DIR).clear()
@@ -0,0 +1,44 @@
+from openpyxl.utils import get_column_letter
+
+
+class ColumnWidthTracker:
+    """Running auto-fit state of an output sheet, updated as rows are appended.
+
+    Widths follow ExportFileFormatter's auto-fit rule: the longest str() of any
+    cell in the column plus 2, where empty cells count as 'None'.
+    """
+
+    def __init__(self):
+        self.max_row = 0
+        self.max_column = 0
+        self._max_lengths: list[int] = []
+        self._shortest_row = None  # fewest populated columns of any row
+
+    def track(self, row: list) -> None:
+        populated = 0
+        for col, value in enumerate(row, 1):
+            if col > len(self._max_lengths):
+                self._max_lengths.append(0)
+            length = len(str(value))
+            if length > self._max_lengths[col - 1]:
+                self._max_lengths[col - 1] = length
+            if value is not None:
+                populated = col
+        self.max_row += 1
+        self.max_column = max(self.max_column, populated)
+        if self._shortest_row is None or populated < self._shortest_row:
+            self._shortest_row = populated
+
+    def column_widths(self) -> dict[str, int]:
+        """Auto-fit widths keyed by column letter."""
+        widths = {}
+        for col in range(1, self.max_column + 1):
+            length = self._max_lengths[col - 1]
+            if self._shortest_row is not None and self._shortest_row < col:
+                length = max(length, len("None"))
+            widths[get_column_letter(col)] = length + 2
+        return widths
+
+    @property
+    def dimensions(self) -> str:
+        return f"A1:{get_column_letter(max(self.max_column, 1))}{max(self.max_row, 1)}"
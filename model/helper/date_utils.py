@@ -1,85 +1,185 @@
-
+from calendar import month_abbr, month_name, monthrange
 from datetime import datetime, date
+from functools import lru_cache
 from openpyxl.utils.datetime import from_excel
 import re
 
+# Parsed values are memoized per raw value; the caches are bounded and cleared at
+# the start of every run (see clear_date_cache), which also keeps the implicit
+# "current year" of 'DD/MM' values fresh.
+DATE_CACHE_SIZE = 4096
+
+# Field patterns mirror the ones datetime.strptime uses for %Y, %m, %d, %H, %M, %S
+_Y = r"(?P<Y>\d\d\d\d)"
+_M = r"(?P<m>1[0-2]|0[1-9]|[1-9])"
+_D = r"(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])"
+_TIME = r"(?P<H>2[0-3]|[0-1]\d|\d):(?P<Mi>[0-5]\d|\d)(?::(?P<S>6[0-1]|[0-5]\d|\d))?"
+
+# Full-date shapes, in the order format_date has always tried them
+_ISO_DATETIME = re.compile(rf"{_Y}-{_M}-{_D}\s+{_TIME}")
+_ISO_DATE = re.compile(rf"{_Y}-{_M}-{_D}")
+_ISO_SLASH_DATE = re.compile(rf"{_Y}/{_M}/{_D}")
+_DMY_SLASH_DATE = re.compile(rf"{_D}/{_M}/{_Y}")
+_DMY_DASH_DATE = re.compile(rf"{_D}-{_M}-{_Y}")
+_DAY_MONTH_NAME_DATE = re.compile(rf"{_D}(?:-(?P<dashed>[^\W\d_]+)-|\s+(?P<spaced>[^\W\d_]+)\s+){_Y}")
+_DAY_MONTH = re.compile(r"^\d{1,2}/\d{1,2}$")
+
+_FULL_DATE_SHAPES = (_ISO_DATETIME, _ISO_DATE, _ISO_SLASH_DATE, _DMY_SLASH_DATE, _DMY_DASH_DATE)
+
+# Excel serials from_excel can convert without overflowing datetime (0001-01-01 .. 9999-12-30)
+_MIN_EXCEL_SERIAL = -693593
+_MAX_EXCEL_SERIAL = 2958465
+
 
 def format_date(value) -> str:
-        """Ensure date formatted as yyyy-mm-dd string.
-
-        Handles:
-        - datetime objects
-        - ISO-like 'YYYY-MM-DD' or 'YYYY/MM/DD' with optional time component
-        - 'DD/MM/YYYY' and 'DD-MM-YYYY'
-        - 'DD/MM' (no year) -> assumes current year
-
-        Falls back to returning the original string if parsing fails.
-        """
-        if isinstance(value, datetime):
-            return value.strftime("%Y-%m-%d")
-
-        s = str(value).strip()
-
-        # Common full-date formats (including with time component)
-        for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%d-%m-%Y"):
-            try:
-                return datetime.strptime(s, fmt).strftime("%Y-%m-%d")
-            except Exception:
-                pass
-
-        # Handle day-month with abbreviated or full month name, e.g. '26-Oct-2025' or '26-October-2025'
-        for fmt in ("%d-%b-%Y", "%d-%B-%Y", "%d %b %Y", "%d %B %Y"):
-            try:
-                return datetime.strptime(s, fmt).strftime("%Y-%m-%d")
-            except Exception:
-                pass
-
-        # Handle day/month without year, e.g. '08/10' -> assume current year
-        try:
-            if re.match(r"^\d{1,2}/\d{1,2}$", s):
-                day_str, month_str = s.split("/")
-                year = datetime.now().year
-                dt = datetime(year=year, month=int(month_str), day=int(day_str))
-                return dt.strftime("%Y-%m-%d")
-        except Exception:
-            pass
-
-        # Fallback: return original string
-        return s
-    
+    """Ensure date formatted as yyyy-mm-dd string.
+
+    Handles:
+    - datetime objects
+    - ISO-like 'YYYY-MM-DD' or 'YYYY/MM/DD' with optional time component
+    - 'DD/MM/YYYY' and 'DD-MM-YYYY'
+    - 'DD-MMM-YYYY' / 'DD MMMM YYYY' with abbreviated or full month names
+    - 'DD/MM' (no year) -> assumes current year
+
+    Strings are dispatched on their shape instead of trying strptime formats one
+    by one, and results are memoized per raw value.
+    Falls back to returning the original string if parsing fails.
+    """
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return _format_date_text(value if type(value) is str else str(value))
+
+
 def try_parse_date(value) -> date | None:
-        """Try to parse a cell value into a datetime.date.
-
-        Returns a datetime.date on success, or None when parsing fails.
-        default_year: if provided, used when parsing day/month values without a year.
-        """
-        # Only accept native date/datetime, Excel serials, or strings in 'YYYY-MM-DD'.
-        if value is None:
-            return None
-
-        if isinstance(value, datetime):
-            return value.date()
-
-        if isinstance(value, date):
-            return value
-
-        s = str(value).strip()
-        if not s:
-            return None
-
-        try:
-            # numeric cell value
-            if isinstance(value, (int, float)):
-                return from_excel(float(value)).date()
-            # numeric string
-            if s.replace('.', '', 1).isdigit():
-                return from_excel(float(s)).date()
-        except Exception:
-            pass
-
-        # Expect string in 'YYYY-MM-DD' exactly
-        try:
-            parsed = datetime.strptime(s, "%Y-%m-%d")
-            return parsed.date()
-        except Exception:
-            return None
\ No newline at end of file
+    """Try to parse a cell value into a datetime.date.
+
+    Accepts native date/datetime, Excel serials (numbers or numeric strings) and
+    strings in 'YYYY-MM-DD'. Returns None when parsing fails. Results for raw cell
+    values are memoized per run.
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, datetime):
+        return value.date()
+
+    if isinstance(value, date):
+        return value
+
+    return _parse_date_value(value)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def date_key(formatted_date: str) -> int | str:
+    """Compact index key for a format_date() result.
+
+    The proleptic ordinal of a 'YYYY-MM-DD' date, or the text itself when it is not one
+    (format_date returns unparseable header text unchanged).
+    """
+    match = _ISO_DATE.fullmatch(formatted_date)
+    if match is None:
+        return formatted_date
+    year, month, day = int(match["Y"]), int(match["m"]), int(match["d"])
+    if not _is_valid_ymd(year, month, day):
+        return formatted_date
+    parsed = date(year, month, day)
+    # only canonical spellings map to the ordinal, so distinct texts never share a key
+    return parsed.toordinal() if parsed.strftime("%Y-%m-%d") == formatted_date else formatted_date
+
+
+def clear_date_cache() -> None:
+    """Drop memoized date parses. Called at the start of every processing run."""
+    _format_date_text.cache_clear()
+    date_key.cache_clear()
+    _parse_date_value.cache_clear()
+    _month_numbers.cache_clear()
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _format_date_text(text: str) -> str:
+    s = text.strip()
+
+    for shape in _FULL_DATE_SHAPES:
+        match = shape.fullmatch(s)
+        if match:
+            formatted = _format_match(match)
+            if formatted is not None:
+                return formatted
+
+    match = _DAY_MONTH_NAME_DATE.fullmatch(s)
+    if match:
+        month = _month_numbers().get((match["dashed"] or match["spaced"]).lower())
+        if month is not None:
+            formatted = _format_ymd(int(match["Y"]), month, int(match["d"]))
+            if formatted is not None:
+                return formatted
+
+    # Handle day/month without year, e.g. '08/10' -> assume current year
+    if _DAY_MONTH.match(s):
+        day_str, month_str = s.split("/")
+        formatted = _format_ymd(datetime.now().year, int(month_str), int(day_str))
+        if formatted is not None:
+            return formatted
+
+    # Fallback: return original string
+    return s
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_value(value) -> date | None:
+    s = str(value).strip()
+    if not s:
+        return None
+
+    # numeric cell value or numeric string: Excel serial
+    if isinstance(value, (int, float)):
+        return _date_from_excel(float(value))
+    digits = s.replace('.', '', 1)
+    if digits.isdigit():
+        # float() only understands decimal digits, not e.g. superscripts
+        return _date_from_excel(float(s)) if digits.isdecimal() else None
+
+    # Expect string in 'YYYY-MM-DD' exactly
+    match = _ISO_DATE.fullmatch(s)
+    if match is None:
+        return None
+    year, month, day = int(match["Y"]), int(match["m"]), int(match["d"])
+    if not _is_valid_ymd(year, month, day):
+        return None
+    return date(year, month, day)
+
+
+def _date_from_excel(serial: float) -> date | None:
+    if not (_MIN_EXCEL_SERIAL <= serial < _MAX_EXCEL_SERIAL):
+        return None
+    # serials below one day are times of day, not dates
+    converted = from_excel(serial)
+    return converted.date() if isinstance(converted, datetime) else None
+
+
+def _format_match(match: re.Match) -> str | None:
+    groups = match.groupdict()
+    second = groups.get("S")
+    if second is not None and int(second) > 59:
+        return None
+    return _format_ymd(int(groups["Y"]), int(groups["m"]), int(groups["d"]))
+
+
+def _format_ymd(year: int, month: int, day: int) -> str | None:
+    if not _is_valid_ymd(year, month, day):
+        return None
+    return date(year, month, day).strftime("%Y-%m-%d")
+
+
+def _is_valid_ymd(year: int, month: int, day: int) -> bool:
+    return 1 <= year <= 9999 and 1 <= month <= 12 and 1 <= day <= monthrange(year, month)[1]
+
+
+@lru_cache(maxsize=1)
+def _month_numbers() -> dict[str, int]:
+    """Lower-cased abbreviated and full month names (as %b/%B accept them) -> month number."""
+    names = {}
+    for number in range(1, 13):
+        names[month_abbr[number].lower()] = number
+        names[month_name[number].lower()] = number
+    return names
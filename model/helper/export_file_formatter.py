@@ -3,17 +3,44 @@ from openpyxl import Workbook
 from openpyxl.styles import PatternFill, Font
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
+from model.helper.column_width_tracker import ColumnWidthTracker
+from model.helper.streaming_workbook import StreamingWorkbook
 
 class WorkbookType(Enum):
     EXTRACT = "extract"
     COMPARE = "compare"
 
+class TrackedWorksheet(Worksheet):
+    """Worksheet that keeps auto-fit widths up to date as rows are appended."""
+    
+    def __init__(self, parent: Workbook, title: str):
+        super().__init__(parent, title)
+        self.widths = ColumnWidthTracker()
+    
+    def append(self, iterable):
+        row = list(iterable)
+        self.widths.track(row)
+        super().append(row)
+    
+    def __setstate__(self, state):
+        # Dimension holders lose their default factories when pickled for a save worker
+        self.__dict__.update(state)
+        self.row_dimensions.default_factory = self._add_row
+        self.column_dimensions.default_factory = self._add_column
+
 class ExportFileFormatter:
+    # Header fill per company code sheet
+    header_colors = {
+        "PTM": "FFCCE5FF",
+        "TMP": "FFFFE5CC",
+        "PM":  "FFCCFFCC",
+    }
     
-    def prepare_workbook(self, company_code: str, type: WorkbookType) -> Workbook:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = company_code
+    def __init__(self, streaming: bool = True):
+        # Streaming workbooks spool rows to disk and are written in write-only mode
+        self.streaming = streaming
+    
+    def prepare_workbook(self, company_code: str, type: WorkbookType) -> Workbook | StreamingWorkbook:
         header = []
         
         extract_headers = ["Tanggal", "Employee ID", "Nama Karyawan", "Status",
@@ -27,35 +54,45 @@ class ExportFileFormatter:
         else:
             raise ValueError(f"Unknown type for workbook preparation: {type}")
         
+        if self.streaming:
+            return StreamingWorkbook(company_code, header, self.header_fill(company_code), Font(bold=True))
+        
+        wb = Workbook()
+        wb.remove(wb.active)
+        ws = TrackedWorksheet(wb, company_code)
+        wb._add_sheet(ws)
         ws.append(header)
         return wb
     
+    def header_fill(self, sheet_name: str) -> PatternFill:
+        fill_color = self.header_colors.get(sheet_name.upper(), "FFFFFFFF")
+        return PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
+    
     def format_worksheet(self, ws: Worksheet):
+        widths = ws.widths if isinstance(ws, TrackedWorksheet) else None
+        
         # Auto-fit columns
-        for col in ws.columns:
-            max_length = 0
-            column = get_column_letter(col[0].column)
-            for cell in col:
-                try:
-                    cell_length = len(str(cell.value))
-                    if cell_length > max_length:
-                        max_length = cell_length
-                except Exception:
-                    pass
-            ws.column_dimensions[column].width = max_length + 2
+        if widths is not None:
+            for column, width in widths.column_widths().items():
+                ws.column_dimensions[column].width = width
+        else:
+            for col in ws.columns:
+                max_length = 0
+                column = get_column_letter(col[0].column)
+                for cell in col:
+                    try:
+                        cell_length = len(str(cell.value))
+                        if cell_length > max_length:
+                            max_length = cell_length
+                    except Exception:
+                        pass
+                ws.column_dimensions[column].width = max_length + 2
         
         # Header styling
-        sheet_name = ws.title.upper()
-        color = {
-            "PTM": "FFCCE5FF",
-            "TMP": "FFFFE5CC",
-            "PM":  "FFCCFFCC",
-        }
-        fill_color = color.get(sheet_name, "FFFFFFFF")
-        
+        fill = self.header_fill(ws.title)
         for cell in ws[1]:
-            cell.fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
+            cell.fill = fill
             cell.font = Font(bold=True)
             
         # Add auto-filter to header row
-        ws.auto_filter.ref = ws.dimensions
\ No newline at end of file
+        ws.auto_filter.ref = widths.dimensions if widths is not None else ws.dimensions
@@ -0,0 +1,32 @@
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional (it comes with pandas); the fill falls back to a loop
+    np = None
+
+
+def forward_fill(values: Sequence, present: Sequence[bool], initial=""):
+    """Fill a column downwards: every position takes the nearest present value at or above it.
+
+    present marks the values that count as filled in; positions before the first
+    present value get `initial`. Returns a list of the same length as values.
+    """
+    if np is None:
+        filled = []
+        last = initial
+        for value, is_present in zip(values, present):
+            if is_present:
+                last = value
+            filled.append(last)
+        return filled
+
+    if not len(values):
+        return []
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    # index of the nearest present row at or above each row, -1 before the first one
+    source = np.maximum.accumulate(np.where(np.asarray(present, dtype=bool), np.arange(len(values)), -1))
+    filled = column[source]
+    filled[source < 0] = initial
+    return filled.tolist()
@@ -0,0 +1,52 @@
+from operator import itemgetter
+from typing import Callable, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional (it comes with pandas); hits are then found with a loop
+    np = None
+
+
+class GridWindow:
+    """Date-window cells of an employee x day grid sheet, held as one 2D block.
+
+    Rows are the sheet rows that passed the row filters and columns are the 1-based
+    sheet columns of the date window. `hits` computes a mask over the whole block
+    and yields only the cells it accepts, so records are built for those cells alone.
+    """
+
+    def __init__(self, rows: list[tuple], cols: list[int]):
+        self.cols = cols
+        if not rows or not cols:
+            self.cells: list[tuple] = []
+        elif len(cols) == 1:
+            self.cells = [(values[cols[0] - 1],) for values in rows]
+        else:
+            pick = itemgetter(*(col - 1 for col in cols))
+            self.cells = [pick(values) for values in rows]
+
+    def hits(self, accept: Callable[[object], bool]) -> Iterator[tuple[int, int, object]]:
+        """Yield (row index, window index, value) of accepted cells in row-major order.
+
+        accept is called once per distinct cell value; grids repeat a handful of codes,
+        so the per-cell work is a set lookup.
+        """
+        if not self.cells:
+            return
+        distinct = set().union(*self.cells)
+        accepted = {value for value in distinct if accept(value)}
+        if not accepted:
+            return
+
+        if np is None:
+            for row_index, row in enumerate(self.cells):
+                for window_index, value in enumerate(row):
+                    if value in accepted:
+                        yield row_index, window_index, value
+            return
+
+        block = np.empty((len(self.cells), len(self.cols)), dtype=object)
+        block[:] = self.cells
+        mask = np.frompyfunc(accepted.__contains__, 1, 1)(block).astype(bool)
+        row_indexes, window_indexes = np.nonzero(mask)
+        yield from zip(row_indexes.tolist(), window_indexes.tolist(), block[mask].tolist())
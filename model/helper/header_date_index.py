@@ -0,0 +1,55 @@
+from model.helper.date_utils import format_date
+
+
+class HeaderDateIndex:
+    """Date header row of a sheet, parsed once.
+
+    Maps 1-based columns to formatted 'YYYY-MM-DD' dates and back, and resolves
+    the column window covering a date range. Empty header cells are not indexed.
+    """
+
+    def __init__(self, header: tuple, first_col: int, last_col: int | None = None):
+        self.first_col = first_col
+        self.last_col = last_col or len(header)
+        self.col_to_date: dict[int, str] = {}
+        self.date_to_col: dict[str, int] = {}  # first column holding each date
+        self._last_col_of_date: dict[str, int] = {}
+
+        for col in range(first_col, self.last_col + 1):
+            value = header[col - 1] if col <= len(header) else None
+            if value is None or str(value).strip() == "":
+                continue
+            date = format_date(value)
+            self.col_to_date[col] = date
+            self.date_to_col.setdefault(date, col)
+            self._last_col_of_date[date] = col
+
+    def date_at(self, col: int) -> str | None:
+        """Return the formatted date of a column, or None when its header is empty."""
+        return self.col_to_date.get(col)
+
+    def column_of(self, date: str) -> int | None:
+        """Return the first column whose header is `date`."""
+        return self.date_to_col.get(date)
+
+    def column_window(
+        self,
+        date_start_str: str,
+        date_end_str: str,
+        default_start: int | None = None
+    ) -> tuple[int, int]:
+        """Return (start_col, end_col) for a date range.
+
+        start_col is the first column dated date_start_str and end_col the last column
+        dated date_end_str. Missing dates fall back to default_start (or the first
+        indexed column) and to the last column of the header.
+        """
+        start_col = self.date_to_col.get(date_start_str)
+        if start_col is None:
+            start_col = default_start if default_start is not None else self.first_col
+        end_col = self._last_col_of_date.get(date_end_str, self.last_col)
+        return start_col, end_col
+
+    def dates_in_window(self, start_col: int, end_col: int) -> list[tuple[int, str]]:
+        """Return (col, date) pairs for dated columns between start_col and end_col."""
+        return [(col, date) for col, date in self.col_to_date.items() if start_col <= col <= end_col]
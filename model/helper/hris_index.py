@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+from model.data_class.comparison_record import IndexKey
+from model.helper.date_utils import date_key
+from model.helper.header_date_index import HeaderDateIndex
+from model.helper.sheet_cache import SHEET_CACHE, FileKey, SheetCache, file_key
+
+# Parsed HRIS indexes kept in memory; each one is also saved as a snapshot
+HRIS_INDEX_CACHE_SIZE = 4
+
+
+@dataclass(frozen=True)
+class HrisLayout:
+    """Where an HRIS export keeps its employee ids and its date columns (1-based)."""
+    name: str
+    id_col: int
+    first_date_col: int
+    header_row: int = 1
+    data_start_row: int = 2
+    skip_blank_ids: bool = False
+
+
+ATTENDANCE_HRIS_LAYOUT = HrisLayout("attendance", id_col=1, first_date_col=5)
+OVERTIME_HRIS_LAYOUT = HrisLayout("overtime", id_col=3, first_date_col=8, skip_blank_ids=True)
+
+
+class HrisIndex:
+    """HRIS cells of one workbook keyed by (date_key, employee_id), built once per layout.
+
+    Every dated cell is kept, empty ones included, as (sheet number, column, value) in
+    sheet, row and column order, so a comparator can apply its own date window and its
+    own rule for repeated keys. The sheets' header indexes and row ids are kept for the
+    date windows and the pruning counts.
+    """
+
+    def __init__(self):
+        self.headers: list[HeaderDateIndex] = []
+        self.row_ids: list[list[str]] = []  # employee id of every data row, per sheet
+        self.cells: dict[IndexKey, list[tuple[int, int, object]]] = {}
+        self._dated_cols: list[list[tuple[int, int | str]]] = []
+
+    def add_sheet(self, header_index: HeaderDateIndex) -> int:
+        """Start indexing a sheet; return its sheet number."""
+        self.headers.append(header_index)
+        self.row_ids.append([])
+        self._dated_cols.append([(col, date_key(date)) for col, date in header_index.col_to_date.items()])
+        return len(self.headers) - 1
+
+    def add_row(self, sheet: int, employee_id: str, values: tuple) -> None:
+        self.row_ids[sheet].append(employee_id)
+        cells = self.cells
+        for col, day in self._dated_cols[sheet]:
+            key = (day, employee_id)
+            entry = (sheet, col, values[col - 1])
+            found = cells.get(key)
+            if found is None:
+                cells[key] = [entry]
+            else:
+                found.append(entry)
+
+    def windows(self, date_start_str: str, date_end_str: str, default_start: Optional[int] = None) -> list[tuple[int, int]]:
+        """Return every sheet's (start_col, end_col) for a date range, see HeaderDateIndex.column_window."""
+        return [header.column_window(date_start_str, date_end_str, default_start) for header in self.headers]
+
+    def match(self, keys: Iterable[IndexKey], windows: list[tuple[int, int]]) -> Iterator[tuple[IndexKey, object]]:
+        """Yield (key, value) for the cells of keys that lie in the sheets' date windows.
+
+        Cells come grouped by key, each key's cells in sheet, row and column order.
+        """
+        cells = self.cells
+        for key in keys:
+            for sheet, col, value in cells.get(key, ()):
+                start_col, end_col = windows[sheet]
+                if start_col <= col <= end_col:
+                    yield key, value
+
+    def to_snapshot(self) -> tuple:
+        return (
+            [(header.first_col, header.last_col, header.col_to_date) for header in self.headers],
+            self.row_ids,
+            self.cells,
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: tuple) -> "HrisIndex":
+        index = cls()
+        headers, index.row_ids, index.cells = snapshot
+        for first_col, last_col, col_to_date in headers:
+            # rebuild the header from its dated columns; empty header cells are not indexed anyway
+            header = [None] * last_col
+            for col, date in col_to_date.items():
+                header[col - 1] = date
+            index.headers.append(HeaderDateIndex(tuple(header), first_col, last_col))
+        return index
+
+
+class HrisIndexCache:
+    """HRIS indexes by (file, layout): a few in memory, all of them as snapshots.
+
+    Snapshots live with the sheet snapshots, under the HRIS file's content hash, so the
+    attendance, overtime and OPTDRV comparators share one index per export and layout.
+    """
+
+    def __init__(self, sheet_cache: SheetCache, max_entries: int = HRIS_INDEX_CACHE_SIZE):
+        self.sheet_cache = sheet_cache
+        self.max_entries = max_entries
+        self._indexes: OrderedDict[tuple[FileKey, HrisLayout], HrisIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, hris_file: str, layout: HrisLayout) -> Optional[HrisIndex]:
+        key = (file_key(hris_file), layout)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+        snapshots = self.sheet_cache.snapshots
+        if snapshots is None:
+            return None
+        snapshot = snapshots.load_index(self.sheet_cache.digest(key[0]), repr(layout))
+        if snapshot is None:
+            return None
+        index = HrisIndex.from_snapshot(snapshot)
+        self.remember(hris_file, layout, index)
+        return index
+
+    def put(self, hris_file: str, layout: HrisLayout, index: HrisIndex) -> None:
+        self.remember(hris_file, layout, index)
+        snapshots = self.sheet_cache.snapshots
+        if snapshots is not None:
+            snapshots.save_index(self.sheet_cache.digest(file_key(hris_file)), repr(layout), index.to_snapshot())
+
+    def remember(self, hris_file: str, layout: HrisLayout, index: HrisIndex) -> None:
+        """Keep an index in memory only (e.g. one a worker process built and saved already)."""
+        with self._lock:
+            self._indexes[(file_key(hris_file), layout)] = index
+            self._indexes.move_to_end((file_key(hris_file), layout))
+            while len(self._indexes) > self.max_entries:
+                self._indexes.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+# Shared by the attendance, overtime and OPTDRV comparators of the process
+HRIS_INDEXES = HrisIndexCache(SHEET_CACHE)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+from model.helper.app_data import app_data_dir
+from model.helper.sheet_cache import SHEET_CACHE, file_key
+from model.version import get_version
+
+# Finished jobs remembered; the oldest are forgotten beyond this
+JOB_CACHE_SIZE = 200
+
+
+def job_fingerprint(
+    kind: str,
+    input_files: list[str],
+    settings: dict,
+    date_start_str: str,
+    date_end_str: str
+) -> str:
+    """Return a digest of everything a job's outputs depend on.
+
+    That is the job kind (e.g. "attendance extract"), the input files and their content,
+    the template settings, the date range and the app version. Settings are
+    normalised first, so whitespace around values or key order make no difference.
+    """
+    payload = {
+        "kind": kind,
+        # the paths as well, since the outputs are written next to the inputs
+        "inputs": [(key[0], SHEET_CACHE.digest(key)) for key in map(file_key, input_files)],
+        "settings": _normalise(settings),
+        "dates": [date_start_str, date_end_str],
+        "version": get_version(),
+    }
+    text = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def _normalise(value):
+    if isinstance(value, dict):
+        return {str(key): _normalise(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+class JobResultCache:
+    """Output files of finished jobs, by job fingerprint, kept in a JSON file.
+
+    A job is reused only while all of its output files are still there with the
+    size and modification time they had when it finished, so outputs that were
+    edited, moved or deleted make the job run again.
+    """
+
+    def __init__(self, path: Path, max_entries: int = JOB_CACHE_SIZE):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def run(self, fingerprint: str, job: Callable[[], list[Path]]) -> tuple[list[Path], bool]:
+        """Return (output paths, reused): the recorded outputs of fingerprint, or those of running job."""
+        outputs = self.lookup(fingerprint)
+        if outputs is not None:
+            print(f"Inputs unchanged since the last run; reusing {len(outputs)} output files")
+            return outputs, True
+        outputs = job()
+        self.record(fingerprint, outputs)
+        return outputs, False
+
+    def lookup(self, fingerprint: str) -> Optional[list[Path]]:
+        with self._lock:
+            entry = self._load().get(fingerprint)
+        if not entry:
+            return None
+        outputs = []
+        for path, size, mtime_ns in entry:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return None
+            outputs.append(Path(path))
+        return outputs
+
+    def record(self, fingerprint: str, outputs: list[Path]) -> None:
+        try:
+            entry = []
+            for path in outputs:
+                stat = os.stat(path)
+                entry.append([str(path), stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            return  # an output is already gone; nothing worth remembering
+        with self._lock:
+            jobs = self._load()
+            jobs.pop(fingerprint, None)
+            jobs[fingerprint] = entry
+            while len(jobs) > self.max_entries:
+                jobs.pop(next(iter(jobs)))
+            self._save(jobs)
+
+    def clear(self) -> None:
+        """Forget every recorded job; their output files are left in place."""
+        with self._lock:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Could not clear the job result cache: {e}")
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                jobs = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return jobs if isinstance(jobs, dict) else {}
+
+    def _save(self, jobs: dict) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(jobs, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save the job result cache: {e}")
+
+
+# Shared by the view models of all pages
+JOB_RESULTS = JobResultCache(app_data_dir() / "job_results.json")
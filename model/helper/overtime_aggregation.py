@@ -0,0 +1,73 @@
+from typing import Hashable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional (it comes with pandas); sums fall back to a Python fold
+    np = None
+
+
+def factorize(keys: Sequence[Hashable]) -> tuple[list[int], list[int]]:
+    """Return (codes, first): an integer code per key, numbered in first-occurrence order,
+    and the position of the first occurrence of every code."""
+    code_of: dict[Hashable, int] = {}
+    codes = [code_of.setdefault(key, len(code_of)) for key in keys]
+    if np is not None:
+        # a code occurs for the first time where the running maximum grows
+        running_max = np.maximum.accumulate(np.asarray(codes, dtype=np.intp))
+        first = np.flatnonzero(np.diff(running_max, prepend=-1)).tolist()
+    else:
+        first = []
+        for position, code in enumerate(codes):
+            if code == len(first):
+                first.append(position)
+    return codes, first
+
+
+def sum_by_key(keys: Sequence[Hashable], values: Sequence, as_float: bool = False) -> tuple[list[int], list]:
+    """Sum values per key in one grouped reduction.
+
+    Returns (first, totals): the position of the first occurrence of each distinct key,
+    in first-occurrence order, and the total of its values. Totals equal folding each
+    group left to right with `+=` (with float() applied to every value when as_float),
+    including int results for groups of ints. Values numpy cannot add exactly that way,
+    such as text, are folded in Python.
+    """
+    codes, first = factorize(keys)
+    totals = _grouped_sum(codes, len(first), values, as_float) if np is not None else None
+    if totals is None:
+        totals = _fold(codes, len(first), values, as_float)
+    return first, totals
+
+
+def _grouped_sum(codes: list[int], size: int, values: Sequence, as_float: bool) -> list | None:
+    codes = np.asarray(codes, dtype=np.intp)
+    value_types = set(map(type, values))
+    if as_float:
+        if not value_types <= {int, float, bool}:
+            return None
+        return np.bincount(codes, weights=np.asarray(values, dtype=np.float64), minlength=size).tolist()
+
+    if not value_types <= {int, float}:
+        return None
+    # bincount adds each group's weights in input order, like the += fold
+    totals = np.bincount(codes, weights=np.asarray(values, dtype=np.float64), minlength=size).tolist()
+    if float not in value_types:
+        return [int(total) for total in totals]
+    if int not in value_types:
+        return totals
+    has_float = np.bincount(codes, weights=[type(value) is float for value in values], minlength=size)
+    return [total if is_float else int(total) for total, is_float in zip(totals, has_float.tolist())]
+
+
+def _fold(codes: list[int], size: int, values: Sequence, as_float: bool) -> list:
+    totals: list = [None] * size
+    started = [False] * size
+    for code, value in zip(codes, values):
+        if as_float:
+            value = float(value)
+        if started[code]:
+            totals[code] += value
+        else:
+            totals[code] = value
+            started[code] = True
+    return totals
@@ -0,0 +1,12 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def spawn_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return a process pool whose workers are spawned, never forked.
+
+    A forked worker inherits every lock that another thread of the GUI process holds at
+    that moment (e.g. the sheet parse lock of a running prefetch) and blocks forever on
+    it. Spawned workers start from a fresh interpreter, as they do on Windows and macOS.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
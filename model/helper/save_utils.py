@@ -1,11 +1,21 @@
 import logging
+import os
+import time
+from concurrent.futures import as_completed
 from pathlib import Path
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from model.helper.export_file_formatter import ExportFileFormatter
+from model.helper.process_pool import spawn_pool
+from model.helper.streaming_workbook import StreamingWorkbook
 
 logger = logging.getLogger(__name__)
 
+# With max_workers None, outputs with fewer data rows than this together are saved in
+# this process: starting save workers (which re-import the app where processes are
+# spawned) takes longer than writing small workbooks
+PARALLEL_SAVE_MIN_ROWS = 50_000
+
 
 def copy_values_only(src_wb: Workbook) -> Workbook:
     """Return a new Workbook containing only cell values (no formulas, no relationships)."""
@@ -28,8 +38,9 @@ def copy_values_only(src_wb: Workbook) -> Workbook:
 def save_workbook_with_fallback(src_wb: Workbook, out_path: Path, formatter: ExportFileFormatter =None):
     """Try to save workbook; on failure attempt to clear externalReferences, then fallback to value-only copy.
 
-    formatter: optional object with method `format_worksheet(ws)`; if provided, it will be called
-    on the workbook's active sheet before saving.
+    formatter: optional object with method `format_worksheet(ws)`; if provided, it is called
+    once on the workbook's active sheet before saving (and once on the value-only copy if that
+    fallback is needed).
     """
     try:
         if formatter is not None:
@@ -50,11 +61,7 @@ def save_workbook_with_fallback(src_wb: Workbook, out_path: Path, formatter: Exp
         if pkg is not None and getattr(pkg, "externalReferences", None):
             try:
                 pkg.externalReferences = []
-                if formatter is not None:
-                    try:
-                        formatter.format_worksheet(src_wb.active)
-                    except Exception:
-                        logger.exception("Formatter failed on source workbook after clearing externalReferences")
+                # formatting was already applied before the first attempt
                 src_wb.save(out_path)
                 logger.info("Saved %s after clearing externalReferences", out_path)
                 return
@@ -79,6 +86,24 @@ def save_workbook_with_fallback(src_wb: Workbook, out_path: Path, formatter: Exp
         raise
 
 
+def save_target_workbook(twb, out_path: Path, formatter: ExportFileFormatter | None = None) -> float:
+    """Save one target workbook and return the seconds it took.
+
+    Streaming workbooks are written directly (styling, widths and autofilter were tracked
+    while the rows streamed in); in-memory workbooks go through `save_workbook_with_fallback`.
+    Runs in a worker process when saving in parallel.
+    """
+    started = time.perf_counter()
+    if isinstance(twb, StreamingWorkbook):
+        try:
+            twb.save(out_path)
+        finally:
+            twb.close()
+    else:
+        save_workbook_with_fallback(twb, out_path, formatter=formatter)
+    return time.perf_counter() - started
+
+
 def save_target_workbooks(
     targets: dict,
     output_dir: Path,
@@ -90,12 +115,20 @@ def save_target_workbooks(
     filename_suffix: str = ".xlsx",
     name_template_single: str = "{date} {template} {code} {type} {suffix}",
     name_template_range: str = "{start} to {end} {template} {code} {type} {suffix}",
-):
+    max_workers: int | None = 1,
+) -> dict[Path, float]:
     """Save multiple target workbooks to `output_dir`.
 
     - Ensures `output_dir` exists (creates if necessary).
     - Builds filenames using provided templates.
-    - Uses `save_workbook_with_fallback` for robust saving.
+    - Saves each workbook with `save_target_workbook`; with `max_workers` other than 1 the
+      workbooks are serialised concurrently in a process pool (None: one worker per
+      workbook, up to the CPU count, once the outputs hold PARALLEL_SAVE_MIN_ROWS rows).
+      Workbooks the pool could not save are retried serially.
+
+    Returns the seconds spent saving each written file, keyed by output path. Raises
+    OSError, once every other workbook is saved, when any target could not be saved, so
+    a partly saved run is never taken for a finished one.
     """
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -103,6 +136,7 @@ def save_target_workbooks(
         logger.exception("Failed to create output directory %s", output_dir)
         raise
 
+    jobs: dict[str, tuple] = {}
     for code, twb in targets.items():
         try:
             if date_end_str == date_start_str:
@@ -122,15 +156,70 @@ def save_target_workbooks(
                     type=type_str, 
                     suffix=filename_suffix
                 )
+            jobs[code] = (twb, output_dir / file_name)
+        except Exception:
+            logger.exception("Failed to build file name for code %s", code)
+
+    if max_workers is not None:
+        workers = max_workers
+    elif sum(_row_count(twb) for twb, _ in jobs.values()) < PARALLEL_SAVE_MIN_ROWS:
+        workers = 1
+    else:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    timings: dict[Path, float] = {}
+    try:
+        if workers > 1 and len(jobs) > 1:
+            timings.update(_save_in_pool(jobs, formatter, workers))
+
+        for code, (twb, out_path) in jobs.items():
+            if out_path in timings:
+                continue
+            try:
+                timings[out_path] = save_target_workbook(twb, out_path, formatter)
+                logger.info("Saved %s in %.2fs", out_path, timings[out_path])
+            except Exception:
+                logger.exception("Failed to save workbook for code %s", code)
+    finally:
+        close_target_workbooks(targets)
+
+    failed = [code for code in targets if code not in jobs or jobs[code][1] not in timings]
+    if failed:
+        raise OSError(f"Could not save the output file for {', '.join(map(str, failed))}; see the log for details")
+    return timings
 
-            out_path = output_dir / file_name
-            if formatter is not None:
+
+def close_target_workbooks(targets: dict) -> None:
+    """Remove the spool files of streaming target workbooks; safe to call more than once.
+
+    `save_target_workbooks` does this itself; processors also call it when a run stops
+    (cancelled or failed) before its targets are saved.
+    """
+    for twb in targets.values():
+        if isinstance(twb, StreamingWorkbook):
+            twb.close()
+
+
+def _row_count(twb) -> int:
+    if isinstance(twb, StreamingWorkbook):
+        return twb.active.row_count
+    return twb.active.max_row
+
+
+def _save_in_pool(jobs: dict[str, tuple], formatter: ExportFileFormatter | None, workers: int) -> dict[Path, float]:
+    timings: dict[Path, float] = {}
+    try:
+        with spawn_pool(min(workers, len(jobs))) as pool:
+            futures = {
+                pool.submit(save_target_workbook, twb, out_path, formatter): (code, out_path)
+                for code, (twb, out_path) in jobs.items()
+            }
+            for future in as_completed(futures):
+                code, out_path = futures[future]
                 try:
-                    formatter.format_worksheet(twb.active)
+                    timings[out_path] = future.result()
+                    logger.info("Saved %s in %.2fs (parallel)", out_path, timings[out_path])
                 except Exception:
-                    logger.exception("Formatter failed for workbook %s; continuing to save attempt", file_name)
-
-            save_workbook_with_fallback(twb, out_path, formatter=formatter)
-            logger.info("Saved %s", out_path)
-        except Exception:
-            logger.exception("Failed to save workbook for code %s", code)
+                    logger.exception("Parallel save failed for code %s; retrying serially", code)
+    except Exception:
+        logger.exception("Process pool unavailable; saving serially")
+    return timings
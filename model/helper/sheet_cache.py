@@ -0,0 +1,372 @@
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Optional
+from openpyxl import load_workbook
+from model.helper.app_data import app_data_dir, load_app_settings
+from model.helper.sheet_snapshot import SnapshotStore, WorkbookInfo, content_hash
+
+# Memory the parsed sheets of all pages may take together; 0 disables the cache
+SHEET_CACHE_BUDGET_BYTES = 256 * 1024 * 1024
+
+FileKey = tuple[str, int, int]  # (resolved path, size, mtime in ns)
+SheetKey = tuple[str, int, int, str]  # FileKey + sheet title
+
+
+def file_key(file_path: str) -> FileKey:
+    """Identify a file by its resolved path, size and modification time."""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_size, stat.st_mtime_ns
+
+
+def is_blank_row(values) -> bool:
+    """True when every value of a row is empty or whitespace."""
+    for value in values:
+        if value is not None and (not isinstance(value, str) or value.strip()):
+            return False
+    return True
+
+
+class CachedSheet:
+    """Values of a read-only sheet, parsed once and kept in memory.
+
+    Stands in for an openpyxl read-only worksheet whose dimensions were reset:
+    `iter_rows(values_only=True)` returns the rows openpyxl would return. Rows are
+    stored as read, up to the first run of `max_blank_rows` empty rows; a read that
+    goes past them streams the rest of the sheet from the file.
+    """
+
+    max_column = None  # populated extent, as after reset_dimensions()
+
+    def __init__(self, file_path: str, title: str, rows: list[tuple], complete: bool, size: int):
+        self.file_path = file_path
+        self.title = title
+        self.rows = rows
+        self.complete = complete
+        self.size = size
+
+    def reset_dimensions(self) -> None:
+        pass
+
+    def iter_rows(
+        self,
+        min_row: Optional[int] = None,
+        max_row: Optional[int] = None,
+        min_col: Optional[int] = None,
+        max_col: Optional[int] = None,
+        values_only: bool = True
+    ) -> Iterator[tuple]:
+        if not values_only:
+            raise ValueError("Cached sheets only hold values; use values_only=True")
+        min_row = min_row or 1
+        min_col = min_col or 1
+        last_row = len(self.rows) if max_row is None else min(max_row, len(self.rows))
+        for row in range(min_row, last_row + 1):
+            values = self.rows[row - 1]
+            if max_col is None:
+                yield values[min_col - 1:]
+                continue
+            values = values[min_col - 1:max_col]
+            width = max_col + 1 - min_col
+            yield values + (None,) * (width - len(values)) if len(values) < width else values
+
+        if not self.complete and (max_row is None or max_row > len(self.rows)):
+            yield from self._iter_file_rows(max(min_row, len(self.rows) + 1), max_row, min_col, max_col)
+
+    def _iter_file_rows(self, min_row: int, max_row: Optional[int], min_col: int, max_col: Optional[int]):
+        wb = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            ws = wb[self.title]
+            ws.reset_dimensions()
+            yield from ws.iter_rows(
+                min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True
+            )
+        finally:
+            wb.close()
+
+
+class CachedWorkbook:
+    """Read-only workbook whose sheets come from the sheet cache when they can.
+
+    The file is opened only when a sheet is missing from the cache; such a sheet is
+    parsed in full, cached and served from memory. Sheets larger than the cache
+    budget are returned as the streaming openpyxl sheet instead.
+    """
+
+    def __init__(self, cache: "SheetCache", file_path: str, max_blank_rows: int):
+        self.cache = cache
+        self.file_path = file_path
+        self.max_blank_rows = max_blank_rows
+        self.key = file_key(file_path)
+        self._wb = None
+        info = cache.workbook_info(self.key)
+        if info is None:
+            wb = self._open()
+            info = (list(wb.sheetnames), wb.active.title)
+        self.sheetnames, self.active_title = info
+
+    @property
+    def active(self):
+        return self[self.active_title]
+
+    def __contains__(self, title: str) -> bool:
+        return title in self.sheetnames
+
+    def __getitem__(self, title: str):
+        if title not in self.sheetnames:
+            raise KeyError(f"Worksheet {title} does not exist.")
+        info = (self.sheetnames, self.active_title)
+        sheet = self.cache.get((*self.key, title)) or self.cache.get_snapshot((*self.key, title), info)
+        if sheet is not None:
+            return sheet
+
+        # a sheet being parsed by another thread (e.g. a prefetch) is waited for, not parsed twice;
+        # runs load in this process while a prefetch is running, see BaseProcessor.workers_for
+        with self.cache.parse_lock((*self.key, title)):
+            sheet = self.cache.get((*self.key, title))
+            if sheet is not None:
+                return sheet
+            ws = self._open()[title]
+            ws.reset_dimensions()
+            sheet = self._read_sheet(ws)
+            if sheet is None:
+                return ws
+            self.cache.put((*self.key, title), sheet, info)
+            return sheet
+
+    def close(self) -> None:
+        if self._wb is not None:
+            self._wb.close()
+            self._wb = None
+
+    def _open(self):
+        if self._wb is None:
+            self._wb = load_workbook(self.file_path, read_only=True, data_only=True)
+        return self._wb
+
+    def _read_sheet(self, ws) -> Optional[CachedSheet]:
+        """Parse a sheet into a CachedSheet, or None when it does not fit the budget."""
+        rows = []
+        size = sys.getsizeof(rows)
+        blank_run = 0
+        complete = True
+        for values in ws.iter_rows(values_only=True):
+            values = tuple(values)
+            rows.append(values)
+            size += sys.getsizeof(values) + 8
+            for value in values:
+                if value is not None:
+                    size += sys.getsizeof(value)
+            if size > self.cache.budget_bytes:
+                return None
+            if is_blank_row(values):
+                blank_run += 1
+                if blank_run >= self.max_blank_rows:
+                    complete = False
+                    break
+            else:
+                blank_run = 0
+        return CachedSheet(self.file_path, ws.title, rows, complete, size)
+
+
+class SheetCache:
+    """LRU cache of parsed sheets, keyed by (path, size, mtime, sheet title).
+
+    One cache serves every processor of the process, so a file dropped on several
+    pages, or extracted and then compared, is parsed once. Entries hold plain
+    values, never live openpyxl objects; the least recently used sheets are evicted
+    to stay within budget_bytes. Changing a file changes its size or mtime, so stale
+    entries are never hit and age out.
+
+    With a SnapshotStore, parsed sheets are also saved to disk under the file's
+    content hash; sheets missing from memory are loaded from there before the
+    file is parsed, which carries the cache over restarts.
+    """
+
+    def __init__(self, budget_bytes: int = SHEET_CACHE_BUDGET_BYTES, snapshots: Optional[SnapshotStore] = None):
+        self.budget_bytes = budget_bytes
+        self.snapshots = snapshots
+        self.size = 0
+        self._sheets: OrderedDict[SheetKey, CachedSheet] = OrderedDict()
+        self._workbooks: dict[FileKey, WorkbookInfo] = {}
+        self._digests: dict[FileKey, str] = {}
+        # set in worker processes, whose parsed sheets are handed back with take_added
+        self.record_added = False
+        self._added: list[tuple[SheetKey, CachedSheet, WorkbookInfo]] = []
+        self._parse_locks: dict[SheetKey, threading.Lock] = {}
+        self._prefetching: dict[str, int] = {}  # resolved path -> prefetches in progress
+        self._lock = threading.Lock()
+
+    def open(self, file_path: str, max_blank_rows: int) -> CachedWorkbook:
+        return CachedWorkbook(self, file_path, max_blank_rows)
+
+    def prefetch(self, file_path: str, max_blank_rows: int, cancel_event: Optional[threading.Event] = None) -> int:
+        """Parse every sheet of a workbook into the cache ahead of a run; return the sheet count.
+
+        Stops between sheets once cancel_event is set. The file's content hash is
+        computed as well, for the snapshots and the job fingerprint.
+        """
+        path = str(Path(file_path).resolve())
+        with self._lock:
+            self._prefetching[path] = self._prefetching.get(path, 0) + 1
+        try:
+            wb = self.open(file_path, max_blank_rows)
+            try:
+                for title in wb.sheetnames:
+                    if cancel_event is not None and cancel_event.is_set():
+                        break
+                    wb[title]
+            finally:
+                wb.close()
+            self.digest(wb.key)
+            return len(wb.sheetnames)
+        finally:
+            with self._lock:
+                self._prefetching[path] -= 1
+                if not self._prefetching[path]:
+                    del self._prefetching[path]
+
+    def is_prefetching(self, file_path: str) -> bool:
+        """True while a prefetch of the file is parsing it in this process."""
+        path = str(Path(file_path).resolve())
+        with self._lock:
+            return path in self._prefetching
+
+    def parse_lock(self, key: SheetKey) -> threading.Lock:
+        with self._lock:
+            if len(self._parse_locks) >= 1024:
+                # locks of finished parses; a parse in progress keeps its own reference
+                self._parse_locks.clear()
+            return self._parse_locks.setdefault(key, threading.Lock())
+
+    def workbook_info(self, key: FileKey) -> Optional[WorkbookInfo]:
+        with self._lock:
+            info = self._workbooks.get(key)
+        if info is None and self.snapshots is not None:
+            info = self.snapshots.load_workbook_info(self.digest(key))
+        return info
+
+    def digest(self, key: FileKey) -> str:
+        """Return the content hash of a file, hashed once per (path, size, mtime)."""
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            digest = content_hash(key[0])
+            with self._lock:
+                if len(self._digests) >= 1024:
+                    self._digests.clear()
+                self._digests[key] = digest
+        return digest
+
+    def get(self, key: SheetKey) -> Optional[CachedSheet]:
+        with self._lock:
+            sheet = self._sheets.get(key)
+            if sheet is not None:
+                self._sheets.move_to_end(key)
+            return sheet
+
+    def get_snapshot(self, key: SheetKey, info: WorkbookInfo) -> Optional[CachedSheet]:
+        """Load a sheet from its disk snapshot into the cache; None when there is none."""
+        if self.snapshots is None:
+            return None
+        snapshot = self.snapshots.load_sheet(self.digest(key[:3]), key[3])
+        if snapshot is None:
+            return None
+        sheet = CachedSheet(key[0], key[3], *snapshot)
+        with self._lock:
+            self._insert(key, sheet, info)
+        return sheet
+
+    def put(self, key: SheetKey, sheet: CachedSheet, info: WorkbookInfo) -> None:
+        with self._lock:
+            self._insert(key, sheet, info)
+            if self.record_added:
+                self._added.append((key, sheet, info))
+        if self.snapshots is not None:
+            digest = self.digest(key[:3])
+            self.snapshots.save_workbook_info(digest, info)
+            self.snapshots.save_sheet(digest, key[3], (sheet.rows, sheet.complete, sheet.size))
+
+    def holds(self, file_path: str, sheet_names: Optional[list[str]] = None) -> bool:
+        """True when the given sheets of a file are all cached.
+
+        sheet_names None means every sheet of the workbook and an empty list its
+        active sheet, as the processors select them.
+        """
+        try:
+            key = file_key(file_path)
+            info = self.workbook_info(key)
+        except OSError:
+            return False
+        if info is None:
+            return False
+        sheetnames, active_title = info
+        if sheet_names is None:
+            titles = sheetnames
+        elif not sheet_names:
+            titles = [active_title]
+        else:
+            titles = [title for title in sheet_names if title in sheetnames]
+        with self._lock:
+            missing = [title for title in titles if (*key, title) not in self._sheets]
+        if missing and self.snapshots is not None:
+            digest = self.digest(key)
+            missing = [title for title in missing if not self.snapshots.has_sheet(digest, title)]
+        return not missing
+
+    def take_added(self) -> list[tuple[SheetKey, CachedSheet, WorkbookInfo]]:
+        """Return and forget the sheets cached since the last call, with their workbook info.
+
+        Only recorded while record_added is set: worker processes hand these back so the
+        parent's cache is filled by their parsing. Elsewhere nothing is kept beyond the LRU.
+        """
+        with self._lock:
+            added, self._added = self._added, []
+            return added
+
+    def add_all(self, entries: list[tuple[SheetKey, CachedSheet, WorkbookInfo]]) -> None:
+        # the workers have saved the snapshots already
+        with self._lock:
+            for key, sheet, info in entries:
+                self._insert(key, sheet, info)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sheets.clear()
+            self._workbooks.clear()
+            self._digests.clear()
+            self._added = []
+            self.size = 0
+
+    def _insert(self, key: SheetKey, sheet: CachedSheet, info: WorkbookInfo) -> None:
+        previous = self._sheets.pop(key, None)
+        if previous is not None:
+            self.size -= previous.size
+        if sheet.size > self.budget_bytes:
+            return
+        self._sheets[key] = sheet
+        self._workbooks[key[:3]] = info
+        self.size += sheet.size
+        evicted_files = set()
+        while self.size > self.budget_bytes:
+            evicted_key, evicted = self._sheets.popitem(last=False)
+            self.size -= evicted.size
+            evicted_files.add(evicted_key[:3])
+        # forget the sheet lists of files that have no cached sheet left
+        for sheet_key in self._sheets:
+            evicted_files.discard(sheet_key[:3])
+        for file in evicted_files:
+            self._workbooks.pop(file, None)
+
+
+# Where parsed sheets are saved between sessions, unless turned off in the app settings
+SNAPSHOT_DIR = app_data_dir() / "sheet_snapshots"
+# App setting that turns the sheet snapshots on (default) or off, see cache_control
+KEEP_SNAPSHOTS_SETTING = "keep_sheet_snapshots"
+
+# Shared by every processor (and so every page) of the process
+SHEET_CACHE = SheetCache(
+    snapshots=SnapshotStore(SNAPSHOT_DIR) if load_app_settings().get(KEEP_SNAPSHOTS_SETTING, True) else None
+)
@@ -0,0 +1,83 @@
+import posixpath
+import zipfile
+from dataclasses import dataclass
+from typing import Optional
+from xml.etree import ElementTree
+from openpyxl.utils.cell import range_boundaries
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+@dataclass
+class SheetEntry:
+    """One worksheet of a workbook as listed by `read_sheet_catalog`.
+
+    dimension is the extent the sheet declares for itself (e.g. "A1:AH120"), None when
+    it declares none; max_row / max_column are derived from it, so they can overstate
+    sheets formatted far below their data.
+    """
+    title: str
+    dimension: Optional[str] = None
+    max_row: Optional[int] = None
+    max_column: Optional[int] = None
+    hidden: bool = False
+    company_code: Optional[str] = None
+
+
+def read_sheet_catalog(file_path: str) -> list[SheetEntry]:
+    """List the worksheets of an XLSX file without loading the workbook.
+
+    Only xl/workbook.xml, its relationships and the start of each sheet part (up to
+    its <dimension>) are read from the zip, so this takes milliseconds whatever the
+    size of the sheets. Chart sheets are not listed.
+    """
+    try:
+        archive = zipfile.ZipFile(file_path)
+    except zipfile.BadZipFile:
+        raise ValueError(f"Not an XLSX workbook: {file_path}")
+
+    with archive:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        relations = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in relations.iter(f"{_PACKAGE_REL_NS}Relationship")}
+        names = set(archive.namelist())
+
+        entries = []
+        for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+            part = _part_name(targets.get(sheet.get(f"{_REL_NS}id")))
+            if part not in names or not part.startswith("xl/worksheets/"):
+                continue
+            entry = SheetEntry(title=sheet.get("name"), hidden=sheet.get("state", "visible") != "visible")
+            entry.dimension = _read_dimension(archive, part)
+            if entry.dimension:
+                try:
+                    _, _, entry.max_column, entry.max_row = range_boundaries(entry.dimension)
+                except ValueError:
+                    pass
+            entries.append(entry)
+        return entries
+
+
+def _part_name(target: Optional[str]) -> str:
+    """Resolve a relationship target of xl/workbook.xml to a zip member name."""
+    if not target:
+        return ""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def _read_dimension(archive: zipfile.ZipFile, part: str) -> Optional[str]:
+    """Return the ref of a sheet's <dimension>, parsing no further than <sheetData>."""
+    with archive.open(part) as source:
+        try:
+            for _, element in ElementTree.iterparse(source, events=("start",)):
+                if element.tag == f"{_MAIN_NS}dimension":
+                    return element.get("ref")
+                if element.tag == f"{_MAIN_NS}sheetData":
+                    return None
+        except ElementTree.ParseError:
+            return None
+    return None
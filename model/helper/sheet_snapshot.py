@@ -0,0 +1,168 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+# Disk space the snapshots may take together; the least recently used are deleted beyond it
+SNAPSHOT_BUDGET_BYTES = 512 * 1024 * 1024
+# Snapshots not used for this many days are deleted
+SNAPSHOT_MAX_AGE_DAYS = 30
+# Bumped whenever the snapshot layout changes, so old snapshots are ignored
+SNAPSHOT_VERSION = 1
+HASH_CHUNK_BYTES = 1024 * 1024
+
+WorkbookInfo = tuple[list[str], str]  # (sheet names, active sheet title)
+# (rows, complete, size) of a parsed sheet, see CachedSheet
+SheetSnapshot = tuple[list[tuple], bool, int]
+
+
+def content_hash(file_path: str) -> str:
+    """Return a hex digest of the file's bytes."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SnapshotStore:
+    """Parsed sheets saved in a directory, keyed by file content hash and sheet title.
+
+    A snapshot holds the sheet values and the workbook's sheet list, or an index
+    built from the file under a name, so loading an unchanged file again (after a
+    restart, or from a copy elsewhere) unpickles it instead of parsing the XLSX.
+    Snapshots are written atomically; unreadable ones
+    count as missing and are removed. Snapshots unused for max_age_days are deleted,
+    and beyond budget_bytes so are the ones used least recently. The directory is
+    created readable by the current user only, as snapshots hold the sheets' data.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        budget_bytes: int = SNAPSHOT_BUDGET_BYTES,
+        max_age_days: float = SNAPSHOT_MAX_AGE_DAYS
+    ):
+        self.directory = Path(directory)
+        self.budget_bytes = budget_bytes
+        self.max_age_days = max_age_days
+
+    def load_workbook_info(self, digest: str) -> Optional[WorkbookInfo]:
+        return self._load(self._info_path(digest))
+
+    def save_workbook_info(self, digest: str, info: WorkbookInfo) -> None:
+        self._save(self._info_path(digest), info)
+
+    def load_sheet(self, digest: str, title: str) -> Optional[SheetSnapshot]:
+        return self._load(self._sheet_path(digest, title))
+
+    def save_sheet(self, digest: str, title: str, snapshot: SheetSnapshot) -> None:
+        if snapshot[2] > self.budget_bytes:
+            return
+        self._save(self._sheet_path(digest, title), snapshot)
+        self.prune()
+
+    def has_sheet(self, digest: str, title: str) -> bool:
+        return self._sheet_path(digest, title).exists()
+
+    def load_index(self, digest: str, name: str):
+        """Load an index built from the file (e.g. an HRIS index), saved under a name."""
+        return self._load(self._index_path(digest, name))
+
+    def save_index(self, digest: str, name: str, index) -> None:
+        self._save(self._index_path(digest, name), index)
+        self.prune()
+
+    def _info_path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.info"
+
+    def _sheet_path(self, digest: str, title: str) -> Path:
+        # sheet titles may hold characters that are not valid in file names
+        title_hash = hashlib.blake2b(title.encode("utf-8"), digest_size=8).hexdigest()
+        return self.directory / f"{digest}-{title_hash}.sheet"
+
+    def _index_path(self, digest: str, name: str) -> Path:
+        name_hash = hashlib.blake2b(name.encode("utf-8"), digest_size=8).hexdigest()
+        return self.directory / f"{digest}-{name_hash}.index"
+
+    def _load(self, path: Path):
+        try:
+            with open(path, "rb") as f:
+                version, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable snapshot {path.name}: {e}")
+            self._remove(path)
+            return None
+        if version != SNAPSHOT_VERSION:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return value
+
+    def _save(self, path: Path, value) -> None:
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump((SNAPSHOT_VERSION, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._remove(Path(tmp_path))
+                raise
+        except OSError as e:
+            print(f"Could not save snapshot {path.name}: {e}")
+
+    def prune(self) -> None:
+        """Delete the snapshots older than max_age_days, then the least recently used beyond budget_bytes."""
+        entries = self._entries(include_tmp=False)
+        expired_before = time.time() - self.max_age_days * 24 * 60 * 60
+        total = 0
+        kept = []
+        for mtime, size, path in entries:
+            if mtime < expired_before:
+                self._remove(path)
+            else:
+                kept.append((mtime, size, path))
+                total += size
+        for _, size, path in sorted(kept):
+            if total <= self.budget_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self) -> None:
+        """Delete every snapshot."""
+        for _, _, path in self._entries(include_tmp=True):
+            self._remove(path)
+
+    def size_bytes(self) -> int:
+        """Return the disk space the snapshots take."""
+        return sum(size for _, size, _ in self._entries(include_tmp=True))
+
+    def _entries(self, include_tmp: bool) -> list[tuple[float, int, Path]]:
+        """Return (mtime, size, path) of the files in the directory."""
+        entries = []
+        try:
+            for entry in os.scandir(self.directory):
+                if not entry.is_file() or (entry.name.endswith(".tmp") and not include_tmp):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        except OSError:
+            pass
+        return entries
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
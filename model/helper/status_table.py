@@ -0,0 +1,115 @@
+from typing import Iterable, Iterator
+
+Status = tuple[str, str, str]  # (status, time in, time out)
+
+# Attendance grid codes -> status and working hours
+ATTENDANCE_STATUS_CODES: dict[str, Status] = {
+    "H":  ("Hadir (H)", "07:00", "18:00"),
+    "HM": ("Hadir shift malam (HM)", "19:00", "06:00"),
+    "A":  ("Alpa (A)", "", ""),
+    "S":  ("Sakit (S)", "", ""),
+    "I":  ("Izin (I)", "", ""),
+    "HC": ("Cuti (C)", "", ""),
+    "DLK":("Dinas Luar Kota (DLK)", "", ""),
+    "OFF":("OFF", "", ""),
+}
+# Attendance codes that mean the employee was present; "Time Off Only" extracts skip them
+ATTENDANCE_PRESENT_CODES = frozenset({"H", "HM"})
+# Last field of a template code entry that marks the code as presence
+PRESENT_FLAG = "present"
+
+# Overtime shift names -> status and working hours
+SHIFT_STATUS_CODES: dict[str, Status] = {
+    "PAGI": ("Hadir (H)", "07:00", "18:00"),
+    "SIANG": ("Hadir (H)", "07:00", "18:00"),
+    "MALAM": ("Hadir shift malam (HM)", "19:00", "06:00"),
+}
+
+# Distinct raw text values remembered per table; grids repeat a handful of codes
+STATUS_CACHE_SIZE = 4096
+
+
+class StatusTable:
+    """Code -> (status, time in, time out) lookup, compiled once per run.
+
+    Codes are matched on their stripped, upper-cased text. Unknown codes map to
+    ("", "", ""), or to (code, "", "") with keep_unknown. Results for raw text
+    cell values are cached, so a repeated cell costs one dict hit. present_codes
+    are the codes that mean the employee was present, see `is_present`.
+    """
+
+    def __init__(self, codes: dict[str, Status], keep_unknown: bool = False, present_codes: Iterable[str] = ()):
+        self.codes = {str(code).strip().upper(): tuple(status) for code, status in codes.items()}
+        self.keep_unknown = keep_unknown
+        self.present_codes = frozenset(str(code).strip().upper() for code in present_codes)
+        self._cache: dict[str, Status] = {}
+
+    @classmethod
+    def with_custom_codes(
+        cls,
+        defaults: dict[str, Status],
+        custom: dict[str, Status],
+        keep_unknown: bool = False,
+        default_present: Iterable[str] = (),
+        custom_present: Iterable[str] = ()
+    ):
+        """Build a table from the default codes, with template codes added or overriding them.
+
+        A template code replaces a default one entirely, presence included: it counts as
+        present only when it is in custom_present.
+        """
+        codes = dict(defaults)
+        codes.update(custom)
+        present = {code for code in default_present if code not in custom}
+        present.update(custom_present)
+        return cls(codes, keep_unknown, present)
+
+    def is_present(self, value) -> bool:
+        """True when a cell value is a code that means the employee was present."""
+        return str(value).strip().upper() in self.present_codes
+
+    def lookup(self, value) -> Status:
+        # only text is cached: 1, 1.0 and True are one dict key but different codes
+        if type(value) is str:
+            status = self._cache.get(value)
+            if status is None:
+                status = self._resolve(value)
+                if len(self._cache) < STATUS_CACHE_SIZE:
+                    self._cache[value] = status
+            return status
+        return self._resolve(value)
+
+    def _resolve(self, value) -> Status:
+        code = str(value).strip().upper()
+        status = self.codes.get(code)
+        if status is None:
+            return (code, "", "") if self.keep_unknown else ("", "", "")
+        return status
+
+
+def parse_status_codes(value: str) -> dict[str, Status]:
+    """Parse template status codes from comma-separated 'CODE=Status|07:00|18:00' text.
+
+    The times are optional; entries without a code or status are ignored. An entry may
+    end with '|present' to mark a presence code, see `parse_present_codes`.
+    """
+    return {code: status for code, status, _ in _parse_entries(value)}
+
+
+def parse_present_codes(value: str) -> set[str]:
+    """Return the template codes marked as presence ('CODE=Status|07:00|18:00|present')."""
+    return {code for code, _, present in _parse_entries(value) if present}
+
+
+def _parse_entries(value: str) -> Iterator[tuple[str, Status, bool]]:
+    for item in (value or "").split(","):
+        code, separator, status = item.partition("=")
+        parts = [part.strip() for part in status.split("|")]
+        present = len(parts) > 1 and parts[-1].lower() == PRESENT_FLAG
+        if present:
+            parts.pop()
+        parts = parts[:3]
+        code = code.strip().upper()
+        if not separator or not code or not parts[0]:
+            continue
+        yield code, tuple(parts + [""] * (3 - len(parts))), present
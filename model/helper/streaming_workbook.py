@@ -0,0 +1,116 @@
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Iterator
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from model.helper.column_width_tracker import ColumnWidthTracker
+
+# Rows are pickled to the spool file in chunks of this many rows
+SPOOL_CHUNK_ROWS = 1000
+
+
+class StreamingSheet:
+    """Append-only output sheet that spools rows to a temporary file.
+
+    Column widths and the sheet extent are tracked while rows are appended, so
+    nothing has to be re-scanned when the workbook is written out. A pickled
+    sheet refers to the same spool file, which lets a worker process write the
+    workbook; the spool is removed by `close` in the process that created it.
+    """
+
+    def __init__(self, title: str, header: list):
+        self.title = title
+        self.header = list(header)
+        self.widths = ColumnWidthTracker()
+        fd, self._spool_path = tempfile.mkstemp(suffix=".spool")
+        self._spool = os.fdopen(fd, "w+b")
+        self._owner = True
+        self._chunk: list[list] = []
+        self.row_count = 0
+        self.widths.track(self.header)
+
+    def __getstate__(self):
+        self._flush()
+        self._spool.flush()
+        state = self.__dict__.copy()
+        del state["_spool"]
+        state["_owner"] = False
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._spool = open(self._spool_path, "rb")
+
+    def append(self, row) -> None:
+        row = list(row)
+        self.widths.track(row)
+        self._chunk.append(row)
+        self.row_count += 1
+        if len(self._chunk) >= SPOOL_CHUNK_ROWS:
+            self._flush()
+
+    def rows(self) -> Iterator[list]:
+        """Yield the spooled data rows (header excluded) in append order."""
+        self._flush()
+        self._spool.seek(0)
+        while True:
+            try:
+                chunk = pickle.load(self._spool)
+            except EOFError:
+                return
+            yield from chunk
+
+    def close(self) -> None:
+        self._spool.close()
+        if self._owner:
+            try:
+                os.remove(self._spool_path)
+            except OSError:
+                pass
+
+    def _flush(self) -> None:
+        if self._chunk:
+            pickle.dump(self._chunk, self._spool, protocol=pickle.HIGHEST_PROTOCOL)
+            self._chunk = []
+
+
+class StreamingWorkbook:
+    """Single-sheet output workbook written in openpyxl write-only mode.
+
+    Mirrors the small part of the Workbook API the processors use (`active`
+    and `active.append`). Header styling, column widths and the autofilter are
+    known from the stream, so `save` writes every row exactly once.
+    """
+
+    def __init__(self, title: str, header: list, header_fill: PatternFill, header_font: Font):
+        self.active = StreamingSheet(title, header)
+        self.header_fill = header_fill
+        self.header_font = header_font
+
+    def save(self, out_path: Path) -> None:
+        sheet = self.active
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=sheet.title)
+
+        # Column layout must be set before the first row is written
+        for column, width in sheet.widths.column_widths().items():
+            ws.column_dimensions[column].width = width
+        ws.auto_filter.ref = sheet.widths.dimensions
+
+        header_cells = []
+        for value in sheet.header:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.fill = self.header_fill
+            cell.font = self.header_font
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        for row in sheet.rows():
+            ws.append(row)
+        wb.save(out_path)
+
+    def close(self) -> None:
+        self.active.close()
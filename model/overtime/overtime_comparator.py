@@ -1,17 +1,22 @@
+import threading
+from pathlib import Path
 from typing import Optional
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
-from model.base_processor import BaseProcessor
+from model.base_processor import BaseProcessor, ProgressCallback, RunContext
+from model.data_class.comparison_record import ComparisonRecord, IndexKey
 from model.data_class.settings import OvertimeSettings
 from model.helper.export_file_formatter import ExportFileFormatter, WorkbookType
-from model.helper.save_utils import save_target_workbooks
-from model.helper.date_utils import format_date, try_parse_date
+from model.helper.hris_index import OVERTIME_HRIS_LAYOUT, HrisIndex
+from model.helper.save_utils import close_target_workbooks, save_target_workbooks
+from model.helper.date_utils import date_key, format_date, try_parse_date
+from model.helper.fill_utils import forward_fill
+from model.helper.overtime_aggregation import sum_by_key
 
 class OvertimeComparator(BaseProcessor):
     def __init__(self, formatter: Optional[ExportFileFormatter] = None):
         super().__init__()
         self.formatter = formatter or ExportFileFormatter()
-        self.overtime_index: dict[str, dict] = {}
         
     def compare(
         self,
@@ -19,206 +24,206 @@ class OvertimeComparator(BaseProcessor):
         date_start_str: str,
         date_end_str: str,
         overtime_file: str,
-        hris_file: str
-    ) -> None:
-        self.overtime_index = {}
+        hris_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> list[Path]:
+        run = self.start_run(progress_callback, cancel_event)
         
-        overtime_settings = self.apply_overtime_settings(settings)
-        source_wb = self.load_source_wb(overtime_file)
-        hris_wb = self.load_hris_wb(hris_file)
-        output_dir = self.get_output_dir(overtime_file)
-        source_ws = self.get_source_sheets(source_wb, overtime_settings.sheet_names)
-        hris_ws = self.get_hris_source_sheets(hris_wb)
+        overtime_settings = self.apply_overtime_settings(run, settings)
+        try:
+            output_dir = self.get_output_dir(overtime_file)
+            target_codes = {code for code, checked in overtime_settings.company_codes.items() if checked}
+            print(f"Date Start: {date_start_str}, Date End: {date_end_str}")
         
-        print(f"Date Start: {date_start_str}, Date End: {date_end_str}")
+            # Load and parse the overtime and HRIS workbooks side by side
+            run.report_progress("Loading overtime and HRIS workbooks...", 0, 3)
+            run.index, hris_index = self.run_in_processes(
+                run,
+                (self._index_overtime_file, run, overtime_file, overtime_settings, target_codes, date_start_str, date_end_str),
+                (self.load_hris_index, run, hris_file, OVERTIME_HRIS_LAYOUT),
+                max_workers=self.workers_for(
+                    self.load_workers, (overtime_file, overtime_settings.sheet_names), (hris_file, None)
+                ),
+            )
+            self.keep_hris_index(hris_file, OVERTIME_HRIS_LAYOUT, hris_index)
         
-        targets = {
-            code: self.formatter.prepare_workbook(code, WorkbookType.COMPARE)
-            for code, checked in overtime_settings.company_codes.items()
-            if checked
-        }
-
-        for ws in source_ws:
-            self._process_overtime_sheet(ws, overtime_settings, targets, date_start_str, date_end_str)
-        for ws in hris_ws:
-            self._process_hris_sheet(ws, date_start_str, date_end_str)
+            run.report_progress("Matching HRIS data...", 1, 3)
+            self._apply_hris_overtimes(run, hris_index, date_start_str, date_end_str)
         
-        self._print_overtime_index(self.overtime_index, targets)
+            targets = {
+                code: self.formatter.prepare_workbook(code, WorkbookType.COMPARE)
+                for code, checked in overtime_settings.company_codes.items()
+                if checked
+            }
+            try:
+                self._print_overtime_index(run.index, targets)
             
-        save_target_workbooks(
-            targets=targets,
-            output_dir=output_dir,
-            date_start_str=date_start_str,
-            date_end_str=date_end_str,
-            type_str="Overtime Comparison",
-            template_name=settings.get("template_name"),
-            formatter=self.formatter,
-        )
-        
+                run.report_progress("Saving output files...", 2, 3)
+                saved = save_target_workbooks(
+                    targets=targets,
+                    output_dir=output_dir,
+                    date_start_str=date_start_str,
+                    date_end_str=date_end_str,
+                    type_str="Overtime Comparison",
+                    template_name=settings.get("template_name"),
+                    formatter=self.formatter,
+                    max_workers=self.save_workers,
+                )
+                return list(saved)
+            finally:
+                # spool files of targets a cancelled or failed run never saved
+                close_target_workbooks(targets)
+        finally:
+            # the index is no longer needed once the outputs are saved
+            run.release()
+    
+    def _index_overtime_file(
+        self,
+        run: RunContext,
+        overtime_file: str,
+        settings: OvertimeSettings,
+        target_codes: set[str],
+        date_start_str: str,
+        date_end_str: str
+    ) -> dict[IndexKey, ComparisonRecord]:
+        """Load the overtime workbook and index its records (runs in a worker process)."""
+        records: list[tuple[IndexKey, ComparisonRecord]] = []
+        source_wb = self.load_source_wb(overtime_file)
+        try:
+            for ws in self.get_source_sheets(source_wb, settings.sheet_names):
+                records.extend(self._process_overtime_sheet(run, ws, settings, target_codes, date_start_str, date_end_str))
+        finally:
+            source_wb.close()
+        run.index = self._index_overtime_records(records)
+        return run.index
+    
     def _process_overtime_sheet(
         self, 
+        run: RunContext,
         ws: Worksheet,
         settings: OvertimeSettings,
-        targets: dict[str, Workbook],
+        target_codes: set[str],
         date_start_str: str, 
         date_end_str: str
-    ) -> None:
+    ) -> list[tuple[IndexKey, ComparisonRecord]]:
+        """Return the sheet's overtime records as (key, record) pairs in row order."""
+        records: list[tuple[IndexKey, ComparisonRecord]] = []
+        
         # Determine company code by ws title
         ws_title = ws.title
         sheet_company_code = self._company_code_from_sheet_title(ws_title)
         print(f"Processing sheet: {ws.title} for company code: {sheet_company_code}")
             
         if not sheet_company_code:
-            return
-        if sheet_company_code not in targets:
-            return
-            
-        # Find last non-empty cell in row_counter_col, from bottom up
-        last_data_row = settings.data_start_row
-        for row in range(ws.max_row, settings.data_start_row - 1, -1):
-            value = ws.cell(row=row, column=settings.row_counter_col).value
-            if value is not None and str(value).strip() != "":
-                last_data_row = row
-                break
+            return records
+        if sheet_company_code not in target_codes:
+            return records
             
-        # Initialize persistent variables
-        employee_id = ""
-        employee_name = ""
-        notes = ""
-            
-        for row in range(settings.data_start_row, last_data_row + 1):
-                
-            date = ws.cell(row=row, column=settings.date_col).value
-            shift = ws.cell(row=row, column=settings.shift_col).value
-            overtime = ws.cell(row=row, column=settings.ovt_col).value
-            overtime_hours = ws.cell(row=row, column=settings.ovt_hour_col).value
-                
-            _id = ws.cell(row=row, column=settings.employee_id_col).value
-            _name = ws.cell(row=row, column=settings.employee_name_col).value
-            _notes = ws.cell(row=row, column=settings.notes_col).value
+        max_col = max(settings.employee_id_col, settings.employee_name_col, settings.date_col,
+                      settings.shift_col, settings.ovt_hour_col, settings.ovt_col,
+                      settings.notes_col, settings.row_counter_col)
+        
+        try:
+            start_date = try_parse_date(date_start_str)
+            end_date = try_parse_date(date_end_str)
+        except Exception:
+            start_date = end_date = None
+        
+        # Keep the rows with overtime in the date range; only they fill ids, names and notes down
+        overtime_rows = []
+        for row, values in self.scan_rows(run, ws, settings.data_start_row, max_col, settings.row_counter_col):
+            shift = values[settings.shift_col - 1]
+            overtime = values[settings.ovt_col - 1]
+            overtime_hours = values[settings.ovt_hour_col - 1]
                 
             # Parse date as a date object and compare ranges using dates
-            formatted_date = format_date(date)
+            formatted_date = format_date(values[settings.date_col - 1])
             parsed_date = try_parse_date(formatted_date)
             if parsed_date is None:
                 continue
-                
-            try:
-                start_dt = try_parse_date(date_start_str) or parsed_date
-                end_dt = try_parse_date(date_end_str) or parsed_date
-            except Exception:
-                start_dt = parsed_date
-                end_dt = parsed_date
 
-            if not (start_dt <= parsed_date <= end_dt):
+            if not ((start_date or parsed_date) <= parsed_date <= (end_date or parsed_date)):
                 continue
                 
             if not shift or not overtime or not overtime_hours:
                 continue
-                
-            # Update persistent variables if current row has new values
-            employee_id = str(_id).strip() if _id else employee_id
-            employee_name = str(_name).strip() if _name else employee_name
-            notes = str(_notes).strip() if _notes else notes
-                
-            status, timein, timeout = self.map_status_by_shift(shift)
             
-            key = f"{formatted_date}_{employee_id}"
-            if key in self.overtime_index:
-                self.overtime_index[key]["overtime"] += overtime
-                continue
+            overtime_rows.append((values, formatted_date))
             
-            self.overtime_index[key] = {
-                "hris_overtime": 0,
-                "date": formatted_date,
-                "employee_id": employee_id,
-                "employee_name": employee_name,
-                "status": status,
-                "overtime": overtime,
-                "time_in": timein,
-                "time_out": timeout,
-                "notes": notes,
-                "company_code": sheet_company_code
-            }
-                
-    def _process_hris_sheet(
-        self, 
-        ws: Worksheet,
-        date_start_str: str, 
-        date_end_str: str
-    ) -> None:
-        print(f"Processing HRIS sheet: {ws.title}")
-        
-        start_row = 2
-        start_date_col = 8
-        id_col = 3
-        name_col = 2
+        # Empty id, name and notes cells take the value from the row above
+        employee_ids = self._fill_down(overtime_rows, settings.employee_id_col)
+        employee_names = self._fill_down(overtime_rows, settings.employee_name_col)
+        notes_column = self._fill_down(overtime_rows, settings.notes_col)
         
-        # Extract dates from header row
-        header_dates = []
-        for col in range(start_date_col, ws.max_column + 1):
-            cell_value = ws.cell(row=1, column=col).value
-            try:
-                date = format_date(cell_value)
-                header_dates.append((col, date))
-            except Exception:
-                continue
+        for (values, formatted_date), employee_id, employee_name, notes in zip(
+            overtime_rows, employee_ids, employee_names, notes_column
+        ):
+            status, timein, timeout = self.map_status_by_shift(run, values[settings.shift_col - 1])
             
-        # Determine start and end columns based on date range
-        start_col = None
-        end_col = None
+            key = (date_key(formatted_date), employee_id)
+            records.append((key, ComparisonRecord(
+                date=formatted_date,
+                employee_id=employee_id,
+                employee_name=employee_name,
+                status=status,
+                overtime=values[settings.ovt_col - 1],
+                time_in=timein,
+                time_out=timeout,
+                notes=notes,
+                company_code=sheet_company_code,
+            )))
         
-        for col, date in header_dates:
-            if date == date_start_str and start_col is None:
-                start_col = col
-            if date == date_end_str:
-                end_col = col
-
-        if start_col is None:
-            start_col = start_date_col
-        if end_col is None:
-            end_col = ws.max_column
-            
-        print(f"Data rows: {start_row} to {ws.max_row}, Columns: {start_col} to {end_col}")
-        
-        for row in range(start_row, ws.max_row + 1):
-            employee_id_raw = ws.cell(row=row, column=id_col).value
-            if not employee_id_raw:
-                continue
-            employee_id = str(employee_id_raw).strip()
-            
-            for col in range(start_col, end_col + 1):
-                overtime = ws.cell(row=row, column=col).value
-                date = ws.cell(row=1, column=col).value
+        return records
+    
+    def _fill_down(self, overtime_rows: list[tuple], col: int) -> list[str]:
+        """Forward-fill one column of the overtime rows as stripped text."""
+        cells = [values[col - 1] for values, _ in overtime_rows]
+        return forward_fill([str(cell).strip() if cell else "" for cell in cells], [bool(cell) for cell in cells])
+    
+    def _index_overtime_records(
+        self,
+        records: list[tuple[IndexKey, ComparisonRecord]]
+    ) -> dict[IndexKey, ComparisonRecord]:
+        """Index records by key; the first record of a key is kept and repeated keys add up their overtime."""
+        first, totals = sum_by_key([key for key, _ in records], [record.overtime for _, record in records])
+        overtime_index: dict[IndexKey, ComparisonRecord] = {}
+        for position, total in zip(first, totals):
+            key, record = records[position]
+            record.overtime = total
+            overtime_index[key] = record
+        return overtime_index
                 
-                if not date:
-                    continue
-                if not overtime or str(overtime).strip() == "":
-                    overtime = 0
-                    
-                formatted_date = format_date(date)
-                employee_id_str = str(employee_id).strip()
-                key = f"{formatted_date}_{employee_id_str}"
-                matched_overtime_record = self.overtime_index.get(key)
+    def _apply_hris_overtimes(
+        self,
+        run: RunContext,
+        hris_index: HrisIndex,
+        date_start_str: str,
+        date_end_str: str
+    ) -> None:
+        for key, overtime in self.match_hris_cells(run, hris_index, run.index, date_start_str, date_end_str):
+            if not overtime or str(overtime).strip() == "":
+                overtime = 0
                 
-                if matched_overtime_record:
-                    matched_overtime_record["hris_overtime"] = float(overtime)
-
-    def _print_overtime_index(self, overtime_index: dict[str, dict], targets: dict[str, Workbook]):
+            matched_overtime_record = run.index.get(key)
+            if matched_overtime_record:
+                matched_overtime_record.hris_overtime = float(overtime)
+    
+    def _print_overtime_index(self, overtime_index: dict[IndexKey, ComparisonRecord], targets: dict[str, Workbook]):
         for key, record in overtime_index.items():
-            target_ws = targets[record["company_code"]].active
+            target_ws = targets[record.company_code].active
             target_ws.append([
-                record["overtime"],
-                record["hris_overtime"],
-                record["overtime"]-record["hris_overtime"],
-                record["date"],
-                record["employee_id"],
-                record["employee_name"],
-                record["status"],
-                record["overtime"],
-                record["time_in"],
-                record["time_out"],
-                record["notes"]
+                record.overtime,
+                record.hris_overtime,
+                record.overtime-record.hris_overtime,
+                record.date,
+                record.employee_id,
+                record.employee_name,
+                record.status,
+                record.overtime,
+                record.time_in,
+                record.time_out,
+                record.notes
             ])        
                     
                     
@@ -1,11 +1,15 @@
+import threading
+from pathlib import Path
 from typing import Optional
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
-from model.base_processor import BaseProcessor
+from model.base_processor import BaseProcessor, ProgressCallback, RunContext
 from model.data_class.settings import OvertimeSettings
 from model.helper.export_file_formatter import ExportFileFormatter, WorkbookType
-from model.helper.save_utils import save_target_workbooks
+from model.helper.save_utils import close_target_workbooks, save_target_workbooks
 from model.helper.date_utils import format_date, try_parse_date
+from model.helper.fill_utils import forward_fill
+from model.helper.overtime_aggregation import sum_by_key
 
 class OvertimeExtractor(BaseProcessor):
     def __init__(
@@ -20,122 +24,138 @@ class OvertimeExtractor(BaseProcessor):
         settings: dict,
         date_start_str: str,
         date_end_str: str, 
-        overtime_file: str  
-    ):
+        overtime_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> list[Path]:
         print(f"OvertimeExtractor: Starting extraction for file: {overtime_file}")
-        overtime_settings = self.apply_overtime_settings(settings)
-        source_wb = self.load_source_wb(overtime_file)
+        run = self.start_run(progress_callback, cancel_event)
+        run.report_progress("Loading workbook...", 0, 0)
+        overtime_settings = self.apply_overtime_settings(run, settings)
         output_dir = self.get_output_dir(overtime_file)
-        source_ws = self.get_source_sheets(source_wb, overtime_settings.sheet_names)
+        target_codes = {code for code, checked in overtime_settings.company_codes.items() if checked}
         print(f"Date Start: {date_start_str}, Date End: {date_end_str}")
         
+        # Sheets are parsed independently (in worker processes when enabled) and merged in sheet order
+        sheet_records = self.map_source_sheets(
+            run, overtime_file, overtime_settings.sheet_names,
+            self._process_source_sheet, overtime_settings, target_codes, date_start_str, date_end_str
+        )
+        overtime_index = self._merge_sheet_records(sheet_records)
+        
         targets = {
             code: self.formatter.prepare_workbook(code, WorkbookType.EXTRACT)
             for code, checked in overtime_settings.company_codes.items()
             if checked
         }
-
-        overtime_index = self._process_source_sheet(source_ws, overtime_settings, targets, date_start_str, date_end_str)
-        self._print_overtime_index(overtime_index, targets)
+        try:
+            self._print_overtime_index(overtime_index, targets)
         
-        save_target_workbooks(
-            targets=targets,
-            output_dir=output_dir,
-            date_start_str=date_start_str,
-            date_end_str=date_end_str,
-            type_str="Overtime",
-            template_name=settings.get("template_name"),
-            formatter=self.formatter,
-        )
+            run.report_progress("Saving output files...", len(sheet_records), len(sheet_records) + 1)
+            saved = save_target_workbooks(
+                targets=targets,
+                output_dir=output_dir,
+                date_start_str=date_start_str,
+                date_end_str=date_end_str,
+                type_str="Overtime",
+                template_name=settings.get("template_name"),
+                formatter=self.formatter,
+                max_workers=self.save_workers,
+            )
+            return list(saved)
+        finally:
+            # spool files of targets a cancelled or failed run never saved
+            close_target_workbooks(targets)
         
     def _process_source_sheet(
         self, 
-        source_ws: list[Worksheet],
+        run: RunContext,
+        ws: Worksheet,
         settings: OvertimeSettings,
-        target_ws: dict[str, Workbook],
+        target_codes: set[str],
         date_start_str: str, 
         date_end_str: str
-    ) -> dict[str, dict]:
-        overtime_index: dict[str, dict] = {}
-        for ws in source_ws:
-            # Determine company code by ws title
-            ws_title = ws.title
-            company_code = self._company_code_from_sheet_title(ws_title)
-            print(f"Processing sheet: {ws.title} for company code: {company_code}")
-            
-            if not company_code:
-                return
-            if company_code not in target_ws:
-                return
-            
-            # Find last non-empty cell in row_counter_col, from bottom up
-            last_data_row = settings.data_start_row
-            for row in range(ws.max_row, settings.data_start_row - 1, -1):
-                value = ws.cell(row=row, column=settings.row_counter_col).value
-                if value is not None and str(value).strip() != "":
-                    last_data_row = row
-                    break
+    ) -> list[tuple[str, dict]]:
+        """Return the sheet's overtime records as (key, record) pairs in row order."""
+        sheet_records: list[tuple[str, dict]] = []
+        
+        # Determine company code by ws title
+        ws_title = ws.title
+        company_code = self._company_code_from_sheet_title(ws_title)
+        print(f"Processing sheet: {ws.title} for company code: {company_code}")
+        
+        if not company_code:
+            return sheet_records
+        if company_code not in target_codes:
+            return sheet_records
+        
+        max_col = max(settings.employee_id_col, settings.employee_name_col, settings.date_col,
+                      settings.shift_col, settings.ovt_hour_col, settings.ovt_col,
+                      settings.notes_col, settings.row_counter_col)
+        
+        # Rows without a parseable date are left out before anything is filled down
+        dated_rows = []
+        for row, values in self.scan_rows(run, ws, settings.data_start_row, max_col, settings.row_counter_col):
+            formatted_date = format_date(values[settings.date_col - 1])
+            parsed_date = try_parse_date(formatted_date)
+            if parsed_date is not None:
+                dated_rows.append((values, formatted_date, parsed_date))
+        
+        # Blank id, name and notes cells (empty or the text "None") take the value from the row above
+        employee_ids = self._fill_down(dated_rows, settings.employee_id_col)
+        employee_names = self._fill_down(dated_rows, settings.employee_name_col)
+        notes_column = self._fill_down(dated_rows, settings.notes_col)
+        
+        try:
+            start_date = try_parse_date(date_start_str)
+            end_date = try_parse_date(date_end_str)
+        except Exception:
+            start_date = end_date = None
+        
+        for (values, formatted_date, parsed_date), employee_id, employee_name, notes in zip(
+            dated_rows, employee_ids, employee_names, notes_column
+        ):
+            shift = values[settings.shift_col - 1]
+            overtime = values[settings.ovt_col - 1]
+            overtime_hours = values[settings.ovt_hour_col - 1]
             
-            # Initialize persistent variables
-            employee_id = ""
-            employee_name = ""
-            notes = ""
+            # Skip rows outside date range or with invalid data
+            if not ((start_date or parsed_date) <= parsed_date <= (end_date or parsed_date)):
+                continue
             
-            for row in range(settings.data_start_row, last_data_row + 1):
-                
-                date = ws.cell(row=row, column=settings.date_col).value
-                shift = ws.cell(row=row, column=settings.shift_col).value
-                overtime = ws.cell(row=row, column=settings.ovt_col).value
-                overtime_hours = ws.cell(row=row, column=settings.ovt_hour_col).value
-                
-                _id = str(ws.cell(row=row, column=settings.employee_id_col).value).strip()
-                _name = str(ws.cell(row=row, column=settings.employee_name_col).value).strip()
-                _notes = str(ws.cell(row=row, column=settings.notes_col).value).strip()
-                
-                # Parse date as a date object and compare ranges using dates
-                formatted_date = format_date(date)
-                parsed_date = try_parse_date(formatted_date)
-                if parsed_date is None:
-                    continue
-                
-                try:
-                    start_dt = try_parse_date(date_start_str) or parsed_date
-                    end_dt = try_parse_date(date_end_str) or parsed_date
-                except Exception:
-                    start_dt = parsed_date
-                    end_dt = parsed_date
-                
-                # Update persistent variables if current row has new values
-                none = (None, "", "None")
-                employee_id = _id if _id not in none else employee_id
-                employee_name = _name if _name not in none else employee_name
-                notes = _notes if _notes not in none else notes
-                status, timein, timeout = self.map_status_by_shift(shift)
-
-                # Skip rows outside date range or with invalid data
-                if not (start_dt <= parsed_date <= end_dt):
-                    continue
-                
-                if not shift or not overtime or not overtime_hours:
-                    continue
+            if not shift or not overtime or not overtime_hours:
+                continue
 
-                key = f"{formatted_date}_{employee_id}"
-                if key in overtime_index:
-                    overtime_index[key]["overtime"] += overtime
-                    continue
-                    
-                overtime_index[key] = {
-                    "date": formatted_date,
-                    "employee_id": employee_id,
-                    "employee_name": employee_name,
-                    "status": status,
-                    "overtime": overtime,
-                    "timein": timein,
-                    "timeout": timeout,
-                    "notes": notes,
-                    "company_code": company_code
-                }
-                
+            status, timein, timeout = self.map_status_by_shift(run, shift)
+            key = f"{formatted_date}_{employee_id}"
+            sheet_records.append((key, {
+                "date": formatted_date,
+                "employee_id": employee_id,
+                "employee_name": employee_name,
+                "status": status,
+                "overtime": overtime,
+                "timein": timein,
+                "timeout": timeout,
+                "notes": notes,
+                "company_code": company_code
+            }))
+            
+        return sheet_records
+    
+    def _fill_down(self, dated_rows: list[tuple], col: int) -> list[str]:
+        """Forward-fill one column of the dated rows as stripped text."""
+        texts = [str(values[col - 1]).strip() for values, _, _ in dated_rows]
+        return forward_fill(texts, [text not in ("", "None") for text in texts])
+    
+    def _merge_sheet_records(self, sheet_records: list[list[tuple[str, dict]]]) -> dict[str, dict]:
+        """Fold per-sheet records in sheet and row order; repeated keys add up their overtime."""
+        records = [pair for pairs in sheet_records for pair in pairs]
+        first, totals = sum_by_key([key for key, _ in records], [record["overtime"] for _, record in records])
+        overtime_index: dict[str, dict] = {}
+        for position, total in zip(first, totals):
+            key, record = records[position]
+            record["overtime"] = total
+            overtime_index[key] = record
         return overtime_index
             
     def _print_overtime_index(self, overtime_index: dict[str, dict], targets: dict[str, Workbook]):
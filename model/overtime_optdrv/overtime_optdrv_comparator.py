@@ -1,18 +1,23 @@
+import threading
+from pathlib import Path
 from typing import Optional
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
-from model.base_processor import BaseProcessor
+from model.base_processor import BaseProcessor, ProgressCallback, RunContext
+from model.data_class.comparison_record import ComparisonRecord, IndexKey
 from model.data_class.settings import OvertimeOptDrvSettings
-from model.helper.date_utils import format_date
 from model.helper.export_file_formatter import ExportFileFormatter, WorkbookType
-from model.helper.save_utils import save_target_workbooks
+from model.helper.grid_window import GridWindow
+from model.helper.hris_index import OVERTIME_HRIS_LAYOUT, HrisIndex
+from model.helper.save_utils import close_target_workbooks, save_target_workbooks
+from model.helper.date_utils import date_key
+from model.helper.overtime_aggregation import sum_by_key
 
 
 class OvertimeOptdrvComparator(BaseProcessor):
     def __init__(self, formatter: Optional[ExportFileFormatter] = None):
         super().__init__()
         self.formatter = formatter or ExportFileFormatter()
-        self.overtime_index: dict[str, dict] = {}
         
     def compare(
         self,
@@ -20,206 +25,194 @@ class OvertimeOptdrvComparator(BaseProcessor):
         date_start_str: str,
         date_end_str: str,
         overtime_file: str,
-        hris_file: str
-    ) -> None:
-        self.overtime_index = {}
+        hris_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> list[Path]:
+        run = self.start_run(progress_callback, cancel_event)
         
         overtime_settings = self.apply_overtime_optdrv_settings(settings)
-        source_wb = self.load_source_wb(overtime_file)
-        hris_wb = self.load_hris_wb(hris_file)
-        output_dir = self.get_output_dir(overtime_file)
-        source_ws = self.get_source_sheets(source_wb, overtime_settings.sheet_names)
-        hris_ws = self.get_hris_source_sheets(hris_wb)
-        print(f"Date Start: {date_start_str}, Date End: {date_end_str}")
-        
-        targets = {
-            code: self.formatter.prepare_workbook(code, WorkbookType.COMPARE)
-            for code, checked in overtime_settings.company_codes.items()
-            if checked
-        }
+        try:
+            output_dir = self.get_output_dir(overtime_file)
+            target_codes = {code for code, checked in overtime_settings.company_codes.items() if checked}
+            print(f"Date Start: {date_start_str}, Date End: {date_end_str}")
         
-        for ws in source_ws:
-            self._process_overtime_sheet(ws, overtime_settings, targets, date_start_str, date_end_str)
-        for ws in hris_ws:
-            self._process_hris_sheet(ws, overtime_settings, targets, date_start_str, date_end_str)
+            # Load and parse the overtime and HRIS workbooks side by side
+            run.report_progress("Loading overtime and HRIS workbooks...", 0, 3)
+            run.index, hris_index = self.run_in_processes(
+                run,
+                (self._index_overtime_file, run, overtime_file, overtime_settings, target_codes, date_start_str, date_end_str),
+                (self.load_hris_index, run, hris_file, OVERTIME_HRIS_LAYOUT),
+                max_workers=self.workers_for(
+                    self.load_workers, (overtime_file, overtime_settings.sheet_names), (hris_file, None)
+                ),
+            )
+            self.keep_hris_index(hris_file, OVERTIME_HRIS_LAYOUT, hris_index)
         
-        self._print_overtime_index(self.overtime_index, targets)
+            run.report_progress("Matching HRIS data...", 1, 3)
+            self._apply_hris_overtimes(run, hris_index, date_start_str, date_end_str)
         
-        save_target_workbooks(
-            targets=targets,
-            output_dir=output_dir,
-            date_start_str=date_start_str,
-            date_end_str=date_end_str,
-            type_str="Overtime Optdrv Comparison",
-            template_name=settings.get("template_name"),
-            formatter=self.formatter,
-        )
+            targets = {
+                code: self.formatter.prepare_workbook(code, WorkbookType.COMPARE)
+                for code, checked in overtime_settings.company_codes.items()
+                if checked
+            }
+            try:
+                self._print_overtime_index(run.index, targets)
         
+                run.report_progress("Saving output files...", 2, 3)
+                saved = save_target_workbooks(
+                    targets=targets,
+                    output_dir=output_dir,
+                    date_start_str=date_start_str,
+                    date_end_str=date_end_str,
+                    type_str="Overtime Optdrv Comparison",
+                    template_name=settings.get("template_name"),
+                    formatter=self.formatter,
+                    max_workers=self.save_workers,
+                )
+                return list(saved)
+            finally:
+                # spool files of targets a cancelled or failed run never saved
+                close_target_workbooks(targets)
+        finally:
+            # the index is no longer needed once the outputs are saved
+            run.release()
+    
+    def _index_overtime_file(
+        self,
+        run: RunContext,
+        overtime_file: str,
+        settings: OvertimeOptDrvSettings,
+        target_codes: set[str],
+        date_start_str: str,
+        date_end_str: str
+    ) -> dict[IndexKey, ComparisonRecord]:
+        """Load the overtime workbook and index its records (runs in a worker process)."""
+        records: list[tuple[IndexKey, ComparisonRecord]] = []
+        source_wb = self.load_source_wb(overtime_file)
+        try:
+            for ws in self.get_source_sheets(source_wb, settings.sheet_names):
+                records.extend(self._process_overtime_sheet(run, ws, settings, target_codes, date_start_str, date_end_str))
+        finally:
+            source_wb.close()
+        run.index = self._index_overtime_records(records)
+        return run.index
+    
     def _process_overtime_sheet(
         self, 
+        run: RunContext,
         ws: Worksheet,
         settings: OvertimeOptDrvSettings,
-        targets: dict[str, Workbook], 
+        target_codes: set[str], 
         date_start_str: str, 
         date_end_str: str
-    ) -> None:
+    ) -> list[tuple[IndexKey, ComparisonRecord]]:
+        """Return the sheet's overtime records as (key, record) pairs in row order, overtime not yet as float."""
         print(f"Processing source sheet: {ws.title}")
+        records: list[tuple[IndexKey, ComparisonRecord]] = []
         
-        # Find last non-empty cell in row_counter_col, from bottom up
-        last_data_row = settings.data_start_row
-        for row in range(ws.max_row, settings.data_start_row - 1, -1):
-            value = ws.cell(row=row, column=settings.row_counter_col).value
-            if value is not None and str(value).strip() != "":
-                last_data_row = row
-                break
-        
-        # Extract dates from header row
-        header_dates = []
-        for col in range(settings.company_code_col + 1, ws.max_column + 1):
-            cell_value = ws.cell(row=settings.date_header_row, column=col).value
-            try:
-                date = format_date(cell_value)
-                header_dates.append((col, date))
-            except Exception:
-                continue
+        # Index dates from header row once and resolve the date range window
+        header_index = self.build_header_index(ws, settings.date_header_row, settings.company_code_col + 1)
+        start_col, end_col = header_index.column_window(date_start_str, date_end_str)
             
-        # Determine start and end columns based on date range
-        start_col = None
-        end_col = None
-        
-        for col, date in header_dates:
-            if date == date_start_str and start_col is None:
-                start_col = col
-            if date == date_end_str:
-                end_col = col
-
-        if start_col is None:
-            start_col = settings.company_code_col + 1
-        if end_col is None:
-            end_col = ws.max_column
+        window_dates = [(col, formatted_date, date_key(formatted_date))
+                        for col, formatted_date in header_index.dates_in_window(start_col, end_col)]
+        max_col = max(end_col, settings.employee_id_col, settings.employee_name_col,
+                      settings.company_code_col, settings.row_counter_col)
             
-        for row in range(settings.data_start_row, last_data_row + 1):
-            company_code = ws.cell(row=row, column=settings.company_code_col).value
-            if not company_code or company_code not in targets:
+        # Keep the rows of selected companies and known employees in a single pass over the sheet
+        employees = []
+        rows = []
+        for row, values in self.scan_rows(run, ws, settings.data_start_row, max_col, settings.row_counter_col):
+            company_code = values[settings.company_code_col - 1]
+            if not company_code or company_code not in target_codes:
                 continue
             
-            employee_id = ws.cell(row=row, column=settings.employee_id_col).value
-            employee_name = ws.cell(row=row, column=settings.employee_name_col).value
+            employee_id = values[settings.employee_id_col - 1]
+            employee_name = values[settings.employee_name_col - 1]
             if not employee_id:
                 continue
             
-            for col in range(start_col, end_col + 1):
-                date = ws.cell(row=settings.date_header_row, column=col).value
-                overtime = ws.cell(row=row, column=col).value
-                
-                if not date:
-                    continue
-                if overtime in (None, "", " "):
-                    continue
-                
-                time_in = "07:00"
-                time_out = "19:00"
-                status = "Hadir (H)"
-                
-                formatted_date = format_date(date)
-                key = f"{formatted_date}_{employee_id}"
-                record = {
-                    "hris_overtime": 0,
-                    "date": formatted_date,
-                    "employee_id": employee_id,
-                    "employee_name": employee_name,
-                    "status": status,
-                    "overtime": float(overtime),
-                    "time_in": time_in,
-                    "time_out": time_out,
-                    "notes": "",
-                    "company_code": company_code
-                }
+            employees.append((employee_id, employee_name, company_code))
+            rows.append(values)
+        
+        # Records are built only for the non-empty cells of the window
+        grid = GridWindow(rows, [col for col, _, _ in window_dates])
+        for row_index, window_index, overtime in grid.hits(lambda overtime: overtime not in (None, "", " ")):
+            employee_id, employee_name, company_code = employees[row_index]
+            _, formatted_date, day = window_dates[window_index]
             
-                if key in self.overtime_index:
-                    self.overtime_index[key]["overtime"] += float(overtime)
-                else:
-                    self.overtime_index[key] = record
+            time_in = "07:00"
+            time_out = "19:00"
+            status = "Hadir (H)"
+            
+            # ids are keyed as text, as HRIS ids are matched as text
+            key = (day, str(employee_id))
+            records.append((key, ComparisonRecord(
+                date=formatted_date,
+                employee_id=employee_id,
+                employee_name=employee_name,
+                status=status,
+                overtime=overtime,
+                time_in=time_in,
+                time_out=time_out,
+                company_code=company_code,
+            )))
+        
+        return records
+    
+    def _index_overtime_records(
+        self,
+        records: list[tuple[IndexKey, ComparisonRecord]]
+    ) -> dict[IndexKey, ComparisonRecord]:
+        """Index records by key; the first record of a key is kept and overtime is summed as float."""
+        first, totals = sum_by_key(
+            [key for key, _ in records], [record.overtime for _, record in records], as_float=True
+        )
+        overtime_index: dict[IndexKey, ComparisonRecord] = {}
+        for position, total in zip(first, totals):
+            key, record = records[position]
+            record.overtime = total
+            overtime_index[key] = record
+        return overtime_index
                 
-    def _process_hris_sheet(
-        self, 
-        ws: Worksheet,
-        settings: OvertimeOptDrvSettings,
-        targets: dict[str, Workbook],
-        date_start_str: str, 
+    def _apply_hris_overtimes(
+        self,
+        run: RunContext,
+        hris_index: HrisIndex,
+        date_start_str: str,
         date_end_str: str
     ) -> None:
-        print(f"Processing HRIS sheet: {ws.title}")
-        
-        start_row = 2
-        start_date_col = 8
-        id_col = 3
-        name_col = 2
-        
-        # Extract dates from header row
-        header_dates = []
-        for col in range(start_date_col, ws.max_column + 1):
-            cell_value = ws.cell(row=1, column=col).value
-            try:
-                date = format_date(cell_value)
-                header_dates.append((col, date))
-            except Exception:
+        keys = []
+        overtimes = []
+        for key, overtime in self.match_hris_cells(run, hris_index, run.index, date_start_str, date_end_str):
+            if key not in run.index:
                 continue
-            
-        # Determine start and end columns based on date range
-        start_col = None
-        end_col = None
+            if not overtime or str(overtime).strip() == "":
+                overtime = 0
+            keys.append(key)
+            overtimes.append(overtime)
         
-        for col, date in header_dates:
-            if date == date_start_str and start_col is None:
-                start_col = col
-            if date == date_end_str:
-                end_col = col
-
-        if start_col is None:
-            start_col = start_date_col
-        if end_col is None:
-            end_col = ws.max_column
-            
-        print(f"Data rows: {start_row} to {ws.max_row}, Columns: {start_col} to {end_col}")
-        
-        for row in range(start_row, ws.max_row + 1):
-            employee_id_raw = ws.cell(row=row, column=id_col).value
-            if not employee_id_raw:
-                continue
-            employee_id = str(employee_id_raw).strip()
-            
-            for col in range(start_col, end_col + 1):
-                overtime = ws.cell(row=row, column=col).value
-                date = ws.cell(row=1, column=col).value
-                
-                if not date:
-                    continue
-                if not overtime or str(overtime).strip() == "":
-                    overtime = 0
-                    
-                formatted_date = format_date(date)
-                employee_id_str = str(employee_id).strip()
-                key = f"{formatted_date}_{employee_id_str}"
-                matched_overtime_record = self.overtime_index.get(key)
-
-                if matched_overtime_record:
-                    matched_overtime_record["hris_overtime"] += float(overtime)
+        # Every HRIS cell of a key adds to its record
+        first, totals = sum_by_key(keys, overtimes, as_float=True)
+        for position, total in zip(first, totals):
+            run.index[keys[position]].hris_overtime += total
     
-    def _print_overtime_index(self, overtime_index: dict[str, dict], targets: dict[str, Workbook]):
+    def _print_overtime_index(self, overtime_index: dict[IndexKey, ComparisonRecord], targets: dict[str, Workbook]):
         for key, record in overtime_index.items():
-            target_ws = targets[record["company_code"]].active
+            target_ws = targets[record.company_code].active
             target_ws.append([
-                record["overtime"],
-                record["hris_overtime"],
-                record["overtime"]-record["hris_overtime"],
-                record["date"],
-                record["employee_id"],
-                record["employee_name"],
-                record["status"],
-                record["overtime"],
-                record["time_in"],
-                record["time_out"],
-                record["notes"]
+                record.overtime,
+                record.hris_overtime,
+                record.overtime-record.hris_overtime,
+                record.date,
+                record.employee_id,
+                record.employee_name,
+                record.status,
+                record.overtime,
+                record.time_in,
+                record.time_out,
+                record.notes
             ])   
     
\ No newline at end of file
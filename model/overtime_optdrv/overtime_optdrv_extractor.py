@@ -1,11 +1,13 @@
+import threading
+from pathlib import Path
 from typing import Optional
 from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
-from model.base_processor import BaseProcessor
+from model.base_processor import BaseProcessor, ProgressCallback, RunContext
 from model.data_class.settings import OvertimeOptDrvSettings
-from model.helper.date_utils import format_date
 from model.helper.export_file_formatter import ExportFileFormatter, WorkbookType
-from model.helper.save_utils import save_target_workbooks
+from model.helper.grid_window import GridWindow
+from model.helper.save_utils import close_target_workbooks, save_target_workbooks
 
 
 class OvertimeOptdrvExtractor(BaseProcessor):
@@ -18,9 +20,13 @@ class OvertimeOptdrvExtractor(BaseProcessor):
         settings: dict,
         date_start_str: str,
         date_end_str: str, 
-        overtime_file: str  
-    ):
+        overtime_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> list[Path]:
         print(f"OvertimeOptdrvExtractor: Starting extraction for file: {overtime_file}")
+        run = self.start_run(progress_callback, cancel_event)
+        run.report_progress("Loading workbook...", 0, 0)
         overtime_settings = self.apply_overtime_optdrv_settings(settings)
         source_wb = self.load_source_wb(overtime_file)
         output_dir = self.get_output_dir(overtime_file)
@@ -34,21 +40,34 @@ class OvertimeOptdrvExtractor(BaseProcessor):
             if checked
         }
 
-        for ws in source_ws:
-            self._process_source_sheet(ws, overtime_settings, targets, date_start_str, date_end_str)
+        total_steps = len(source_ws) + 1
+        try:
+            try:
+                for step, ws in enumerate(source_ws):
+                    run.report_progress(f"Processing sheet: {ws.title}", step, total_steps)
+                    self._process_source_sheet(run, ws, overtime_settings, targets, date_start_str, date_end_str)
+            finally:
+                source_wb.close()
             
-        save_target_workbooks(
-            targets=targets,
-            output_dir=output_dir,
-            date_start_str=date_start_str,
-            date_end_str=date_end_str,
-            type_str="Overtime Optdrv",
-            template_name=settings.get("template_name"),
-            formatter=self.formatter,
-        )
+            run.report_progress("Saving output files...", total_steps - 1, total_steps)
+            saved = save_target_workbooks(
+                targets=targets,
+                output_dir=output_dir,
+                date_start_str=date_start_str,
+                date_end_str=date_end_str,
+                type_str="Overtime Optdrv",
+                template_name=settings.get("template_name"),
+                formatter=self.formatter,
+                max_workers=self.save_workers,
+            )
+            return list(saved)
+        finally:
+            # spool files of targets a cancelled or failed run never saved
+            close_target_workbooks(targets)
     
     def _process_source_sheet(
         self, 
+        run: RunContext,
         ws: Worksheet,
         settings: OvertimeOptDrvSettings,
         targets: dict[str, Workbook], 
@@ -58,75 +77,47 @@ class OvertimeOptdrvExtractor(BaseProcessor):
         """Process a single source worksheet and populate target workbooks."""
         print(f"Processing source sheet: {ws.title}")
         
-        # Find last non-empty cell in row_counter_col, from bottom up
-        last_data_row = settings.data_start_row
-        for row in range(ws.max_row, settings.data_start_row - 1, -1):
-            value = ws.cell(row=row, column=settings.row_counter_col).value
-            if value is not None and str(value).strip() != "":
-                last_data_row = row
-                break
+        # Index dates from header row once and resolve the date range window
+        header_index = self.build_header_index(ws, settings.date_header_row, settings.company_code_col + 1)
+        start_col, end_col = header_index.column_window(date_start_str, date_end_str)
         
-        # Extract dates from header row
-        header_dates = []
-        for col in range(settings.company_code_col + 1, ws.max_column + 1):
-            cell_value = ws.cell(row=settings.date_header_row, column=col).value
-            try:
-                date = format_date(cell_value)
-                header_dates.append((col, date))
-            except Exception:
-                continue
-            
-        # Determine start and end columns based on date range
-        start_col = None
-        end_col = None
+        window_dates = header_index.dates_in_window(start_col, end_col)
+        max_col = max(end_col, settings.employee_id_col, settings.employee_name_col,
+                      settings.company_code_col, settings.row_counter_col)
         
-        for col, date in header_dates:
-            if date == date_start_str and start_col is None:
-                start_col = col
-            if date == date_end_str:
-                end_col = col
-
-        if start_col is None:
-            start_col = settings.company_code_col + 1
-        if end_col is None:
-            end_col = ws.max_column
-        
-        for row in range(settings.data_start_row, last_data_row + 1):
-            company_code = ws.cell(row=row, column=settings.company_code_col).value
+        # Keep the rows of selected companies in a single pass over the sheet
+        employees = []
+        rows = []
+        for row, values in self.scan_rows(run, ws, settings.data_start_row, max_col, settings.row_counter_col):
+            company_code = values[settings.company_code_col - 1]
             
             if not company_code or company_code not in targets:
                 continue
             
-            target_wb = targets[company_code]
-            target_ws = target_wb.active
+            employee_id = values[settings.employee_id_col - 1]
+            employee_name = values[settings.employee_name_col - 1]
+            employees.append((employee_id, employee_name, company_code))
+            rows.append(values)
+        
+        # Only cells holding overtime become rows
+        grid = GridWindow(rows, [col for col, _ in window_dates])
+        for row_index, window_index, overtime in grid.hits(self._has_overtime):
+            employee_id, employee_name, company_code = employees[row_index]
             
-            employee_id = ws.cell(row=row, column=settings.employee_id_col).value
-            employee_name = ws.cell(row=row, column=settings.employee_name_col).value
+            time_in = "07:00"
+            time_out = "19:00"
+            status = "Hadir (H)"
             
-            for col in range(start_col, end_col + 1):
-                date = None
-                for hd_col, hd_date in header_dates:
-                    if hd_col == col:
-                        date = hd_date
-                        break
-                if not date:
-                    continue
-                
-                overtime = ws.cell(row=row, column=col).value
-                if overtime is None or str(overtime).strip() == "" or overtime == 0:
-                    continue
-                
-                time_in = "07:00"
-                time_out = "19:00"
-                status = "Hadir (H)"
-                
-                target_ws.append([
-                    date,
-                    employee_id,
-                    employee_name,
-                    status,
-                    overtime,
-                    time_in,
-                    time_out
-                ])
-        
+            target_ws = targets[company_code].active
+            target_ws.append([
+                window_dates[window_index][1],
+                employee_id,
+                employee_name,
+                status,
+                overtime,
+                time_in,
+                time_out
+            ])
+    
+    def _has_overtime(self, overtime) -> bool:
+        return not (overtime is None or str(overtime).strip() == "" or overtime == 0)
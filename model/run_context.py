@@ -0,0 +1,72 @@
+import threading
+from typing import Callable, Optional
+from model.data_class.comparison_record import ComparisonRecord, IndexKey
+from model.helper.status_table import (
+    ATTENDANCE_PRESENT_CODES, ATTENDANCE_STATUS_CODES, SHIFT_STATUS_CODES, StatusTable
+)
+
+# progress_callback(message, current_step, total_steps); total_steps 0 means unknown
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class ProcessingCancelled(Exception):
+    """Raised inside a processor when its run was cancelled through the cancel event."""
+
+
+class RunContext:
+    """Everything one extract or compare run accumulates.
+
+    Processors keep no per-run state of their own: a run's progress reporting, status
+    tables and comparison index live here and are passed down explicitly, so one
+    processor can serve several runs, one after another or at the same time. The
+    index is dropped by `release` once the outputs are saved.
+    """
+
+    def __init__(
+        self,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
+    ):
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.progress_step: tuple[int, int] = (0, 0)
+        # Status lookups, rebuilt with the template's codes by apply_*_settings
+        self.status_table = StatusTable(ATTENDANCE_STATUS_CODES, present_codes=ATTENDANCE_PRESENT_CODES)
+        self.shift_table = StatusTable(SHIFT_STATUS_CODES, keep_unknown=True)
+        # Comparators: source records by (date_key, employee_id) and the repeated keys
+        self.index: dict[IndexKey, ComparisonRecord] = {}
+        self.duplicates: list[ComparisonRecord] = []
+        self.hris_pruned_rows = 0
+        self.hris_pruned_cells = 0
+
+    def __getstate__(self):
+        # Worker processes get the run without its callback and cancel event
+        state = self.__dict__.copy()
+        state["progress_callback"] = None
+        state["cancel_event"] = None
+        return state
+
+    def report_progress(self, message: str, current: int | None = None, total: int | None = None) -> None:
+        """Report progress of the run and stop it if cancellation was requested.
+
+        current/total count coarse steps (sheets, saving); when omitted the last
+        step is repeated, which is how per-row updates inside a sheet are sent.
+        """
+        self.check_cancelled()
+        if current is not None:
+            self.progress_step = (current, total or 0)
+        if self.progress_callback is not None:
+            self.progress_callback(message, *self.progress_step)
+
+    def check_cancelled(self) -> None:
+        """Raise ProcessingCancelled if the run's cancel event is set."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ProcessingCancelled("Processing cancelled.")
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def release(self) -> None:
+        """Drop the records collected by the run."""
+        self.index = {}
+        self.duplicates = []
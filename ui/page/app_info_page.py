@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox, QMessageBox
 from PySide6.QtCore import Qt, QThread, Signal
 import os
 import webbrowser
@@ -6,6 +6,10 @@ import subprocess
 import sys
 
 from model.helper.app_data import user_templates_path
+from model.helper.cache_control import (
+    cached_data_dir, cached_data_size, clear_cached_data, set_snapshots_enabled, snapshots_enabled
+)
+from model.helper.sheet_snapshot import SNAPSHOT_BUDGET_BYTES, SNAPSHOT_MAX_AGE_DAYS
 from model.helper.update_checker import compare_versions, fetch_latest_release, DEFAULT_REPO
 from model.version import get_version
 
@@ -19,6 +23,7 @@ class AppInfoPage(QWidget):
 
         app_version = get_version()
         templates_path = str(user_templates_path())
+        cache_path = str(cached_data_dir())
 
         title = QLabel("Application Information")
         title.setStyleSheet("font-weight: bold; font-size: 18px;")
@@ -50,6 +55,11 @@ class AppInfoPage(QWidget):
             "- Keep source files in .xlsx (convert .xls/.xlsb before processing)<br><br>"
             "<b>Where templates are stored</b><br>"
             f"{templates_path}<br><br>"
+            "<b>Where cached data is stored</b><br>"
+            f"{cache_path}<br>"
+            "Sheets read from your workbooks (HRIS exports included) are saved here so unchanged "
+            f"files open faster. They are deleted after {SNAPSHOT_MAX_AGE_DAYS} days without use, "
+            f"or sooner beyond {SNAPSHOT_BUDGET_BYTES // (1024 * 1024)} MB.<br><br>"
         )
         layout.addWidget(info)
 
@@ -60,6 +70,23 @@ class AppInfoPage(QWidget):
         btn_open_folder.clicked.connect(self._open_templates_folder)
         layout.addWidget(btn_open_folder)
 
+        # Cached data: opt out of the sheet snapshots, or delete them
+        self.checkbox_keep_snapshots = QCheckBox("Keep read sheets on disk between sessions")
+        self.checkbox_keep_snapshots.setChecked(snapshots_enabled())
+        self.checkbox_keep_snapshots.toggled.connect(self._on_keep_snapshots_toggled)
+        layout.addWidget(self.checkbox_keep_snapshots)
+
+        btn_clear_cache = QPushButton("🗑 Clear Cached Data")
+        btn_clear_cache.setStyleSheet("padding: 6px 10px;")
+        btn_clear_cache.setMaximumWidth(200)
+        btn_clear_cache.clicked.connect(self._on_clear_cache)
+        layout.addWidget(btn_clear_cache)
+
+        self.cache_label = QLabel()
+        self.cache_label.setStyleSheet("font-size: 12px; color: #555;")
+        layout.addWidget(self.cache_label)
+        self._update_cache_label()
+
         # View releases button (kept visible) — update checks run automatically on show
         self.btn_view_releases = QPushButton("🔗 View Releases")
         self.btn_view_releases.setStyleSheet("padding: 6px 10px;")
@@ -83,6 +110,7 @@ class AppInfoPage(QWidget):
 
     def showEvent(self, event):
         super().showEvent(event)
+        self._update_cache_label()
         # Run update check once when the page is first shown
         if not self._checked_on_show:
             self._checked_on_show = True
@@ -100,6 +128,31 @@ class AppInfoPage(QWidget):
         except Exception as e:
             print(f"Error opening folder: {e}")
 
+    def _update_cache_label(self):
+        size_mb = cached_data_size() / (1024 * 1024)
+        self.cache_label.setText(f"Cached data on disk: {size_mb:.1f} MB")
+
+    def _on_keep_snapshots_toggled(self, checked: bool):
+        try:
+            set_snapshots_enabled(checked)
+        except OSError as e:
+            QMessageBox.critical(self, "Cached Data", f"Could not save the setting: {e}")
+        self._update_cache_label()
+
+    def _on_clear_cache(self):
+        reply = QMessageBox.question(
+            self,
+            "Clear Cached Data",
+            "Delete the sheets and HRIS indexes saved from your workbooks?\n"
+            "Output files are kept; the next run reads its workbooks again.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+        clear_cached_data()
+        self._update_cache_label()
+
     def _open_releases_page(self):
         # Open the repository releases page in the default browser.
         repo = os.environ.get("GITHUB_REPO") or DEFAULT_REPO
@@ -6,11 +6,14 @@ from PySide6.QtWidgets import (
 
 from PySide6.QtCore import Qt
 from ui.widget.drop_area_view import DropArea
+from ui.widget.processing_worker import ProcessingWorker
+from ui.widget.progress_panel import ProgressPanel
 from ui.widget.template_bar import TemplateBar
 from ui.widget.period_date_widget import PeriodDateWidget
 from ui.widget.company_code_checkbox import CompanyCodeCheckbox
 from ui.widget.form_field_group import FormFieldGroup
 from ui.widget.multi_text_field_group import MultiTextFieldGroup
+from ui.widget.sheet_picker_dialog import SheetPickerDialog
 from view_model.attendance_view_model import AttendanceViewModel
 from model.template_model import Template
 from view_model.template_view_model import TemplateViewModel
@@ -27,20 +30,25 @@ class AttendancePage(QWidget):
         
         # Left panel with two drop areas
         left_panel = QVBoxLayout()
-        self.drop_area_1 = DropArea("Drop Attendance Excel File Here")
-        self.drop_area_2 = DropArea("Drop HRIS Export Excel File Here")
+        self.drop_area_1 = DropArea("Drop Attendance Excel File Here", prefetch=self.attendance_vm.prefetch_file)
+        self.drop_area_2 = DropArea("Drop HRIS Export Excel File Here", prefetch=self.attendance_vm.prefetch_file)
         left_panel.addWidget(self.drop_area_1, 1)
         left_panel.addWidget(self.drop_area_2, 1)
         
         # Buttons at the bottom of left panel
-        btn_extract = QPushButton("📊 Extract Data")
-        btn_compare = QPushButton("🔍 Compare Data")
-        btn_extract.setFixedHeight(40)
-        btn_compare.setFixedHeight(40)
-        btn_extract.clicked.connect(self.on_extract)
-        btn_compare.clicked.connect(self.on_compare)
-        left_panel.addWidget(btn_extract)
-        left_panel.addWidget(btn_compare)
+        self.btn_extract = QPushButton("📊 Extract Data")
+        self.btn_compare = QPushButton("🔍 Compare Data")
+        self.btn_extract.setFixedHeight(40)
+        self.btn_compare.setFixedHeight(40)
+        self.btn_extract.clicked.connect(self.on_extract)
+        self.btn_compare.clicked.connect(self.on_compare)
+        left_panel.addWidget(self.btn_extract)
+        left_panel.addWidget(self.btn_compare)
+        
+        # Progress of the running extraction/comparison
+        self.progress_panel = ProgressPanel()
+        left_panel.addWidget(self.progress_panel)
+        self._worker = None
         
         main_layout.addLayout(left_panel, 2)
 
@@ -90,14 +98,25 @@ class AttendancePage(QWidget):
         
         edit_text_configs = {
             "Sheet Names": "Enter sheet names separated by commas (e.g., Sheet1, Sheet2)",
-            "Ignore List": "Enter Employee IDs to ignore, separated by commas (e.g., OBI-212365, OBI-756532)"
+            "Ignore List": "Enter Employee IDs to ignore, separated by commas (e.g., OBI-212365, OBI-756532)",
+            "Custom Status Codes": "Optional extra codes, separated by commas (e.g., WFH=Work From Home (WFH)|08:00|17:00|present); "
+                                   "end a code with |present to skip it in Time Off Only extracts, like H and HM"
         }
         self.multi_text_field_group = MultiTextFieldGroup(edit_text_configs, form_layout)
 
+        # Fill Sheet Names from the sheets of the dropped file, without opening it in Excel
+        self.btn_pick_sheets = QPushButton("📑 Pick Sheets")
+        self.btn_pick_sheets.clicked.connect(self.on_pick_sheets)
+        form_layout.addRow("", self.btn_pick_sheets)
+
         # Add "Time Off Only?" checkbox
         self.checkbox_time_off_only = QCheckBox("Time Off Only")
         form_layout.addRow("", self.checkbox_time_off_only)
 
+        # Compare engine: pandas joins the manual and HRIS grids in one vectorised step
+        self.checkbox_pandas_engine = QCheckBox("Vectorized Compare (pandas)")
+        form_layout.addRow("", self.checkbox_pandas_engine)
+
         right_panel.addLayout(form_layout)
         right_panel.addItem(QSpacerItem(20, 200, QSizePolicy.Minimum, QSizePolicy.Expanding))
 
@@ -134,6 +153,7 @@ class AttendancePage(QWidget):
         self.form_field_group.clear_fields()        
         self.multi_text_field_group.clear_fields()
         self.checkbox_time_off_only.setChecked(False)
+        self.checkbox_pandas_engine.setChecked(False)
         
     def _load_settings_to_fields(self, template: Template):
         settings = template.settings
@@ -141,6 +161,7 @@ class AttendancePage(QWidget):
         self.form_field_group.load_settings(settings)
         self.multi_text_field_group.load_settings(settings)
         self.checkbox_time_off_only.setChecked(settings["time_off_only"])
+        self.checkbox_pandas_engine.setChecked(settings.get("compare_engine") == "pandas")
 
     # Save current form values to the selected template
     def on_save_template(self):
@@ -211,6 +232,7 @@ class AttendancePage(QWidget):
         settings.update(self.form_field_group.get_field_values())    
         settings.update(self.multi_text_field_group.get_field_values())
         settings.update({"time_off_only": self.checkbox_time_off_only.isChecked()})
+        settings.update({"compare_engine": "pandas" if self.checkbox_pandas_engine.isChecked() else "python"})
         
         template: Template = self.attendance_templates[self.current_template_index] if self.current_template_index is not None else None
         template_name = template.name if template else ""
@@ -218,6 +240,23 @@ class AttendancePage(QWidget):
         
         return settings
 
+    def on_pick_sheets(self):
+        validated_file, validated_file_message = self.drop_area_1.validate_file()
+        if not validated_file:
+            QMessageBox.warning(self, "Warning", validated_file_message)
+            return
+
+        result = self.attendance_vm.list_sheets(self.drop_area_1.file_path)
+        if not result.success:
+            QMessageBox.warning(self, "Warning", f"Could not read the sheets: {result.message}")
+            return
+
+        sheet_field = self.multi_text_field_group.field_sheet_names
+        current = [name.strip() for name in sheet_field.toPlainText().split(",") if name.strip()]
+        dialog = SheetPickerDialog(result.data, current, self)
+        if dialog.exec():
+            sheet_field.setPlainText(", ".join(dialog.selected_sheets()))
+
     def on_extract(self):
         settings = self.collect_settings_from_fields()
         if settings == {}:
@@ -234,15 +273,12 @@ class AttendancePage(QWidget):
             QMessageBox.warning(self, "Warning", "Please drop an Attendance Excel file.")
             return
         
-        # Extract data using ViewModel
-        try:
-            result = self.attendance_vm.extract_attendance(settings, date_start_str, date_end_str, file)
-            if result.success:
-                QMessageBox.information(self, "Success", "Data extraction completed successfully.")
-            else:
-                QMessageBox.warning(self, "Warning", f"Data extraction failed: {result.message}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred during extraction: {str(e)}")
+        # Extract data using ViewModel in the background
+        self._start_worker(
+            lambda progress, cancel_event: self.attendance_vm.extract_attendance(
+                settings, date_start_str, date_end_str, file, progress, cancel_event),
+            "extraction"
+        )
             
     def on_compare(self):
         settings = self.collect_settings_from_fields()
@@ -268,13 +304,37 @@ class AttendancePage(QWidget):
         date_start_str = date_start.toString("yyyy-MM-dd")
         date_end_str = date_end.toString("yyyy-MM-dd")
 
-        # Compare data using ViewModel
-        try:
-            result = self.attendance_vm.compare_attendance(settings, date_start_str, date_end_str, attendance_file, hris_file)
-            if result.success:
-                QMessageBox.information(self, "Success", "Data comparison completed successfully.")
-            else:
-                QMessageBox.warning(self, "Warning", f"Data comparison failed: {result.message}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred during comparison: {str(e)}")
+        # Compare data using ViewModel in the background
+        self._start_worker(
+            lambda progress, cancel_event: self.attendance_vm.compare_attendance(
+                settings, date_start_str, date_end_str, attendance_file, hris_file, progress, cancel_event),
+            "comparison"
+        )
+
+    def _start_worker(self, task, action: str):
+        """Run a view model task on a ProcessingWorker, reporting into the progress panel."""
+        if self._worker and self._worker.isRunning():
+            return
+
+        self._worker = ProcessingWorker(task)
+        self._worker.result.connect(lambda result: self._on_worker_result(result, action))
+        self._worker.error.connect(
+            lambda message: QMessageBox.critical(self, "Error", f"An error occurred during {action}: {message}")
+        )
+        self._worker.finished.connect(lambda: self._set_processing(False))
+        self.progress_panel.attach(self._worker)
+        self._set_processing(True)
+        self._worker.start()
+
+    def _on_worker_result(self, result, action: str):
+        if result.success:
+            QMessageBox.information(self, "Success", result.message or f"Data {action} completed successfully.")
+        elif self._worker and self._worker.is_cancelled():
+            QMessageBox.information(self, "Cancelled", f"Data {action} was cancelled.")
+        else:
+            QMessageBox.warning(self, "Warning", f"Data {action} failed: {result.message}")
+
+    def _set_processing(self, running: bool):
+        self.btn_extract.setEnabled(not running)
+        self.btn_compare.setEnabled(not running)
     
\ No newline at end of file
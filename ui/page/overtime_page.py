@@ -9,8 +9,11 @@ from PySide6.QtCore import Qt
 from model.template_model import Template
 from ui.widget.company_code_checkbox import CompanyCodeCheckbox
 from ui.widget.drop_area_view import DropArea
+from ui.widget.processing_worker import ProcessingWorker
+from ui.widget.progress_panel import ProgressPanel
 from ui.widget.form_field_group import FormFieldGroup
 from ui.widget.multi_text_field_group import MultiTextFieldGroup
+from ui.widget.sheet_picker_dialog import SheetPickerDialog
 from ui.widget.period_date_widget import PeriodDateWidget
 from ui.widget.template_bar import TemplateBar
 from view_model.overtime_view_model import OvertimeViewModel
@@ -32,20 +35,25 @@ class OvertimePage(QWidget):
 
         # Left panel with two drop areas
         left_panel = QVBoxLayout()
-        self.drop_area_1 = DropArea("Drop Overtime Excel File Here")
-        self.drop_area_2 = DropArea("Drop HRIS Export Excel File Here")
+        self.drop_area_1 = DropArea("Drop Overtime Excel File Here", prefetch=self.overtime_vm.prefetch_file)
+        self.drop_area_2 = DropArea("Drop HRIS Export Excel File Here", prefetch=self.overtime_vm.prefetch_file)
         left_panel.addWidget(self.drop_area_1, 1)
         left_panel.addWidget(self.drop_area_2, 1)
         
         # Buttons at the bottom of left panel
-        btn_extract = QPushButton("📊 Extract Data")
-        btn_compare = QPushButton("🔍 Compare Data")
-        btn_extract.setFixedHeight(40)
-        btn_compare.setFixedHeight(40)
-        btn_extract.clicked.connect(self.on_extract)
-        btn_compare.clicked.connect(self.on_compare)
-        left_panel.addWidget(btn_extract)
-        left_panel.addWidget(btn_compare)
+        self.btn_extract = QPushButton("📊 Extract Data")
+        self.btn_compare = QPushButton("🔍 Compare Data")
+        self.btn_extract.setFixedHeight(40)
+        self.btn_compare.setFixedHeight(40)
+        self.btn_extract.clicked.connect(self.on_extract)
+        self.btn_compare.clicked.connect(self.on_compare)
+        left_panel.addWidget(self.btn_extract)
+        left_panel.addWidget(self.btn_compare)
+        
+        # Progress of the running extraction/comparison
+        self.progress_panel = ProgressPanel()
+        left_panel.addWidget(self.progress_panel)
+        self._worker = None
         
         main_layout.addLayout(left_panel, 2)
 
@@ -88,9 +96,15 @@ class OvertimePage(QWidget):
         
         edit_text_configs = {
             "Sheet Names": "Enter sheet names separated by commas (e.g., Sheet1, Sheet2)",
+            "Custom Shift Codes": "Optional extra shifts, separated by commas (e.g., SORE=Hadir (H)|15:00|23:00)",
         }
         self.multi_text_field_group = MultiTextFieldGroup(edit_text_configs, form_layout)
 
+        # Fill Sheet Names from the sheets of the dropped file, without opening it in Excel
+        self.btn_pick_sheets = QPushButton("📑 Pick Sheets")
+        self.btn_pick_sheets.clicked.connect(self.on_pick_sheets)
+        form_layout.addRow("", self.btn_pick_sheets)
+
         right_panel.addLayout(form_layout)
         right_panel.addItem(QSpacerItem(20, 200, QSizePolicy.Minimum, QSizePolicy.Expanding))
 
@@ -206,6 +220,23 @@ class OvertimePage(QWidget):
         settings.update(self.multi_text_field_group.get_field_values())
         return settings
 
+    def on_pick_sheets(self):
+        validated_file, validated_file_message = self.drop_area_1.validate_file()
+        if not validated_file:
+            QMessageBox.warning(self, "Warning", validated_file_message)
+            return
+
+        result = self.overtime_vm.list_sheets(self.drop_area_1.file_path)
+        if not result.success:
+            QMessageBox.warning(self, "Warning", f"Could not read the sheets: {result.message}")
+            return
+
+        sheet_field = self.multi_text_field_group.field_sheet_names
+        current = [name.strip() for name in sheet_field.toPlainText().split(",") if name.strip()]
+        dialog = SheetPickerDialog(result.data, current, self)
+        if dialog.exec():
+            sheet_field.setPlainText(", ".join(dialog.selected_sheets()))
+
     def on_extract(self):
         settings = self.collect_settings_from_fields()
         if settings == {}:
@@ -222,16 +253,13 @@ class OvertimePage(QWidget):
             QMessageBox.warning(self, "Warning", "Please drop an Attendance Excel file.")
             return
         
-        # Extract data using ViewModel
-        try:
-            print(f"Overtime Page: on_extract called with file: {file}")
-            result = self.overtime_vm.extract_overtime(settings, date_start_str, date_end_str, file)
-            if result.success:
-                QMessageBox.information(self, "Success", "Data extraction completed successfully.")
-            else:
-                QMessageBox.warning(self, "Warning", f"Data extraction failed: {result.message}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred during extraction: {str(e)}")
+        # Extract data using ViewModel in the background
+        print(f"Overtime Page: on_extract called with file: {file}")
+        self._start_worker(
+            lambda progress, cancel_event: self.overtime_vm.extract_overtime(
+                settings, date_start_str, date_end_str, file, progress, cancel_event),
+            "extraction"
+        )
             
     def on_compare(self):
         settings = self.collect_settings_from_fields()
@@ -257,13 +285,37 @@ class OvertimePage(QWidget):
         date_start_str = date_start.toString("yyyy-MM-dd")
         date_end_str = date_end.toString("yyyy-MM-dd")
 
-        # Compare data using ViewModel
-        try:
-            result = self.overtime_vm.compare_overtime(settings, date_start_str, date_end_str, overtime_file, hris_file)
-            if result.success:
-                QMessageBox.information(self, "Success", "Data comparison completed successfully.")
-            else:
-                QMessageBox.warning(self, "Warning", f"Data comparison failed: {result.message}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred during comparison: {str(e)}")
+        # Compare data using ViewModel in the background
+        self._start_worker(
+            lambda progress, cancel_event: self.overtime_vm.compare_overtime(
+                settings, date_start_str, date_end_str, overtime_file, hris_file, progress, cancel_event),
+            "comparison"
+        )
+
+    def _start_worker(self, task, action: str):
+        """Run a view model task on a ProcessingWorker, reporting into the progress panel."""
+        if self._worker and self._worker.isRunning():
+            return
+
+        self._worker = ProcessingWorker(task)
+        self._worker.result.connect(lambda result: self._on_worker_result(result, action))
+        self._worker.error.connect(
+            lambda message: QMessageBox.critical(self, "Error", f"An error occurred during {action}: {message}")
+        )
+        self._worker.finished.connect(lambda: self._set_processing(False))
+        self.progress_panel.attach(self._worker)
+        self._set_processing(True)
+        self._worker.start()
+
+    def _on_worker_result(self, result, action: str):
+        if result.success:
+            QMessageBox.information(self, "Success", result.message or f"Data {action} completed successfully.")
+        elif self._worker and self._worker.is_cancelled():
+            QMessageBox.information(self, "Cancelled", f"Data {action} was cancelled.")
+        else:
+            QMessageBox.warning(self, "Warning", f"Data {action} failed: {result.message}")
+
+    def _set_processing(self, running: bool):
+        self.btn_extract.setEnabled(not running)
+        self.btn_compare.setEnabled(not running)
     
\ No newline at end of file
@@ -1,10 +1,17 @@
 from PySide6.QtWidgets import QLabel, QSizePolicy
 from PySide6.QtCore import Qt
+from typing import Callable, Optional
 import os
+from ui.widget.processing_worker import ProcessingWorker
 
 class DropArea(QLabel):
-    """A widget that acts as a drop area for Excel files."""
-    def __init__(self, placeholder_text="Drop Excel File Here"):
+    """A widget that acts as a drop area for Excel files.
+
+    With a prefetch callable, a dropped file is handed to prefetch(file_path, cancel_event)
+    on a background worker, so it is parsed while the user is still setting up the run;
+    the area shows whether that is in progress, done or failed.
+    """
+    def __init__(self, placeholder_text="Drop Excel File Here", prefetch: Optional[Callable] = None):
         super().__init__(placeholder_text)
         self.setAlignment(Qt.AlignCenter)
         self.setStyleSheet("""
@@ -18,6 +25,10 @@ class DropArea(QLabel):
         """)
         self.setAcceptDrops(True)
         self.file_path = None
+        self.prefetch = prefetch
+        self._prefetch_worker: Optional[ProcessingWorker] = None
+        # Replaced workers are kept until they finish; a running QThread must not be destroyed
+        self._stale_workers: set[ProcessingWorker] = set()
         
         # Allow long filenames to wrap into multiple lines instead of expanding the widget
         self.setWordWrap(True)
@@ -44,6 +55,34 @@ class DropArea(QLabel):
         if urls:
             self.file_path = urls[0].toLocalFile()
             self.setText(f"✔ Loaded: {os.path.basename(self.file_path)}")
+            self._start_prefetch(self.file_path)
+
+    def _start_prefetch(self, file_path: str):
+        """Parse the dropped file in the background, replacing any prefetch still running."""
+        if self.prefetch is None:
+            return
+        if self._prefetch_worker is not None and self._prefetch_worker.isRunning():
+            self._prefetch_worker.cancel()
+            stale = self._prefetch_worker
+            self._stale_workers.add(stale)
+            stale.finished.connect(lambda: self._stale_workers.discard(stale))
+
+        name = os.path.basename(file_path)
+        self.setText(f"✔ Loaded: {name}\n⏳ Reading workbook...")
+        worker = ProcessingWorker(lambda progress, cancel_event: self.prefetch(file_path, cancel_event))
+        worker.result.connect(lambda result: self._on_prefetch_result(worker, name, result))
+        worker.error.connect(lambda message: self._on_prefetch_result(worker, name, None, message))
+        self._prefetch_worker = worker
+        worker.start()
+
+    def _on_prefetch_result(self, worker: ProcessingWorker, name: str, result, error: str = ""):
+        if worker is not self._prefetch_worker or worker.is_cancelled():
+            return  # a newer file was dropped meanwhile
+        if result is not None and result.success:
+            self.setText(f"✔ Loaded: {name}\n{result.message}")
+        else:
+            message = result.message if result is not None else error
+            self.setText(f"✔ Loaded: {name}\n(not read ahead: {message})")
             
     def validate_file(self):
         """Validate that a file has been dropped."""
@@ -0,0 +1,32 @@
+import threading
+from typing import Callable
+from PySide6.QtCore import QThread, Signal
+
+
+class ProcessingWorker(QThread):
+    """Runs an extract/compare task off the UI thread.
+
+    The task is called as task(progress_callback, cancel_event); progress is
+    forwarded through the `progress` signal and the return value through `result`.
+    """
+    progress = Signal(str, int, int)  # message, current_step, total_steps
+    result = Signal(object)
+    error = Signal(str)
+
+    def __init__(self, task: Callable):
+        super().__init__()
+        self._task = task
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the running task to stop at its next progress check."""
+        self.cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def run(self):
+        try:
+            self.result.emit(self._task(self.progress.emit, self.cancel_event))
+        except Exception as e:  # pragma: no cover - UI thread error surface
+            self.error.emit(str(e))
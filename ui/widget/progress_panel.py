@@ -0,0 +1,59 @@
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QProgressBar, QPushButton
+from ui.widget.processing_worker import ProcessingWorker
+
+
+class ProgressPanel(QWidget):
+    """Progress bar, status line and Cancel button for a ProcessingWorker. Hidden while idle."""
+    def __init__(self):
+        super().__init__()
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        self.status_label.setStyleSheet("color: #555;")
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedHeight(12)
+
+        self.btn_cancel = QPushButton("✖ Cancel")
+        self.btn_cancel.clicked.connect(self.on_cancel)
+
+        bar_layout = QHBoxLayout()
+        bar_layout.addWidget(self.progress_bar, 1)
+        bar_layout.addWidget(self.btn_cancel)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.status_label)
+        layout.addLayout(bar_layout)
+        self.setLayout(layout)
+
+        self._worker = None
+        self.setVisible(False)
+
+    def attach(self, worker: ProcessingWorker):
+        """Follow a worker's progress until it finishes."""
+        self._worker = worker
+        worker.progress.connect(self.set_progress)
+        worker.finished.connect(self.on_finished)
+        self.btn_cancel.setEnabled(True)
+        self.set_progress("Starting...", 0, 0)
+        self.setVisible(True)
+
+    def set_progress(self, message: str, current: int, total: int):
+        self.status_label.setText(message)
+        if total <= 0:
+            self.progress_bar.setRange(0, 0)  # busy indicator when the step count is unknown
+        else:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(current)
+
+    def on_cancel(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        self.btn_cancel.setEnabled(False)
+        self.status_label.setText("Cancelling...")
+
+    def on_finished(self):
+        self._worker = None
+        self.setVisible(False)
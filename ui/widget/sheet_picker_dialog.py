@@ -0,0 +1,47 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QDialog, QDialogButtonBox, QLabel, QListWidget, QListWidgetItem, QVBoxLayout
+
+
+class SheetPickerDialog(QDialog):
+    """Checklist of a workbook's sheets for filling in the Sheet Names setting.
+
+    Each sheet shows its declared size and the company code found in its title;
+    sheets already named in the setting start checked.
+    """
+    def __init__(self, sheets: list[dict], selected: list[str], parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Pick Sheets")
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Select the sheets to process:"))
+
+        self.sheet_list = QListWidget()
+        for sheet in sheets:
+            item = QListWidgetItem(self._describe(sheet))
+            item.setData(Qt.UserRole, sheet["title"])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if sheet["title"] in selected else Qt.Unchecked)
+            self.sheet_list.addItem(item)
+        layout.addWidget(self.sheet_list)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def _describe(self, sheet: dict) -> str:
+        text = sheet["title"]
+        if sheet.get("max_row") and sheet.get("max_column"):
+            text += f"  —  {sheet['max_row']} rows × {sheet['max_column']} columns"
+        if sheet.get("company_code"):
+            text += f"  [{sheet['company_code']}]"
+        if sheet.get("hidden"):
+            text += "  (hidden)"
+        return text
+
+    def selected_sheets(self) -> list[str]:
+        """Return the titles of the checked sheets, in workbook order."""
+        return [
+            self.sheet_list.item(row).data(Qt.UserRole)
+            for row in range(self.sheet_list.count())
+            if self.sheet_list.item(row).checkState() == Qt.Checked
+        ]
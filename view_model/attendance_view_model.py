@@ -1,29 +1,44 @@
+import threading
 from typing import Optional
+from model.base_processor import ProgressCallback
 from model.attendance.attendance_extractor import AttendanceExtractor
 from model.attendance.attendance_comparator import AttendanceComparator
 from model.data_class.result import Result
+from model.helper.job_cache import JOB_RESULTS, JobResultCache, job_fingerprint
 
 class AttendanceViewModel:
     def __init__(
         self, 
         extractor: Optional[AttendanceExtractor] = None, 
-        comparator: Optional[AttendanceComparator] = None
+        comparator: Optional[AttendanceComparator] = None,
+        job_results: Optional[JobResultCache] = None
     ):
         self.attendance_data: list = []
         self.errors: list[str] = []
         self.extractor = extractor or AttendanceExtractor()
         self.comparator = comparator or AttendanceComparator()
+        # Finished jobs by fingerprint; an identical rerun returns their outputs
+        self.job_results = job_results or JOB_RESULTS
 
     def extract_attendance(
         self, settings: dict, 
         date_start_str: str, 
         date_end_str: str, 
-        attendance_file: str
+        attendance_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> Result:
         try:
-            self.extractor.extract(settings, date_start_str, date_end_str, attendance_file)
+            fingerprint = job_fingerprint(
+                "attendance extract", [attendance_file], settings, date_start_str, date_end_str
+            )
+            outputs, reused = self.job_results.run(
+                fingerprint,
+                lambda: self.extractor.extract(settings, date_start_str, date_end_str, attendance_file,
+                                               progress_callback, cancel_event),
+            )
             self.errors = []
-            return Result(success=True, data=[])
+            return Result.for_outputs(outputs, reused)
         except Exception as e:
             self.attendance_data = []
             self.errors = [str(e)]
@@ -34,14 +49,39 @@ class AttendanceViewModel:
         date_start_str: str, 
         date_end_str: str, 
         attendance_file: str, 
-        hris_file: str
+        hris_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> Result:
         try:
-            self.comparator.compare(settings, date_start_str, date_end_str, attendance_file, hris_file)
+            fingerprint = job_fingerprint(
+                "attendance compare", [attendance_file, hris_file], settings, date_start_str, date_end_str
+            )
+            outputs, reused = self.job_results.run(
+                fingerprint,
+                lambda: self.comparator.compare(settings, date_start_str, date_end_str, attendance_file, hris_file,
+                                                progress_callback, cancel_event),
+            )
             self.errors = []
-            return Result(success=True, data=[])
+            return Result.for_outputs(outputs, reused)
         except Exception as e:
             self.attendance_data = []
             self.errors = [str(e)]
             return Result(success=False, data=[], message=str(e))
-    
\ No newline at end of file
+    
+
+    def prefetch_file(self, file_path: str, cancel_event: Optional[threading.Event] = None) -> Result:
+        """Parse a dropped workbook into the shared sheet cache ahead of Extract/Compare."""
+        try:
+            sheet_count = self.extractor.prefetch_workbook(file_path, cancel_event)
+            return Result(success=True, data=[], message=f"Read ahead: {sheet_count} sheet(s) ready")
+        except Exception as e:
+            return Result(success=False, data=[], message=str(e))
+
+    def list_sheets(self, file_path: str) -> Result:
+        """List the sheets of a workbook for the sheet picker, one dict per sheet."""
+        try:
+            entries = self.extractor.read_sheet_catalog(file_path)
+            return Result(success=True, data=[vars(entry) for entry in entries])
+        except Exception as e:
+            return Result(success=False, data=[], message=str(e))
@@ -1,30 +1,45 @@
+import threading
 from typing import Optional
+from model.base_processor import ProgressCallback
 from model.overtime.overtime_comparator import OvertimeComparator
 from model.overtime.overtime_extractor import OvertimeExtractor
 from model.data_class.result import Result
+from model.helper.job_cache import JOB_RESULTS, JobResultCache, job_fingerprint
 
 class OvertimeViewModel():
     def __init__ (
         self,
         extractor: Optional[OvertimeExtractor] = None,
-        comparator: Optional[OvertimeComparator] = None
+        comparator: Optional[OvertimeComparator] = None,
+        job_results: Optional[JobResultCache] = None
     ):
         self.overtime_data: list = []
         self.errors: list[str] = []
         self.extractor = extractor or OvertimeExtractor()
         self.comparator = comparator or OvertimeComparator()
+        # Finished jobs by fingerprint; an identical rerun returns their outputs
+        self.job_results = job_results or JOB_RESULTS
         
     def extract_overtime(
         self,
         settings: dict,
         date_start_str: str,
         date_end_str: str,
-        overtime_file: str
+        overtime_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> Result:
         try:
-            self.extractor.extract(settings, date_start_str, date_end_str, overtime_file)
+            fingerprint = job_fingerprint(
+                "overtime extract", [overtime_file], settings, date_start_str, date_end_str
+            )
+            outputs, reused = self.job_results.run(
+                fingerprint,
+                lambda: self.extractor.extract(settings, date_start_str, date_end_str, overtime_file,
+                                               progress_callback, cancel_event),
+            )
             self.errors = []
-            return Result(success=True, data=[])
+            return Result.for_outputs(outputs, reused)
         except Exception as e:
             self.overtime_data = []
             self.errors = [str(e)]
@@ -36,13 +51,38 @@ class OvertimeViewModel():
         date_start_str: str,
         date_end_str: str,
         overtime_file: str,
-        hris_file: str
+        hris_file: str,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> Result:
         try:
-            self.comparator.compare(settings, date_start_str, date_end_str, overtime_file, hris_file)
+            fingerprint = job_fingerprint(
+                "overtime compare", [overtime_file, hris_file], settings, date_start_str, date_end_str
+            )
+            outputs, reused = self.job_results.run(
+                fingerprint,
+                lambda: self.comparator.compare(settings, date_start_str, date_end_str, overtime_file, hris_file,
+                                                progress_callback, cancel_event),
+            )
             self.errors = []
-            return Result(success=True, data=[])
+            return Result.for_outputs(outputs, reused)
         except Exception as e:
             self.overtime_data = []
             self.errors = [str(e)]
             return Result(success=False, data=[], message=str(e))
+
+    def prefetch_file(self, file_path: str, cancel_event: Optional[threading.Event] = None) -> Result:
+        """Parse a dropped workbook into the shared sheet cache ahead of Extract/Compare."""
+        try:
+            sheet_count = self.extractor.prefetch_workbook(file_path, cancel_event)
+            return Result(success=True, data=[], message=f"Read ahead: {sheet_count} sheet(s) ready")
+        except Exception as e:
+            return Result(success=False, data=[], message=str(e))
+
+    def list_sheets(self, file_path: str) -> Result:
+        """List the sheets of a workbook for the sheet picker, one dict per sheet."""
+        try:
+            entries = self.extractor.read_sheet_catalog(file_path)
+            return Result(success=True, data=[vars(entry) for entry in entries])
+        except Exception as e:
+            return Result(success=False, data=[], message=str(e))